@@ -0,0 +1,174 @@
+"""
+Times every Rules collector and check against a synthetic environment and writes the results as JSON.
+
+    python -m benchmarks.run --scale medium -o results.json
+    python -m benchmarks.run --scale medium --compare results.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import SCALES, build_environment
+from jupysec import config
+from jupysec.fleet import RootRules
+
+RESULTS_VERSION = 1
+
+
+def _rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def run_once(home, trace_memory=False, warm=False, **kwargs):
+    """
+    Scans `home` once, returning the timings of each collector and check and the peak memory.
+    Unless `warm`, the in-process memo of parsed config files is cleared first so every run parses them.
+    """
+    if not warm:
+        config._memo.clear()
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    rules = RootRules(home, **kwargs)
+    for check, finding in rules.run_checks():
+        pass
+    result = {
+        "collectors": {name: values.get("seconds", 0) for name, values in rules.metrics["collectors"].items()},
+        "collector_counters": rules.metrics["collectors"],
+        "collector_errors": rules.collector_errors,
+        "checks": rules.metrics["checks"],
+        "collect_seconds": rules.metrics["collect_seconds"],
+        "total_seconds": time.perf_counter() - start,
+        "peak_rss_kb": _rss_kb(),
+    }
+    if trace_memory:
+        result["peak_traced_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def summarize(runs):
+    """Takes the median of every timing across runs."""
+    summary = {"collectors": dict(), "checks": dict()}
+    for name in runs[0]["collectors"]:
+        summary["collectors"][name] = statistics.median(r["collectors"].get(name, 0) for r in runs)
+    for name in runs[0]["checks"]:
+        summary["checks"][name] = statistics.median(r["checks"][name]["seconds"] for r in runs)
+    summary["total_seconds"] = statistics.median(r["total_seconds"] for r in runs)
+    summary["peak_rss_kb"] = max((r["peak_rss_kb"] or 0) for r in runs)
+    return summary
+
+
+def _revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, timeout=5)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return out.stdout.decode().strip() or None
+
+
+def compare(baseline, results, threshold, out=sys.stdout):
+    """Prints each timing against the baseline and returns the names that slowed by more than `threshold`."""
+    regressions = list()
+    for section in ("collectors", "checks"):
+        old, new = baseline["summary"][section], results["summary"][section]
+        for name in sorted(set(old) | set(new)):
+            if name not in old or name not in new:
+                out.write(f"{section}.{name:<36} {'only in ' + ('new' if name in new else 'baseline'):>28}\n")
+                continue
+            ratio = new[name] / old[name] if old[name] else float("inf") if new[name] else 1.0
+            out.write(f"{section}.{name:<36} {old[name]:>10.4f}s {new[name]:>10.4f}s {ratio:>6.2f}x\n")
+            # ignore noise on timings too short to measure reliably
+            if ratio > threshold and new[name] - old[name] > 0.005:
+                regressions.append(f"{section}.{name}")
+    return regressions
+
+
+def _override(value):
+    key, _, number = value.partition("=")
+    if key not in SCALES["small"]:
+        raise argparse.ArgumentTypeError(f"unknown parameter {key!r}, choose from {', '.join(SCALES['small'])}")
+    return key, float(number) if "." in number else int(number)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--set", dest="overrides", type=_override, action="append", default=list(),
+                        help="override one generator parameter, e.g. --set history_rows=50000000")
+    parser.add_argument("--row-size", type=int, default=64, help="bytes per history row; rows * row size sets the database size")
+    parser.add_argument("--dir", help="generate into (or reuse) this directory instead of a temporary one")
+    parser.add_argument("--repeat", type=int, default=3, help="number of scans to take the median of")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--cache", action="store_true", help="scan with the on-disk config cache, so repeats measure warm scans")
+    parser.add_argument("--warm", action="store_true", help="keep parsed config files in memory between repeats, as a long-running server does")
+    parser.add_argument("--trace-memory", action="store_true", help="also record the peak Python allocation with tracemalloc, which slows the scan")
+    parser.add_argument("-o", "--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="a previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio reported as a regression (default: 1.25)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = args.dir or tempfile.mkdtemp(prefix="jupysec-bench-")
+    home = os.path.join(workdir, "home")
+    try:
+        marker = os.path.join(workdir, "environment.json")
+        if os.path.exists(marker):
+            with open(marker) as f:
+                environment = json.load(f)
+        else:
+            start = time.perf_counter()
+            environment = build_environment(home, args.scale, row_size=args.row_size, **dict(args.overrides))
+            environment["generate_seconds"] = time.perf_counter() - start
+            with open(marker, "w") as f:
+                json.dump(environment, f)
+
+        kwargs = dict(max_workers=args.workers, timeout=None)
+        if args.cache:
+            kwargs["cache"] = os.path.join(workdir, "cache.json")
+        runs = [run_once(home, args.trace_memory, args.warm, **kwargs) for _ in range(args.repeat)]
+        results = {
+            "version": RESULTS_VERSION,
+            "revision": _revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "environment": environment,
+            "runs": runs,
+            "summary": summarize(runs),
+        }
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=2)
+        else:
+            json.dump(results["summary"], sys.stdout, indent=2)
+            sys.stdout.write("\n")
+        if args.compare:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+            regressions = compare(baseline, results, args.threshold)
+            if regressions:
+                sys.stdout.write(f"regressions: {', '.join(regressions)}\n")
+                return 1
+        return 0
+    finally:
+        if not args.dir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
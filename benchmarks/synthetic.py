@@ -0,0 +1,135 @@
+import json
+import os
+import random
+import sqlite3
+
+from jupysec.rules import CODEEXEC_PREFIXES, HISTORYMOD_PREFIXES, SECURITY_PREFIXES
+
+SCALES = {
+    "small": dict(profiles=5, startup_files=5, history_rows=20_000, silent_rate=0.001, config_lines=2_000, data_depth=4, data_fanout=3, servers=10, kernels=20),
+    "medium": dict(profiles=50, startup_files=20, history_rows=1_000_000, silent_rate=0.0005, config_lines=50_000, data_depth=6, data_fanout=4, servers=200, kernels=500),
+    "large": dict(profiles=200, startup_files=50, history_rows=20_000_000, silent_rate=0.0001, config_lines=500_000, data_depth=8, data_fanout=4, servers=1000, kernels=5000),
+}
+SILENT = "get_ipython().kernel.execute_interactive(code='import os; os.system(\"id\")', silent=True)"
+HISTORY_SCHEMA = (
+    "CREATE TABLE sessions (session integer primary key autoincrement, start timestamp, end timestamp, num_cmds integer, remark text)",
+    "CREATE TABLE history (session integer, line integer, source text, source_raw text, PRIMARY KEY (session, line))",
+    "CREATE TABLE output_history (session integer, line integer, output text, PRIMARY KEY (session, line))",
+)
+
+
+def write_history(path, rows, silent_rate, rng, row_size=64, lines_per_session=1000, batch_size=10_000):
+    """
+    Writes an IPython history database with `rows` executions, of which about `silent_rate` are silent.
+    Each row's source is padded to `row_size` bytes, so rows * row_size sets the database size.
+    Returns the number of silent rows written.
+    """
+    con = sqlite3.connect(path)
+    con.execute("PRAGMA journal_mode = OFF")
+    con.execute("PRAGMA synchronous = OFF")
+    for statement in HISTORY_SCHEMA:
+        con.execute(statement)
+    padding = "x" * max(0, row_size - 16)
+    silent = 0
+    batch = list()
+    for i in range(rows):
+        session, line = divmod(i, lines_per_session)
+        if rng.random() < silent_rate:
+            source = SILENT
+            silent += 1
+        else:
+            source = f"print({i}) # {padding}"
+        batch.append((session + 1, line + 1, source, source))
+        if len(batch) >= batch_size:
+            con.executemany("INSERT INTO history VALUES (?, ?, ?, ?)", batch)
+            batch = list()
+    if batch:
+        con.executemany("INSERT INTO history VALUES (?, ?, ?, ?)", batch)
+    con.commit()
+    con.close()
+    return silent
+
+
+def write_config(path, lines, rng):
+    """Writes a config file where about one line in a hundred sets a trait the pyconfig checks know about."""
+    prefixes = CODEEXEC_PREFIXES + HISTORYMOD_PREFIXES + SECURITY_PREFIXES
+    with open(path, "w") as f:
+        f.write("c = get_config()\n")
+        for i in range(lines):
+            roll = rng.random()
+            if roll < 0.01:
+                f.write(f"{rng.choice(prefixes)} = {rng.choice(['True', '0', repr('0.0.0.0'), '[]'])}\n")
+            elif roll < 0.6:
+                f.write(f"# c.Generated{i % 97}.trait_{i} = {i}\n")
+            elif roll < 0.7:
+                f.write("\n")
+            else:
+                f.write(f"c.Generated{i % 97}.trait_{i} = {i}\n")
+
+
+def write_tree(root, depth, fanout):
+    """Writes a directory tree `depth` levels deep with `fanout` subdirectories and files at each level."""
+    count = 0
+    stack = [(root, 0)]
+    while stack:
+        path, level = stack.pop()
+        os.makedirs(path, exist_ok=True)
+        for i in range(fanout):
+            with open(os.path.join(path, f"file{i}.json"), "w") as f:
+                f.write("{}")
+            count += 1
+        if level < depth:
+            stack += [(os.path.join(path, f"d{i}"), level + 1) for i in range(fanout)]
+    return count
+
+
+def build_environment(home, scale="small", seed=0, row_size=64, **overrides):
+    """
+    Builds a synthetic home directory under `home` at one of SCALES, with any parameter overridden.
+    The layout matches a real user's .ipython, .jupyter and .local/share/jupyter directories, so it
+    can be scanned with `jupysec.fleet.RootRules`. Returns the parameters and counts that were generated.
+    """
+    params = dict(SCALES[scale], **overrides)
+    rng = random.Random(seed)
+    ipython = os.path.join(home, ".ipython")
+    jupyter = os.path.join(home, ".jupyter")
+    data = os.path.join(home, ".local", "share", "jupyter")
+    runtime = os.path.join(data, "runtime")
+    for d in (ipython, jupyter, runtime):
+        os.makedirs(d, exist_ok=True)
+
+    for p in range(params["profiles"]):
+        startup = os.path.join(ipython, "profile_default" if p == 0 else f"profile_{p}", "startup")
+        os.makedirs(startup, exist_ok=True)
+        with open(os.path.join(startup, "README"), "w") as f:
+            f.write("startup files\n")
+        for s in range(params["startup_files"]):
+            with open(os.path.join(startup, f"{s:02d}-startup.py"), "w") as f:
+                f.write(f"x = {s}\n")
+
+    history = os.path.join(ipython, "profile_default", "history.sqlite")
+    silent = write_history(history, params["history_rows"], params["silent_rate"], rng, row_size)
+
+    for name in ("jupyter_server_config.py", "jupyter_lab_config.py", "jupyter_notebook_config.py"):
+        write_config(os.path.join(jupyter, name), params["config_lines"], rng)
+    write_config(os.path.join(ipython, "profile_default", "ipython_config.py"), params["config_lines"], rng)
+
+    tree_files = write_tree(os.path.join(data, "synthetic"), params["data_depth"], params["data_fanout"])
+
+    for i in range(params["servers"]):
+        info = {
+            "url": f"http://{rng.choice(['localhost', '0.0.0.0'])}:{8888 + i}/",
+            "token": rng.choice(["", "a" * 48]),
+            "root_dir": home,
+            "pid": 1,
+        }
+        with open(os.path.join(runtime, f"jpserver-{i}.json"), "w") as f:
+            json.dump(info, f)
+    for i in range(params["kernels"]):
+        info = {"key": rng.choice(["", "b" * 36]), "ip": "127.0.0.1", "transport": "tcp", "signature_scheme": "hmac-sha256"}
+        path = os.path.join(runtime, f"kernel-{i}.json")
+        with open(path, "w") as f:
+            json.dump(info, f)
+        os.chmod(path, 0o600)
+
+    return dict(params, scale=scale, seed=seed, row_size=row_size, silent_rows=silent, tree_files=tree_files)
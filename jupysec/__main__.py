@@ -0,0 +1,5 @@
+import sys
+
+from jupysec.cli import main
+
+sys.exit(main())
@@ -0,0 +1,98 @@
+import gzip
+import json
+import random
+import socket
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+# a finding is sent as a row in this order, so field names aren't repeated in every record
+FIELDS = ("uuid", "check", "rule", "category", "severity", "source_doc", "source_text", "root")
+BATCH_SIZE = 500
+RETRIES = 5
+BACKOFF = 0.5
+MAX_BACKOFF = 30
+TOKEN_ENV = "JUPYSEC_AGGREGATOR_TOKEN"
+
+
+class SendError(Exception):
+    pass
+
+
+def _row(check, finding, root):
+    record = finding.as_dict()
+    record["check"] = check
+    record["root"] = root or ""
+    return [record[f] for f in FIELDS]
+
+
+def batches(results, host, scan_id, scanned, size=BATCH_SIZE):
+    """
+    Groups (check name, finding, root) results into batches of at most `size` findings as they stream in.
+    The last batch is marked complete with the total, so the aggregator knows the scan wasn't cut short;
+    a scan without findings still sends that one batch.
+    """
+    base = {"host": host, "scan": scan_id, "scanned": scanned, "fields": list(FIELDS)}
+    rows, seq, total = list(), 0, 0
+    for result in results:
+        rows.append(_row(*result))
+        if len(rows) >= size:
+            yield dict(base, seq=seq, findings=rows, complete=False)
+            total += len(rows)
+            rows, seq = list(), seq + 1
+    yield dict(base, seq=seq, findings=rows, complete=True, total=total + len(rows))
+
+
+def _delay(attempt, backoff, retry_after=None):
+    if retry_after is not None:
+        try:
+            return min(MAX_BACKOFF, float(retry_after))
+        except ValueError:
+            pass
+    # full jitter, so a fleet of agents that failed together doesn't retry together
+    return random.uniform(0, min(MAX_BACKOFF, backoff * 2 ** attempt))
+
+
+def send(url, batch, token=None, retries=RETRIES, backoff=BACKOFF, timeout=10):
+    """
+    POSTs one gzip-compressed JSON batch. Connection errors, 429 and 5xx responses are retried
+    up to `retries` times with exponential backoff; other errors are raised as SendError at once.
+    Batches are idempotent on the aggregator, so a retry after a lost response is harmless.
+    """
+    body = gzip.compress(json.dumps(batch, separators=(",", ":")).encode())
+    headers = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    for attempt in range(retries + 1):
+        retry_after = None
+        try:
+            request = urllib.request.Request(url, data=body, headers=headers, method="POST")
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return json.loads(response.read() or b"{}")
+        except urllib.error.HTTPError as e:
+            if e.code != 429 and e.code < 500:
+                raise SendError(f"{url} rejected the batch: HTTP {e.code} {e.reason}")
+            error = f"HTTP {e.code} {e.reason}"
+            retry_after = e.headers.get("Retry-After")
+        except (urllib.error.URLError, OSError) as e:
+            error = repr(e)
+        if attempt < retries:
+            time.sleep(_delay(attempt, backoff, retry_after))
+    raise SendError(f"giving up on {url} after {retries + 1} attempts: {error}")
+
+
+def send_results(results, url, host=None, token=None, batch_size=BATCH_SIZE, **kwargs):
+    """
+    Streams scan results to the aggregator at `url` and returns a summary of what was sent.
+    `host` defaults to this machine's hostname; keyword arguments are passed to `send`.
+    """
+    host = host or socket.gethostname()
+    scan_id = uuid.uuid4().hex
+    scanned = time.time()
+    summary = {"host": host, "scan": scan_id, "batches": 0, "findings": 0}
+    for batch in batches(results, host, scan_id, scanned, batch_size):
+        send(url, batch, token, **kwargs)
+        summary["batches"] += 1
+        summary["findings"] += len(batch["findings"])
+    return summary
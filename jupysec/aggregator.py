@@ -0,0 +1,246 @@
+"""
+Collects findings sent by `jupysec --send` from many hosts into one SQLite database and answers queries over HTTP.
+
+    jupysec-aggregator --db fleet.sqlite --port 8765
+    curl 'http://localhost:8765/findings?host=web-1&category=Access&since=1700000000'
+"""
+import argparse
+import gzip
+import hmac
+import io
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from jupysec.agent import FIELDS, TOKEN_ENV
+
+# "check" is an SQL keyword
+COLUMNS = ", ".join(f'"{f}"' for f in FIELDS)
+MAX_BODY = 64 * 1024 * 1024
+DEFAULT_LIMIT = 1000
+MAX_LIMIT = 100000
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    scan TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    scanned REAL NOT NULL,
+    received REAL NOT NULL,
+    total INTEGER,
+    complete INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS findings (
+    scan TEXT NOT NULL,
+    host TEXT NOT NULL,
+    scanned REAL NOT NULL,
+    uuid TEXT NOT NULL,
+    "check" TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    category TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    source_doc TEXT NOT NULL,
+    source_text TEXT NOT NULL,
+    root TEXT NOT NULL,
+    PRIMARY KEY (scan, uuid, root)
+);
+CREATE INDEX IF NOT EXISTS scans_host_scanned ON scans (host, scanned);
+CREATE INDEX IF NOT EXISTS findings_host ON findings (host, scanned);
+CREATE INDEX IF NOT EXISTS findings_category ON findings (category, scanned);
+"""
+
+
+class BatchError(ValueError):
+    pass
+
+
+class Store:
+    def __init__(self, path):
+        """
+        The aggregator's SQLite database. Each thread gets its own connection; the database is in
+        WAL mode so queries don't wait for ingests, and ingests are serialized by a lock rather than
+        by retrying on SQLITE_BUSY.
+        """
+        self.path = path
+        self._local = threading.local()
+        self._write = threading.Lock()
+        db = self._db()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(SCHEMA)
+
+    def _db(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def ingest(self, batch, received=None):
+        """
+        Stores one batch from an agent in a single transaction and returns the number of findings added.
+        A batch that is sent twice, e.g. retried after a lost response, is only stored once.
+        """
+        try:
+            host, scan, scanned = str(batch["host"]), str(batch["scan"]), float(batch["scanned"])
+            index = [batch["fields"].index(f) for f in FIELDS]
+            rows = [(scan, host, scanned) + tuple(str(row[i]) for i in index) for row in batch["findings"]]
+        except (KeyError, TypeError, ValueError, IndexError) as e:
+            raise BatchError(f"malformed batch: {e!r}")
+        received = time.time() if received is None else received
+        db = self._db()
+        with self._write, db:
+            db.execute(
+                "INSERT OR IGNORE INTO scans (scan, host, scanned, received) VALUES (?, ?, ?, ?)",
+                (scan, host, scanned, received),
+            )
+            before = db.total_changes
+            db.executemany(f"INSERT OR IGNORE INTO findings VALUES ({', '.join('?' * (len(FIELDS) + 3))})", rows)
+            added = db.total_changes - before
+            db.execute("UPDATE scans SET received = ? WHERE scan = ?", (received, scan))
+            if batch.get("complete"):
+                db.execute("UPDATE scans SET complete = 1, total = ? WHERE scan = ?", (batch.get("total"), scan))
+        return added
+
+    def findings(self, host=None, category=None, since=None, until=None, limit=DEFAULT_LIMIT, offset=0):
+        """Returns stored findings, newest scan first, filtered by host, category and a range of scan times."""
+        clauses, params = list(), list()
+        for column, value in (("host", host), ("category", category)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("scanned >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("scanned < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        cursor = self._db().execute(
+            f"SELECT host, scan, scanned, {COLUMNS} FROM findings {where} "
+            "ORDER BY scanned DESC, host, uuid LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        )
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def hosts(self):
+        """Returns each host's latest scan with its finding count, whether it arrived complete and when."""
+        # the latest scan time per host comes from one pass over the scans_host_scanned index
+        cursor = self._db().execute(
+            "SELECT s.host, s.scan, s.scanned, s.received, s.complete, "
+            "(SELECT COUNT(*) FROM findings f WHERE f.scan = s.scan) AS findings "
+            "FROM (SELECT host, MAX(scanned) AS scanned FROM scans GROUP BY host) latest "
+            "JOIN scans s ON s.host = latest.host AND s.scanned = latest.scanned ORDER BY s.host"
+        )
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row), complete=bool(row[4])) for row in cursor]
+
+
+class AggregatorHandler(BaseHTTPRequestHandler):
+    server_version = "jupysec-aggregator"
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _authorized(self):
+        token = self.server.token
+        if not token:
+            return True
+        given = self.headers.get("Authorization", "")
+        return hmac.compare_digest(given.encode(), f"Bearer {token}".encode())
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length", 0))
+        if length > MAX_BODY:
+            raise BatchError("batch too large")
+        data = self.rfile.read(length)
+        if self.headers.get("Content-Encoding", "") == "gzip":
+            with gzip.GzipFile(fileobj=io.BytesIO(data)) as f:
+                data = f.read(MAX_BODY + 1)
+            if len(data) > MAX_BODY:
+                raise BatchError("batch too large")
+        return json.loads(data)
+
+    def do_POST(self):
+        if not self._authorized():
+            return self._reply(401, {"error": "unauthorized"})
+        if urllib.parse.urlsplit(self.path).path != "/ingest":
+            return self._reply(404, {"error": "not found"})
+        try:
+            added = self.server.store.ingest(self._body())
+        except (BatchError, ValueError, OSError, EOFError) as e:
+            return self._reply(400, {"error": str(e)})
+        except sqlite3.Error as e:
+            # e.g. a locked or full database; the agent retries 5xx responses
+            return self._reply(503, {"error": repr(e)})
+        self._reply(200, {"added": added})
+
+    def do_GET(self):
+        if not self._authorized():
+            return self._reply(401, {"error": "unauthorized"})
+        url = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        if url.path == "/hosts":
+            return self._reply(200, {"hosts": self.server.store.hosts()})
+        if url.path != "/findings":
+            return self._reply(404, {"error": "not found"})
+        try:
+            since = float(query["since"]) if "since" in query else None
+            until = float(query["until"]) if "until" in query else None
+            limit = min(MAX_LIMIT, max(1, int(query.get("limit", DEFAULT_LIMIT))))
+            offset = max(0, int(query.get("offset", 0)))
+        except ValueError:
+            return self._reply(400, {"error": "since and until must be Unix times, limit and offset integers"})
+        findings = self.server.store.findings(query.get("host"), query.get("category"), since, until, limit, offset)
+        self._reply(200, {"findings": findings, "offset": offset, "limit": limit})
+
+
+class AggregatorServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, store, token=None, quiet=False):
+        """Serves POST /ingest, GET /findings and GET /hosts for `store`, one thread per request."""
+        super().__init__(address, AggregatorHandler)
+        self.store = store
+        self.token = token
+        self.quiet = quiet
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="jupysec-aggregator", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default="jupysec-aggregator.sqlite", help="SQLite database to store findings in")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--quiet", action="store_true", help="don't log each request")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # the token is read from the environment so it doesn't show up in the process list
+    server = AggregatorServer((args.host, args.port), Store(args.db), token=os.environ.get(TOKEN_ENV), quiet=args.quiet)
+    sys.stderr.write(f"jupysec-aggregator listening on {args.host}:{server.server_address[1]}, storing in {args.db}\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
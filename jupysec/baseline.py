@@ -0,0 +1,186 @@
+import os
+import sqlite3
+import threading
+import time
+
+from jupysec import discovery
+from jupysec.finding import RULES, Finding, Rule
+
+BASELINE_NAME = "jupysec-baseline.sqlite"
+LOCAL_SCOPE = "local"
+FIELDS = ("uuid", "rule", "category", "severity", "source_doc", "source_text")
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS findings (
+    scope TEXT NOT NULL,
+    uuid TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    category TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    source_doc TEXT NOT NULL,
+    source_text TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    saved REAL NOT NULL,
+    PRIMARY KEY (scope, uuid)
+) WITHOUT ROWID
+"""
+
+
+def default_baseline_path():
+    """Returns the baseline location in the Jupyter runtime directory, or None if it can't be resolved."""
+    runtime_dir = discovery.get_runtime_dir()
+    if runtime_dir is None:
+        return None
+    return os.path.join(runtime_dir, BASELINE_NAME)
+
+
+def _record(finding):
+    """Returns the stored fields of a Finding, or of a finding already serialized with `as_dict`."""
+    record = finding if isinstance(finding, dict) else finding.as_dict()
+    return {field: str(record.get(field, "")) for field in FIELDS}
+
+
+def as_finding(record):
+    """Rebuilds a Finding from a stored record, with a bare rule if its rule isn't loaded in this process."""
+    rule = RULES.get(record["rule"])
+    if rule is None:
+        rule = Rule(record["rule"], record["category"], severity=record["severity"])
+    return Finding(rule=rule, source_doc=record["source_doc"], source_text=record["source_text"])
+
+
+class Baseline:
+    def __init__(self, path):
+        """
+        A SQLite store of accepted findings keyed on (scope, uuid). Finding uuids are derived from
+        the rule, source_doc and source_text, so the same finding has the same key in every scan.
+        A scope is one scanned environment: "local" for this one, or a filesystem root with --root.
+        Only the fields needed to identify and re-report a finding are stored.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(SCHEMA)
+
+    def load(self, scope=LOCAL_SCOPE):
+        """Returns {uuid: record} for every finding in the baseline of `scope`."""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {', '.join(FIELDS)}, first_seen, saved FROM findings WHERE scope = ?", (scope,)
+            ).fetchall()
+        keys = FIELDS + ("first_seen", "saved")
+        return {row[0]: dict(zip(keys, row)) for row in rows}
+
+    def scopes(self):
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT DISTINCT scope FROM findings ORDER BY scope")]
+
+    def diff(self, findings, scope=LOCAL_SCOPE, rules=None):
+        """
+        Compares `findings` (Findings or `as_dict` records) with the baseline of `scope` and returns
+        (added, removed, unchanged). Added and unchanged are items of `findings`; removed are stored records.
+        With `rules`, only stored findings of those rule ids can be removed, since other rules weren't evaluated.
+        One hash lookup per finding, so this is O(findings + baseline).
+        """
+        stored = self.load(scope)
+        added, unchanged, seen = list(), list(), set()
+        for finding in findings:
+            uuid = _record(finding)["uuid"]
+            seen.add(uuid)
+            (unchanged if uuid in stored else added).append(finding)
+        removed = [
+            record for uuid, record in stored.items()
+            if uuid not in seen and (rules is None or record["rule"] in rules)
+        ]
+        return added, removed, unchanged
+
+    def save(self, findings, scope=LOCAL_SCOPE, now=None, rules=None):
+        """
+        Replaces the baseline of `scope` with `findings` in one transaction. With `rules`, only the stored
+        findings of those rule ids are replaced, so a scan limited to some rules keeps the others.
+        Findings already in the baseline keep the time they were first saved.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            first_seen = dict(self._db.execute("SELECT uuid, first_seen FROM findings WHERE scope = ?", (scope,)))
+            rows = dict()
+            for finding in findings:
+                record = _record(finding)
+                rows[record["uuid"]] = (scope,) + tuple(record[f] for f in FIELDS) + (first_seen.get(record["uuid"], now), now)
+            with self._db:
+                if rules is None:
+                    self._db.execute("DELETE FROM findings WHERE scope = ?", (scope,))
+                else:
+                    self._db.executemany(
+                        "DELETE FROM findings WHERE scope = ? AND rule = ?", ((scope, rule) for rule in rules)
+                    )
+                self._db.executemany(
+                    f"INSERT OR REPLACE INTO findings (scope, {', '.join(FIELDS)}, first_seen, saved) VALUES ({', '.join('?' * (len(FIELDS) + 3))})",
+                    rows.values(),
+                )
+
+    def saved(self, scope=LOCAL_SCOPE):
+        """Returns when the baseline of `scope` was last saved, or None if it has never been."""
+        with self._lock:
+            return self._db.execute("SELECT MAX(saved) FROM findings WHERE scope = ?", (scope,)).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class BaselineDiff:
+    def __init__(self, baseline, scopes=(LOCAL_SCOPE,), evaluated=None):
+        """
+        Compares findings with a Baseline as they stream in, so results can be tagged without
+        waiting for the whole scan. Each of `scopes` is loaded once up front.
+        `evaluated` maps each scope to the ids of the rules the scan evaluated completely there; the
+        scan fills it in before `resolved` and `save` are called. Baseline findings of other rules or
+        unscanned scopes are neither resolved nor dropped. None means every rule in every scope.
+        """
+        self.baseline = baseline
+        self.evaluated = evaluated
+        self.stored = {scope: baseline.load(scope) for scope in scopes}
+        self.seen = {scope: dict() for scope in scopes}
+        self.states = dict()
+
+    def add(self, finding, scope=LOCAL_SCOPE):
+        """Records a finding of the current scan and returns "new" or "unchanged"."""
+        if scope not in self.stored:
+            self.stored[scope] = self.baseline.load(scope)
+            self.seen[scope] = dict()
+        uuid = str(finding.uuid)
+        self.seen[scope][uuid] = finding
+        state = "unchanged" if uuid in self.stored[scope] else "new"
+        self.states[(scope, uuid)] = state
+        return state
+
+    def state(self, finding, scope=LOCAL_SCOPE):
+        """Returns "new", "unchanged" or "resolved" for a finding already passed to `add` or returned by `resolved`."""
+        return self.states.get((scope, str(finding.uuid)))
+
+    def resolved(self):
+        """Returns (scope, Finding) for every baseline finding that the current scan didn't report."""
+        resolved = list()
+        for scope, stored in self.stored.items():
+            rules = self._rules(scope)
+            if rules is False:
+                continue
+            for uuid, record in stored.items():
+                if uuid not in self.seen[scope] and (rules is None or record["rule"] in rules):
+                    self.states[(scope, uuid)] = "resolved"
+                    resolved.append((scope, as_finding(record)))
+        return resolved
+
+    def _rules(self, scope):
+        """Returns the rule ids evaluated in `scope`, None for all of them, or False if it wasn't scanned."""
+        if self.evaluated is None:
+            return None
+        return self.evaluated.get(scope, False)
+
+    def save(self, now=None):
+        """Makes the current scan the new baseline of the rules and scopes it evaluated."""
+        for scope, seen in self.seen.items():
+            rules = self._rules(scope)
+            if rules is not False:
+                self.baseline.save(seen.values(), scope, now, rules)
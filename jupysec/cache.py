@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import threading
+
+from jupysec import discovery
+
+CACHE_NAME = "jupysec-cache.json"
+CACHE_VERSION = 3
+
+
+def file_stamp(st):
+    """
+    Returns what identifies an unchanged file: inode, size, mtime and ctime. The mtime alone is easily
+    restored after an edit with os.utime, but the ctime can't be set back and changes on every write.
+    """
+    return [st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns]
+
+
+def default_cache_path():
+    """Returns the cache file location in the Jupyter runtime directory, or None if it can't be resolved."""
+    runtime_dir = discovery.get_runtime_dir()
+    if runtime_dir is None:
+        return None
+    return os.path.join(runtime_dir, CACHE_NAME)
+
+
+class ConfigCache:
+    def __init__(self, path):
+        """
+        A JSON cache of parsed configuration files keyed on path, `file_stamp` and content hash.
+        Unchanged files are served from the cache without being read.
+        """
+        self.path = path
+        self.entries = dict()
+        self.seen = set()
+        self.dirty = False
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.entries = data.get("files", dict())
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def get(self, file, parse):
+        """
+        Returns the parsed contents of `file`, calling `parse(text)` only when the file has changed.
+        """
+        key = str(file)
+        st = os.stat(key)
+        with self._lock:
+            self.seen.add(key)
+            entry = self.entries.get(key)
+        if entry and entry["stamp"] == file_stamp(st):
+            return entry["parsed"]
+        with open(key, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        if entry and entry["hash"] == digest:
+            parsed = entry["parsed"]
+        else:
+            parsed = parse(data.decode())
+        with self._lock:
+            self.entries[key] = {
+                "stamp": file_stamp(st),
+                "hash": digest,
+                "parsed": parsed,
+            }
+            self.dirty = True
+        return parsed
+
+    def keep(self, file, st):
+        """Marks an unchanged cached `file` as seen without reading it; returns False if it isn't cached as of `st`."""
+        key = str(file)
+        with self._lock:
+            entry = self.entries.get(key)
+            if not (entry and entry["stamp"] == file_stamp(st)):
+                return False
+            self.seen.add(key)
+            return True
+
+    def save(self):
+        """Writes the cache atomically, dropping entries for files that were not seen in this scan."""
+        with self._lock:
+            stale = set(self.entries) - self.seen
+            for key in stale:
+                del self.entries[key]
+            if not (self.dirty or stale):
+                return
+            data = {"version": CACHE_VERSION, "files": self.entries}
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(tmp, "w") as f:
+                    json.dump(data, f)
+                os.replace(tmp, self.path)
+                self.dirty = False
+            except OSError:
+                pass
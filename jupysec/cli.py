@@ -0,0 +1,336 @@
+import argparse
+import itertools
+import json
+import os
+import sys
+
+from jupysec.baseline import LOCAL_SCOPE, Baseline, BaselineDiff, default_baseline_path
+from jupysec.finding import RULES
+from jupysec.plugins import load_rules, plugin_rule_ids
+from jupysec.rules import Rules, CHECKS, CHECK_CATEGORIES, COLLECTORS
+
+BASELINE_HELP = "jupysec-baseline.sqlite in the Jupyter runtime directory"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_LEVELS = {
+    "critical": "error",
+    "high": "error",
+    "medium": "warning",
+    "low": "note",
+    "info": "note",
+}
+
+
+def _names(value, choices, prefix=""):
+    """Parses a comma separated list of names, accepting them with or without `prefix`."""
+    names = list()
+    for name in filter(None, (x.strip() for x in value.split(","))):
+        if name not in choices and prefix + name in choices:
+            name = prefix + name
+        if name not in choices:
+            raise argparse.ArgumentTypeError(f"unknown name {name!r}, choose from {', '.join(choices)}")
+        names.append(name)
+    return names
+
+
+def _bytes(value):
+    """Parses a size such as 536870912, 512M or 2G."""
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    try:
+        if value[-1:].upper() in units:
+            return int(float(value[:-1]) * units[value[-1].upper()])
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size {value!r}, e.g. 536870912, 512M or 2G")
+
+
+def _unknown_categories(categories):
+    """
+    Returns the names in `categories` that no rule has. Built-in categories are known without importing
+    anything, so plugins are only loaded to look up a category that no built-in rule has.
+    """
+    known = set(CHECK_CATEGORIES.values())
+    if not set(categories) <= known:
+        load_rules()
+        known |= {RULES[r].category for r in plugin_rule_ids() if r in RULES}
+    return [c for c in categories if c not in known]
+
+
+def iter_results(args, metrics=None, evaluated=None):
+    """
+    Yields (check name, finding, root) for a local scan or, with --root, a fleet scan.
+    When given a `metrics` list, the scan metrics (per home with --root) are appended to it once the checks finish.
+    When given an `evaluated` dict, the ids of the rules evaluated completely are stored in it by scope.
+    """
+    kwargs = dict(
+        timeout=args.timeout, cache=args.cache or None, collectors=args.collectors, profile=args.profile, checks=args.checks,
+        categories=args.categories,
+        history_memory_limit=args.history_memory_limit,
+    )
+    if args.roots:
+        from jupysec.fleet import scan_fleet
+
+        for report in scan_fleet(args.roots, max_workers=args.workers, **kwargs):
+            for check, finding in report["findings"]:
+                yield check, finding, report["root"]
+            if metrics is not None:
+                metrics += [dict(m, root=report["root"], home=home) for home, m in report.get("metrics", dict()).items()]
+            if evaluated is not None:
+                # a root is scanned in several tasks; a rule counts only if every task evaluated it
+                rules = set(report.get("evaluated", ()))
+                root = report["root"]
+                evaluated[root] = rules if root not in evaluated else evaluated[root] & rules
+        return
+    rules = Rules(max_workers=args.workers or 4, probe=args.probe, **kwargs)
+    for check, finding in rules.run_checks():
+        yield check, finding, None
+    if evaluated is not None:
+        evaluated[LOCAL_SCOPE] = rules.evaluated_rules()
+    if metrics is not None:
+        metrics.append(dict(rules.metrics, profiles=rules.profiles) if args.profile else rules.metrics)
+
+
+def apply_baseline(results, diff, new_only=False):
+    """
+    Tags results against a BaselineDiff as they stream past, then yields the baseline findings that
+    were not reported again. With `new_only`, only findings missing from the baseline are yielded.
+    """
+    for check, finding, root in results:
+        if diff.add(finding, root or LOCAL_SCOPE) == "new" or not new_only:
+            yield check, finding, root
+    if not new_only:
+        for scope, finding in diff.resolved():
+            yield finding.rule.id, finding, None if scope == LOCAL_SCOPE else scope
+
+
+def write_jsonl(results, out, metrics=None, diff=None):
+    """
+    Writes one line per finding, then one {"metrics": ...} line per scan when `metrics` is given.
+    With a BaselineDiff each line says whether the finding is "new", "unchanged" or "resolved".
+    """
+    for check, finding, root in results:
+        record = finding.as_dict()
+        record["check"] = check
+        if root is not None:
+            record["root"] = root
+        if diff is not None:
+            record["baseline"] = diff.state(finding, root or LOCAL_SCOPE)
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+    for m in metrics or list():
+        out.write(json.dumps({"metrics": m}) + "\n")
+
+
+def watch(args, out):
+    """
+    Emits the current findings, then a "new" or "resolved" event each time a watched file changes
+    or a silent execution is committed to a history database.
+    """
+    from jupysec.watch import Watcher
+
+    rules = Rules(max_workers=args.workers or 4, timeout=args.timeout, collectors=args.collectors)
+    watcher = Watcher(rules, history=True)
+    events = itertools.chain((("new", f) for f in watcher.findings()), watcher.run())
+    for event, finding in events:
+        record = finding.as_dict()
+        record["event"] = event
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+
+SARIF_BASELINE_STATES = {"new": "new", "unchanged": "unchanged", "resolved": "absent"}
+
+
+def to_sarif(results, metrics=None, diff=None):
+    """
+    Builds a SARIF 2.1.0 log; SARIF is a single document so this consumes every result first.
+    Scan metrics, when given, go in the run's property bag. With a BaselineDiff each result
+    gets a SARIF baselineState.
+    """
+    rules = dict()
+    sarif_results = list()
+    for check, finding, root in results:
+        rules.setdefault(
+            check,
+            {
+                "id": check,
+                "name": check,
+                "shortDescription": {"text": finding.category},
+                "fullDescription": {"text": finding.source_details},
+                "help": {"text": finding.remediation},
+            },
+        )
+        result = {
+            "ruleId": check,
+            "level": SARIF_LEVELS.get(finding.rule.severity, "warning"),
+            "message": {"text": f"{finding.category}: {finding.source_text}"},
+            "locations": [
+                {"physicalLocation": {"artifactLocation": {"uri": str(finding.source_doc)}}}
+            ],
+        }
+        if root is not None:
+            result["properties"] = {"root": root}
+        if diff is not None:
+            result["baselineState"] = SARIF_BASELINE_STATES[diff.state(finding, root or LOCAL_SCOPE)]
+        sarif_results.append(result)
+    run = {
+        "tool": {
+            "driver": {
+                "name": "jupysec",
+                "informationUri": "https://github.com/JosephTLucas/jupysec",
+                "rules": list(rules.values()),
+            }
+        },
+        "results": sarif_results,
+    }
+    if metrics:
+        run["properties"] = {"metrics": metrics}
+    return {"$schema": SARIF_SCHEMA, "version": "2.1.0", "runs": [run]}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="jupysec", description="Evaluate the security posture of Jupyter environments.")
+    parser.add_argument("--format", choices=["jsonl", "sarif"], default="jsonl", help="output format (default: jsonl)")
+    parser.add_argument("-o", "--output", default="-", help="file to write to (default: stdout)")
+    parser.add_argument(
+        "--checks",
+        type=lambda x: _names(x, CHECKS + tuple(plugin_rule_ids()), "check_"),
+        default=None,
+        help="comma separated checks to run, e.g. for_token,pyconfig_codeexec, including rules from plugins (default: all)",
+    )
+    parser.add_argument(
+        "--categories",
+        type=lambda x: [name.strip() for name in x.split(",") if name.strip()],
+        default=None,
+        help="comma separated finding categories to report, e.g. 'Malicious Activity,Code Execution' (default: all)",
+    )
+    parser.add_argument(
+        "--first",
+        action="store_true",
+        help="stop at the first finding and exit with status 1, e.g. for a CI gate",
+    )
+    parser.add_argument(
+        "--collectors",
+        type=lambda x: _names(x, COLLECTORS),
+        default=None,
+        help=f"comma separated collectors to run from {', '.join(COLLECTORS)} (default: all)",
+    )
+    parser.add_argument("--timeout", type=float, default=30, help="seconds allowed for each collector (default: 30)")
+    parser.add_argument("--workers", type=int, default=None, help="number of collector threads, or of homes scanned in parallel with --root")
+    parser.add_argument("--cache", action="store_true", help="reuse parsed config files from the previous scan")
+    parser.add_argument(
+        "--history-memory-limit",
+        type=_bytes,
+        default=None,
+        help="scan history databases in worker processes whose address space is capped at this size, e.g. 512M",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="also report timings and counters for every collector and check, after the findings",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="run each check under cProfile and include the top functions with --metrics",
+    )
+    parser.add_argument(
+        "--probe",
+        action="store_true",
+        help="send each running server an unauthenticated API request to check whether it is open",
+    )
+    parser.add_argument(
+        "--baseline",
+        nargs="?",
+        const="",
+        default=None,
+        help="compare findings with a saved baseline and mark each new, unchanged or resolved; "
+        f"takes a SQLite file (default: {BASELINE_HELP})",
+    )
+    parser.add_argument(
+        "--new-only",
+        action="store_true",
+        help="report only findings that aren't in the baseline; implies --baseline",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="save this scan's findings as the baseline once they are reported; implies --baseline",
+    )
+    parser.add_argument(
+        "--send",
+        metavar="URL",
+        help="send the findings in gzip-compressed batches to a jupysec-aggregator, e.g. http://aggregator:8765/ingest, "
+        "and write a summary instead; the bearer token is read from $JUPYSEC_AGGREGATOR_TOKEN",
+    )
+    parser.add_argument("--host", help="the name findings are sent under with --send (default: this hostname)")
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and emit new and resolved findings as config files, startup directories and history databases change",
+    )
+    parser.add_argument(
+        "--root",
+        dest="roots",
+        action="append",
+        default=list(),
+        help="scan this home directory or filesystem root instead of the current environment; may be repeated",
+    )
+    args = parser.parse_args(argv)
+    if args.baseline is None and (args.new_only or args.update_baseline):
+        args.baseline = ""
+    if args.update_baseline and args.first:
+        parser.error("--update-baseline needs a complete scan and can't be combined with --first")
+    unknown = _unknown_categories(args.categories or list())
+    if unknown:
+        parser.error(f"unknown categories {', '.join(map(repr, unknown))}")
+    return args
+
+
+def open_baseline(args):
+    """Returns the Baseline selected by --baseline, or None when no baseline was asked for."""
+    if args.baseline is None:
+        return None
+    path = args.baseline or default_baseline_path()
+    if path is None:
+        raise SystemExit("jupysec: can't resolve the Jupyter runtime directory, pass --baseline PATH")
+    return Baseline(path)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        if args.watch:
+            watch(args, out)
+            return 0
+        metrics = list() if args.metrics or args.profile else None
+        # filled in as the scan finishes, so a scan limited to some checks, or one where a collector or
+        # root failed, doesn't resolve or drop the baseline findings it never looked for
+        evaluated = dict()
+        results = iter_results(args, metrics, evaluated)
+        baseline = open_baseline(args)
+        diff = None
+        if baseline is not None:
+            diff = BaselineDiff(baseline, args.roots or (LOCAL_SCOPE,), evaluated)
+            results = apply_baseline(results, diff, args.new_only)
+        if args.first:
+            results = list(itertools.islice(results, 1))
+        if args.send:
+            from jupysec.agent import SendError, TOKEN_ENV, send_results
+
+            try:
+                summary = send_results(results, args.send, args.host, os.environ.get(TOKEN_ENV))
+            except SendError as e:
+                raise SystemExit(f"jupysec: {e}")
+            out.write(json.dumps(summary) + "\n")
+        elif args.format == "sarif":
+            json.dump(to_sarif(results, metrics, diff), out, indent=2)
+            out.write("\n")
+        else:
+            write_jsonl(results, out, metrics, diff)
+        if args.update_baseline:
+            diff.save()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 1 if args.first and results else 0
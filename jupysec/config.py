@@ -0,0 +1,280 @@
+import ast
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from jupysec.cache import file_stamp
+
+CONFIG_FUNCTIONS = ("get_config",)
+# the line endings the tokenizer counts; str.splitlines also splits on form feeds and other separators
+NEWLINES = re.compile(r"\r\n|\r|\n")
+LIST_METHODS = ("append", "extend", "insert")
+DICT_METHODS = ("update",)
+
+
+class ConfigValue:
+    __slots__ = ("trait", "value", "literal", "path", "lineno", "text")
+
+    def __init__(self, trait, value, literal, path, lineno, text):
+        """
+        The resolved value of one trait such as "c.ServerApp.ip", with the statement that set it.
+        When the value isn't a literal, `literal` is False and `value` is the source of the expression.
+        """
+        self.trait = trait
+        self.value = value
+        self.literal = literal
+        self.path = path
+        self.lineno = lineno
+        self.text = text
+
+    def __repr__(self):
+        return f"ConfigValue({self.trait!r}, {self.value!r}, path={str(self.path)!r}, lineno={self.lineno})"
+
+
+def _segment(lines, node):
+    """
+    Returns the source of `node` from the pre-split, UTF-8 encoded `lines`.
+    Unlike ast.get_source_segment this doesn't resplit the whole file on each call.
+    """
+    if getattr(node, "end_lineno", None) is None:
+        return ""
+    first, last = node.lineno - 1, node.end_lineno - 1
+    if first == last:
+        return lines[first][node.col_offset:node.end_col_offset].decode(errors="replace")
+    parts = [lines[first][node.col_offset:]] + lines[first + 1:last] + [lines[last][:node.end_col_offset]]
+    return b"\n".join(parts).decode(errors="replace")
+
+
+def _literal(node, lines):
+    """Returns (value, True) for a JSON-serializable literal, else (expression source, False)."""
+    try:
+        value = ast.literal_eval(node)
+        json.dumps(value)
+        if isinstance(value, tuple):
+            value = list(value)
+        return value, True
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return _segment(lines, node), False
+
+
+class _Visitor(ast.NodeVisitor):
+    def __init__(self, source):
+        self.lines = [line.encode() for line in NEWLINES.split(source)]
+        self.configs = {"c"}
+        self.sections = dict()
+        self.records = list()
+        self.includes = list()
+
+    def _trait(self, node):
+        """Returns "c.Section.trait" for `c.Section.trait` or `section.trait`, where the names may be aliases."""
+        if not isinstance(node, ast.Attribute):
+            return None
+        owner = node.value
+        if isinstance(owner, ast.Name) and owner.id in self.sections:
+            return f"c.{self.sections[owner.id]}.{node.attr}"
+        if isinstance(owner, ast.Attribute) and isinstance(owner.value, ast.Name) and owner.value.id in self.configs:
+            return f"c.{owner.attr}.{node.attr}"
+        return None
+
+    def _record(self, trait, op, node, stmt):
+        value, literal = _literal(node, self.lines)
+        text = " ".join(_segment(self.lines, stmt).split())
+        self.records.append([trait, op, value, literal, stmt.lineno, text])
+
+    def visit_Assign(self, node):
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                call = node.value
+                if isinstance(call, ast.Call) and isinstance(call.func, ast.Name) and call.func.id in CONFIG_FUNCTIONS:
+                    self.configs.add(target.id)
+                elif isinstance(call, ast.Name) and call.id in self.configs:
+                    self.configs.add(target.id)
+                elif isinstance(call, ast.Attribute) and isinstance(call.value, ast.Name) and call.value.id in self.configs:
+                    self.sections[target.id] = call.attr
+                continue
+            trait = self._trait(target)
+            if trait:
+                self._record(trait, "=", node.value, node)
+
+    def visit_AugAssign(self, node):
+        trait = self._trait(node.target)
+        if trait and isinstance(node.op, ast.Add):
+            self._record(trait, "+=", node.value, node)
+
+    def visit_Expr(self, node):
+        call = node.value
+        if not isinstance(call, ast.Call):
+            return
+        func = call.func
+        if isinstance(func, ast.Name) and func.id == "load_subconfig" and call.args:
+            fname, literal = _literal(call.args[0], self.lines)
+            path = None
+            for keyword in call.keywords:
+                if keyword.arg == "path":
+                    path, _ = _literal(keyword.value, self.lines)
+            if len(call.args) > 1:
+                path, _ = _literal(call.args[1], self.lines)
+            if literal and isinstance(fname, str):
+                self.includes.append([fname, path if isinstance(path, str) else None])
+            return
+        if isinstance(func, ast.Attribute) and func.attr in LIST_METHODS + DICT_METHODS and call.args:
+            trait = self._trait(func.value)
+            if trait:
+                self._record(trait, func.attr, call.args[-1], node)
+
+
+def parse_py(text):
+    """
+    Parses a Python config file into {"records": [[trait, op, value, literal, lineno, text], ...], "includes": [[fname, path], ...]}.
+    Multi-line statements, `get_config()` aliases and section aliases such as `app = c.ServerApp` are resolved.
+    A file that isn't valid Python is parsed one line at a time so a single bad line doesn't hide the rest.
+    """
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        parsed = {"records": list(), "includes": list()}
+        for lineno, line in enumerate(text.splitlines(), 1):
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            try:
+                tree = ast.parse(line.strip())
+            except (SyntaxError, ValueError):
+                continue
+            visitor = _Visitor(line.strip())
+            visitor.visit(tree)
+            for record in visitor.records:
+                record[4] = lineno
+            parsed["records"] += visitor.records
+            parsed["includes"] += visitor.includes
+        return parsed
+    visitor = _Visitor(text)
+    visitor.visit(tree)
+    return {"records": visitor.records, "includes": visitor.includes}
+
+
+def parse_json(text):
+    """Parses a JSON config file such as jupyter_server_config.json into the same shape as `parse_py`."""
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = dict()
+    records = list()
+    for section, traits in (data.items() if isinstance(data, dict) else list()):
+        if not isinstance(traits, dict):
+            continue
+        for name, value in traits.items():
+            records.append([f"c.{section}.{name}", "=", value, True, 0, f"c.{section}.{name} = {json.dumps(value)}"])
+    return {"records": records, "includes": list()}
+
+
+def parse(path, text):
+    return parse_json(text) if str(path).endswith(".json") else parse_py(text)
+
+
+# the most recently read parses, so a long-running extension or watcher doesn't keep every file it ever saw
+MEMO_SIZE = 1024
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def read_config(path, cache=None):
+    """
+    Returns the parsed contents of one config file. The last MEMO_SIZE parses are kept in memory keyed
+    on `file_stamp`, and in `cache` (a ConfigCache) across scans when given. A file served from memory
+    is still marked as seen in `cache`, so saving the cache doesn't drop it.
+    """
+    key = str(path)
+    st = os.stat(key)
+    stamp = file_stamp(st)
+    with _memo_lock:
+        memo = _memo.get(key)
+        if memo:
+            _memo.move_to_end(key)
+    if memo and memo[0] == stamp and (cache is None or cache.keep(key, st)):
+        return memo[1]
+    if cache is not None:
+        parsed = cache.get(key, lambda text: parse(key, text))
+    else:
+        with open(key, "r") as f:
+            parsed = parse(key, f.read())
+    with _memo_lock:
+        _memo[key] = (stamp, parsed)
+        _memo.move_to_end(key)
+        while len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+    return parsed
+
+
+def _merge(previous, op, value, literal):
+    if op == "=" or previous is None:
+        return value, literal
+    if not (literal and previous.literal):
+        return value, False
+    if op in ("+=", "extend") and isinstance(previous.value, list) and isinstance(value, list):
+        return previous.value + value, True
+    if op in ("append", "insert") and isinstance(previous.value, list):
+        return previous.value + [value], True
+    if op == "update" and isinstance(previous.value, dict) and isinstance(value, dict):
+        return {**previous.value, **value}, True
+    return value, False
+
+
+def load_traits(files, cache=None, traits=None):
+    """
+    Resolves the traits set by `files`, in order, into {trait: ConfigValue}. Later assignments win,
+    like traitlets, and `load_subconfig` includes are followed relative to the including file.
+    """
+    traits = dict() if traits is None else traits
+    seen = set()
+
+    def load(path):
+        path = os.path.abspath(path)
+        if path in seen:
+            return
+        seen.add(path)
+        try:
+            parsed = read_config(path, cache)
+        except (OSError, UnicodeDecodeError):
+            return
+        for trait, op, value, literal, lineno, text in parsed["records"]:
+            value, literal = _merge(traits.get(trait), op, value, literal)
+            traits[trait] = ConfigValue(trait, value, literal, path, lineno, text)
+        for fname, include_dir in parsed["includes"]:
+            load(os.path.join(include_dir or os.path.dirname(path), fname))
+
+    for file in files:
+        load(file)
+    return traits
+
+
+def config_scope(path):
+    """Returns the scope a config file belongs to: its directory and app, e.g. ".../profile_default/ipython_config"."""
+    return os.path.splitext(os.path.abspath(path))[0]
+
+
+def load_scopes(files, cache=None):
+    """
+    Resolves each config scope on its own into {scope: {trait: ConfigValue}}. Jupyter merges the .py and
+    .json files of one app in one directory, the JSON last, but never merges two profiles or config
+    directories, so a trait set in both profile_default and profile_evil is kept once for each.
+    """
+    grouped = dict()
+    for file in files:
+        grouped.setdefault(config_scope(file), list()).append(file)
+    return {
+        scope: load_traits(sorted(group, key=lambda f: str(f).endswith(".json")), cache)
+        for scope, group in grouped.items()
+    }
+
+
+def traits_from_lines(lines):
+    """Builds {scope: {trait: ConfigValue}} from a {statement: path} dict, e.g. the `uncommented` argument of Rules."""
+    scopes = dict()
+    for line, path in lines.items():
+        traits = scopes.setdefault(str(path), dict())
+        for trait, op, value, literal, lineno, text in parse_py(line)["records"]:
+            value, literal = _merge(traits.get(trait), op, value, literal)
+            traits[trait] = ConfigValue(trait, value, literal, path, lineno, text)
+    return scopes
@@ -0,0 +1,72 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+
+def get_ipython_dir():
+    """Resolves the IPython directory the same way `ipython locate` does, without starting IPython."""
+    ipdir = os.environ.get("IPYTHONDIR") or os.environ.get("IPYTHON_DIR")
+    if ipdir:
+        return os.path.expanduser(ipdir)
+    home = os.path.expanduser("~")
+    if home == "~":
+        return None
+    return os.path.join(home, ".ipython")
+
+
+def get_jupyter_paths():
+    """
+    Returns the config, data and runtime paths reported by `jupyter --paths`.
+    Returns None when jupyter_core is not importable so the caller can fall back to the CLI.
+    """
+    try:
+        from jupyter_core import paths as jpaths
+    except ImportError:
+        return None
+    paths = list()
+    paths += jpaths.jupyter_config_path()
+    paths += jpaths.jupyter_path()
+    paths.append(jpaths.jupyter_runtime_dir())
+    return paths
+
+
+def get_runtime_dir():
+    """Returns the Jupyter runtime directory, or None when jupyter_core is not importable."""
+    if os.environ.get("JUPYTER_RUNTIME_DIR"):
+        return os.environ["JUPYTER_RUNTIME_DIR"]
+    try:
+        from jupyter_core.paths import jupyter_runtime_dir
+    except ImportError:
+        return None
+    return jupyter_runtime_dir()
+
+
+def _pid_alive(pid):
+    if not pid or sys.platform == "win32":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_server_files(runtime_dir, check_pid=True):
+    """
+    Yields the parsed runtime info file of every server or notebook in `runtime_dir`.
+    Servers whose pid is no longer running are skipped unless `check_pid` is False.
+    """
+    for file in sorted(Path(runtime_dir).glob("*server-*.json")):
+        try:
+            with open(file, "r") as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if not isinstance(info, dict) or "url" not in info:
+            continue
+        if not check_pid or _pid_alive(info.get("pid")):
+            yield info
+
@@ -1,14 +1,147 @@
-from dataclasses import dataclass
+import hashlib
 import uuid
 
-@dataclass
+from jupysec.matcher import PrefixMatcher
+
+RULES = dict()
+SEVERITIES = ("info", "low", "medium", "high", "critical")
+ADHOC_PREFIX = "adhoc-"
+
+
+class Rule:
+    __slots__ = ("id", "category", "details", "remediation", "severity", "inputs", "check", "matcher")
+
+    def __init__(self, id, category="Uncategorized", details="", remediation="", severity="medium", inputs=(), check=None, prefixes=None):
+        """
+        Metadata shared by every finding of one rule.
+        `inputs` names the collectors the rule reads, so a scan only collects what its rules need.
+        `check` is a callable taking a Rules instance and returning findings; rules built into Rules
+        leave it unset and run the method of the same name. A rule given config trait `prefixes`
+        needs no check at all: its traits are matched with a precompiled PrefixMatcher.
+        """
+        if severity not in SEVERITIES:
+            raise ValueError(f"severity must be one of {', '.join(SEVERITIES)}")
+        self.id = id
+        self.category = category
+        self.details = details
+        self.remediation = remediation
+        self.severity = severity
+        self.matcher = PrefixMatcher({id: prefixes}) if prefixes else None
+        self.inputs = tuple(inputs) or (("uncommented",) if prefixes else ())
+        self.check = check
+
+    def __reduce__(self):
+        # built-in and plugin rules can be found again by id in another process; ad-hoc and unregistered rules can't
+        if RULES.get(self.id) is self and not self.id.startswith(ADHOC_PREFIX):
+            return (get_rule, (self.id,))
+        prefixes = self.matcher.families[self.id] if self.matcher else None
+        args = (self.id, self.category, self.details, self.remediation, self.severity, self.inputs, self.check, prefixes)
+        return (_restore_rule, (RULES.get(self.id) is self,) + args)
+
+    def __repr__(self):
+        return f"Rule({self.id!r}, category={self.category!r})"
+
+
+def register_rule(id, category="Uncategorized", details="", remediation="", severity="medium", inputs=(), check=None, prefixes=None):
+    """Registers a rule under `id` and returns it; registering the same id again returns the existing rule."""
+    if id not in RULES:
+        RULES[id] = Rule(id, category, details, remediation, severity, inputs, check, prefixes)
+    return RULES[id]
+
+
+def get_rule(id):
+    """Returns a registered rule, loading it from its plugin if it hasn't been loaded in this process yet."""
+    if id not in RULES:
+        from jupysec.plugins import load_rules
+
+        load_rules([id])
+    return RULES[id]
+
+
+def _restore_rule(registered, *args):
+    """Unpickles a rule that can't be looked up by id, registering it again if it was registered."""
+    if registered:
+        return register_rule(*args)
+    return Rule(*args)
+
+
+def _adhoc_rule(category, details, remediation):
+    key = hashlib.sha1("\0".join((category, details, remediation)).encode()).hexdigest()[:12]
+    return register_rule(f"{ADHOC_PREFIX}{key}", category, details, remediation)
+
+
 class Finding:
-    category: str = "Uncategorized"
-    source_doc: str = ""
-    source_text: str = ""
-    source_details: str = ""
-    remediation: str = ""
-    uuid = None
-
-    def __post_init__(self):
-        self.uuid = uuid.uuid4()
\ No newline at end of file
+    __slots__ = ("rule", "source_doc", "source_text", "_uuid")
+
+    def __init__(self, category="Uncategorized", source_doc="", source_text="", source_details="", remediation="", rule=None):
+        """
+        A match against a rule. Category, details and remediation live on the shared `rule`;
+        findings built from those fields alone get an ad-hoc rule so existing callers keep working.
+        """
+        self.rule = rule if rule is not None else _adhoc_rule(category, source_details, remediation)
+        self.source_doc = source_doc
+        self.source_text = source_text
+        self._uuid = None
+
+    @property
+    def category(self):
+        return self.rule.category
+
+    @property
+    def source_details(self):
+        return self.rule.details
+
+    @property
+    def remediation(self):
+        return self.rule.remediation
+
+    @property
+    def key(self):
+        return (self.rule.id, str(self.source_doc), str(self.source_text))
+
+    @property
+    def uuid(self):
+        """A deterministic ID derived from the rule, source_doc and source_text, stable across scans."""
+        if self._uuid is None:
+            digest = hashlib.sha1("\0".join(self.key).encode()).digest()
+            self._uuid = uuid.UUID(bytes=digest[:16])
+        return self._uuid
+
+    def __eq__(self, other):
+        if not isinstance(other, Finding):
+            return NotImplemented
+        return self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return f"Finding(rule={self.rule.id!r}, source_doc={self.source_doc!r}, source_text={self.source_text!r})"
+
+    def as_dict(self):
+        """Returns the finding as a JSON-serializable dict."""
+        return {
+            "uuid": str(self.uuid),
+            "rule": self.rule.id,
+            "category": self.category,
+            "severity": self.rule.severity,
+            "source_doc": str(self.source_doc),
+            "source_text": str(self.source_text),
+            "source_details": self.source_details,
+            "remediation": self.remediation,
+        }
+
+
+def dedupe(findings):
+    """Drops repeated findings, keeping the first of each."""
+    return list(dict.fromkeys(findings))
+
+
+def diff_findings(old, new):
+    """Compares two scans by finding ID and returns (added, removed, unchanged)."""
+    old = {f.uuid: f for f in old}
+    new = {f.uuid: f for f in new}
+    added = [f for id, f in new.items() if id not in old]
+    removed = [f for id, f in old.items() if id not in new]
+    unchanged = [f for id, f in new.items() if id in old]
+    return added, removed, unchanged
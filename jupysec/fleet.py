@@ -0,0 +1,161 @@
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from jupysec.cache import default_cache_path
+from jupysec.servers import inventory
+from jupysec.rules import Rules
+
+SYSTEM_CONFIG_PATHS = ("etc/jupyter", "usr/local/etc/jupyter")
+SYSTEM_DATA_PATHS = ("usr/share/jupyter", "usr/local/share/jupyter")
+# files every distribution image has, and a home directory doesn't
+ROOTFS_MARKERS = ("etc/os-release", "usr/lib/os-release", "etc/passwd")
+
+
+def resolve_root(root):
+    """
+    Resolves the home directories and system-wide Jupyter paths inside a filesystem root.
+    A root is treated as a container rootfs or mounted host if it has one of ROOTFS_MARKERS,
+    otherwise as a single home directory, which may well have etc/ or home/ subdirectories of its own.
+    """
+    root = Path(root)
+    if any((root / marker).is_file() for marker in ROOTFS_MARKERS):
+        homes = [root / "root"] if (root / "root").is_dir() else list()
+        if (root / "home").is_dir():
+            homes += sorted(p for p in (root / "home").iterdir() if p.is_dir())
+        system_paths = [root / p for p in SYSTEM_CONFIG_PATHS + SYSTEM_DATA_PATHS]
+        system_paths = [str(p) for p in system_paths if p.is_dir()]
+    else:
+        homes = [root]
+        system_paths = list()
+    return [str(h) for h in homes], system_paths
+
+
+def home_cache_path(home, cache):
+    """Returns the cache file for one scanned home: `cache`, or the default cache when True, in a directory per home."""
+    cache = default_cache_path() if cache is True else cache
+    if cache is None:
+        return None
+    key = hashlib.sha1(os.path.abspath(home).encode()).hexdigest()[:16]
+    return os.path.join(os.path.dirname(cache), "jupysec-homes", key, os.path.basename(cache))
+
+
+class RootRules(Rules):
+    def __init__(self, home, system_paths=list(), **kwargs):
+        """
+        Evaluates the rules against a home directory that isn't the current user's, e.g. on a mounted volume,
+        and against `system_paths`. With `home` None, only the system paths are scanned.
+        A `cache` is kept per home, next to the given cache file, so homes scanned one after another or in
+        parallel processes don't prune or overwrite each other's cache and history watermarks.
+        """
+        self.home = home
+        self.system_paths = list(system_paths)
+        if kwargs.get("cache"):
+            kwargs["cache"] = home_cache_path(home or os.pathsep.join(self.system_paths), kwargs["cache"])
+        super().__init__(**kwargs)
+
+    def _runtime_dir(self):
+        return os.path.join(self.home, ".local", "share", "jupyter", "runtime") if self.home else None
+
+    def _get_locations(self):
+        if not self.home:
+            return False
+        ipython_dir = os.path.join(self.home, ".ipython")
+        return ipython_dir if os.path.isdir(ipython_dir) else False
+
+    def _get_paths(self):
+        paths = list()
+        if self.home:
+            paths = [
+                os.path.join(self.home, ".jupyter"),
+                os.path.join(self.home, ".local", "share", "jupyter"),
+                self._runtime_dir(),
+            ]
+        paths = [p for p in paths if os.path.isdir(p)] + self.system_paths
+        return paths if len(paths) > 0 else False
+
+    def _get_sockets(self):
+        # the live sockets on this host don't belong to a mounted root
+        return False
+
+    def _get_servers(self):
+        if not self.home:
+            return False
+        # pids in a snapshot or another container aren't ours to check
+        servers = inventory(self._runtime_dir(), check_pid=False)
+        return servers if servers else False
+
+
+def root_tasks(root):
+    """
+    Returns the (home, system paths) units a root is scanned in: one per home, and one for the
+    system-wide paths of a rootfs, so those are scanned and reported once rather than with every home.
+    """
+    homes, system_paths = resolve_root(root)
+    return ([(None, system_paths)] if system_paths else list()) + [(home, list()) for home in homes]
+
+
+def scan_home(root, home, system_paths=list(), checks=None, categories=None, **kwargs):
+    """
+    Runs the checks against one home directory of `root`, or its system paths when `home` is None.
+    Returns a report whose findings are (check name, finding) pairs and whose metrics are keyed by home;
+    its "evaluated" lists the rules that were evaluated completely.
+    """
+    r = RootRules(home, system_paths, checks=checks, categories=categories, **kwargs)
+    name = home or "system"
+    return {
+        "root": str(root),
+        "home": home,
+        "findings": list(r.run_checks(categories=categories)),
+        "errors": {f"{name}:{collector}": error for collector, error in r.collector_errors.items()},
+        "metrics": {name: r.metrics},
+        "evaluated": sorted(r.evaluated_rules(categories=categories)),
+    }
+
+
+def _failed(root, home, error):
+    return {"root": str(root), "home": home, "findings": list(), "errors": {"scan": repr(error)}, "metrics": dict()}
+
+
+def scan_root(root, **kwargs):
+    """
+    Scans every home and the system paths of `root` in this process and returns one report for the root,
+    in which only the rules evaluated in every unit are listed as evaluated.
+    """
+    report = {"root": str(root), "homes": list(), "findings": list(), "errors": dict(), "metrics": dict()}
+    evaluated = None
+    for home, system_paths in root_tasks(root):
+        unit = scan_home(root, home, system_paths, **kwargs)
+        if home:
+            report["homes"].append(home)
+        report["findings"] += unit["findings"]
+        report["errors"].update(unit["errors"])
+        report["metrics"].update(unit["metrics"])
+        evaluated = set(unit["evaluated"]) if evaluated is None else evaluated & set(unit["evaluated"])
+    report["evaluated"] = sorted(evaluated or set())
+    return report
+
+
+def scan_fleet(roots, max_workers=None, **kwargs):
+    """
+    Scans many filesystem roots on a pool of `max_workers` processes, one task per home and one for the
+    system paths of each rootfs, so a single image with many homes is spread over the pool too.
+    Yields one report per task as each finishes, see `scan_home`. A root that can't be resolved, or a
+    task that fails, is reported with an "errors" entry and no "evaluated" rules.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = dict()
+        for root in roots:
+            try:
+                tasks = root_tasks(root)
+            except OSError as e:
+                yield _failed(root, None, e)
+                continue
+            for home, system_paths in tasks:
+                futures[pool.submit(scan_home, root, home, system_paths, **kwargs)] = (root, home)
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield _failed(*futures[future], e)
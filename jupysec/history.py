@@ -0,0 +1,252 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from jupysec.walk import FileIndex
+
+STATE_NAME = "jupysec-history.json"
+SILENT_PATTERN = "%execute_interactive%code%silent%=%True%"
+
+
+def connect_readonly(db):
+    """Opens a history database read-only so scans never contend with the kernel's writer."""
+    uri = Path(db).absolute().as_uri() + "?mode=ro"
+    return sqlite3.connect(uri, uri=True)
+
+
+def last_rowid(con):
+    """
+    Returns the rowid of the newest history row. Rows are numbered in the order they are written,
+    so unlike (session, line) this also moves past lines that an older, still running session adds
+    after a newer session has started.
+    """
+    return con.execute("SELECT MAX(rowid) FROM history").fetchone()[0]
+
+
+def iter_silent(con, after=None, until=None, batch_size=1000):
+    """
+    Streams (session, line, source) for silent executions with rowids in (after, until].
+    Rows are fetched `batch_size` at a time so large databases are never loaded into memory.
+    """
+    query = "SELECT session, line, source FROM history WHERE source LIKE ?"
+    params = [SILENT_PATTERN]
+    if after is not None:
+        query += " AND rowid > ?"
+        params.append(after)
+    if until is not None:
+        query += " AND rowid <= ?"
+        params.append(until)
+    cur = con.execute(query + " ORDER BY rowid", params)
+    while True:
+        rows = cur.fetchmany(batch_size)
+        if not rows:
+            break
+        for row in rows:
+            yield tuple(row)
+
+
+def scan_db(db, saved=None, batch_size=1000):
+    """
+    Scans one database, resuming from the watermark and matches in `saved`.
+    Returns (silent executions, new watermark).
+    """
+    saved = saved or dict()
+    watermark = saved.get("watermark")
+    found = [tuple(row) for row in saved.get("found", list())]
+    if not isinstance(watermark, int):
+        # never scanned, or saved by a version that kept a (session, line) watermark
+        watermark, found = None, list()
+    con = connect_readonly(db)
+    try:
+        until = last_rowid(con)
+        if until is None or (watermark is not None and until < watermark):
+            # empty or rewritten database, start over
+            watermark, found = None, list()
+        if until is not None and until != watermark:
+            found += iter_silent(con, after=watermark, until=until, batch_size=batch_size)
+    finally:
+        con.close()
+    return found, until
+
+
+def _limit_memory(limit):
+    if not limit:
+        return
+    try:
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError):
+        pass
+
+
+def _scan_worker(db, saved, batch_size):
+    try:
+        found, until = scan_db(db, saved, batch_size)
+    except (sqlite3.Error, MemoryError) as e:
+        return db, None, None, repr(e)
+    return db, found, until, None
+
+
+class HistoryScanner:
+    def __init__(self, state=None, batch_size=1000):
+        """
+        Scans history databases for silent executions.
+        When `state` is a file path, the last scanned rowid of each database and the
+        executions found so far are persisted there, so later scans only read new rows.
+        """
+        self.state = state
+        self.batch_size = batch_size
+        self.watermarks = dict()
+        self.errors = dict()
+        self._lock = threading.Lock()
+        if state:
+            try:
+                with open(state, "r") as f:
+                    self.watermarks = json.load(f)
+            except (OSError, ValueError):
+                pass
+
+    def scan(self, db):
+        """Returns every silent execution in `db` as a list of (session, line, source)."""
+        key = str(db)
+        with self._lock:
+            saved = self.watermarks.get(key)
+        found, until = scan_db(db, saved, self.batch_size)
+        with self._lock:
+            self.watermarks[key] = {"watermark": until, "found": found}
+        return found
+
+    def sweep(self, roots, max_workers=None, memory_limit=None, max_depth=6):
+        """
+        Finds every history database below `roots` and scans them on a pool of `max_workers`
+        processes, each limited to `memory_limit` bytes of address space where supported.
+        Yields (silent executions, path) as each database finishes; failed databases are skipped
+        and recorded in `errors`.
+        """
+        dbs = [f for f in FileIndex(roots, max_depth=max_depth).iter_files() if f.name == "history.sqlite"]
+        if not dbs:
+            return
+        with self._lock:
+            saved = {str(db): self.watermarks.get(str(db)) for db in dbs}
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_limit_memory, initargs=(memory_limit,)
+        ) as pool:
+            futures = [pool.submit(_scan_worker, db, saved[str(db)], self.batch_size) for db in dbs]
+            for future in as_completed(futures):
+                db, found, until, error = future.result()
+                if error:
+                    self.errors[str(db)] = error
+                    continue
+                with self._lock:
+                    self.watermarks[str(db)] = {"watermark": until, "found": found}
+                yield found, db
+
+    def save(self):
+        if not self.state:
+            return
+        with self._lock:
+            tmp = f"{self.state}.{os.getpid()}.tmp"
+            try:
+                with open(tmp, "w") as f:
+                    json.dump(self.watermarks, f)
+                os.replace(tmp, self.state)
+            except OSError:
+                pass
+
+
+class HistoryTail:
+    def __init__(self, dbs, interval=1.0, from_start=False):
+        """
+        Follows history databases for new silent executions.
+        Each poll costs one stat of the database and its WAL per watched database; the database is
+        only queried, for rows past the last seen rowid, when those stats change.
+        Unless `from_start` is set, rows that existed before tailing began are skipped. A database
+        that is replaced or rotated later is read from its start.
+        """
+        self.interval = interval
+        self.from_start = from_start
+        self.dbs = dict()
+        for db in dbs:
+            self.add(db)
+
+    def add(self, db):
+        key = str(db)
+        if key not in self.dbs:
+            self.dbs[key] = {"con": None, "watermark": None, "stat": None, "ino": None, "seeded": False}
+
+    def _stat(self, db):
+        stat = list()
+        for path in (db, db + "-wal"):
+            try:
+                st = os.stat(path)
+                stat.append((st.st_ino, st.st_size, st.st_mtime_ns))
+            except OSError:
+                stat.append(None)
+        return tuple(stat)
+
+    def poll(self):
+        """Yields (path, (session, line, source)) for silent executions committed since the last poll."""
+        for db, state in self.dbs.items():
+            stat = self._stat(db)
+            if stat == state["stat"]:
+                continue
+            state["stat"] = stat
+            ino = stat[0][0] if stat[0] else None
+            if state["seeded"] and ino != state["ino"]:
+                # a new file at this path: everything in it is new
+                self._reset(state)
+                state.update(watermark=None, ino=ino)
+            try:
+                if not state["seeded"] and ino is None:
+                    state["seeded"] = True
+                    continue
+                if state["con"] is None:
+                    state["con"] = connect_readonly(db)
+                    if not state["seeded"]:
+                        state.update(seeded=True, ino=ino)
+                        if not self.from_start:
+                            state["watermark"] = last_rowid(state["con"])
+                            continue
+                con = state["con"]
+                until = last_rowid(con)
+                if until is not None and state["watermark"] is not None and until < state["watermark"]:
+                    # rewritten in place
+                    state["watermark"] = None
+                if until is None or until == state["watermark"]:
+                    continue
+                for row in iter_silent(con, after=state["watermark"], until=until):
+                    yield db, row
+                state["watermark"] = until
+            except sqlite3.Error:
+                # e.g. locked or mid-rotation; the watermark is kept and the next change retries
+                self._reset(state)
+
+    def _reset(self, state):
+        if state["con"] is not None:
+            state["con"].close()
+        state.update(con=None, stat=None)
+
+    def findings(self):
+        """Polls once and returns the new silent executions as findings."""
+        from jupysec.finding import Finding
+        from jupysec.rules import RULES
+
+        rule = RULES["check_for_silent_history"]
+        return [Finding(rule=rule, source_text=row[2], source_doc=Path(db)) for db, row in self.poll()]
+
+    def run(self, timeout=None):
+        """Yields findings as they are committed; stops after `timeout` seconds without any."""
+        idle = 0
+        while timeout is None or idle < timeout:
+            found = self.findings()
+            yield from found
+            idle = 0 if found else idle + self.interval
+            time.sleep(self.interval)
+
+    def close(self):
+        for state in self.dbs.values():
+            self._reset(state)
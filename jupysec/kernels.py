@@ -0,0 +1,127 @@
+import json
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+
+LOOPBACK_IPS = ("127.0.0.1", "localhost", "::1")
+MIN_KEY_LENGTH = 32
+INJECTION_ARGS = (
+    "-c",
+    "--exec-lines",
+    "--exec-files",
+    "--ext",
+    "--InteractiveShellApp.exec_lines",
+    "--InteractiveShellApp.exec_files",
+    "--InteractiveShellApp.code_to_run",
+    "--InteractiveShellApp.extensions",
+    "--IPKernelApp.exec_lines",
+    "--IPKernelApp.exec_files",
+    "--IPKernelApp.code_to_run",
+    "--IPKernelApp.extensions",
+    "--IPKernelApp.extra_extensions",
+    "--IPKernelApp.module_to_run",
+    "--IPKernelApp.file_to_run",
+)
+INJECTION_ENV = (
+    "PYTHONSTARTUP",
+    "PYTHONPATH",
+    "PYTHONHOME",
+    "PYTHONUSERBASE",
+    "LD_PRELOAD",
+    "LD_LIBRARY_PATH",
+    "DYLD_INSERT_LIBRARIES",
+    "BASH_ENV",
+    "ENV",
+    "NODE_OPTIONS",
+    "PERL5OPT",
+)
+
+
+def is_connection_file(path):
+    return path.name.startswith("kernel-") and path.name.endswith(".json") and path.parent.name == "runtime"
+
+
+def is_kernelspec(path):
+    return path.name == "kernel.json" and path.parent.parent.name == "kernels"
+
+
+def audit_connection(text):
+    """Returns the problems with a kernel connection file's HMAC key and ip as a list of strings."""
+    try:
+        info = json.loads(text)
+    except ValueError:
+        return list()
+    if not isinstance(info, dict):
+        return list()
+    problems = list()
+    key = info.get("key", "")
+    if not key:
+        problems.append("empty HMAC key, messages are not signed")
+    elif len(key) < MIN_KEY_LENGTH:
+        problems.append(f"weak HMAC key of {len(key)} characters")
+    if info.get("signature_scheme", "hmac-sha256") not in ("hmac-sha256", "hmac-sha512"):
+        problems.append(f"signature_scheme = {info['signature_scheme']}")
+    ip = info.get("ip", "127.0.0.1")
+    if info.get("transport", "tcp") == "tcp" and ip not in LOOPBACK_IPS:
+        problems.append(f"ip = {ip}")
+    return problems
+
+
+def audit_kernelspec(text):
+    """Returns the argv and env entries of a kernelspec that inject code as a list of strings."""
+    try:
+        spec = json.loads(text)
+    except ValueError:
+        return list()
+    if not isinstance(spec, dict):
+        return list()
+    problems = list()
+    argv = spec.get("argv") or list()
+    for i, arg in enumerate(argv):
+        if not isinstance(arg, str):
+            continue
+        if arg in INJECTION_ARGS or arg.split("=", 1)[0] in INJECTION_ARGS:
+            value = arg if "=" in arg or i + 1 >= len(argv) else f"{arg} {argv[i + 1]}"
+            problems.append(f"argv: {value}")
+    env = spec.get("env") or dict()
+    if isinstance(env, dict):
+        for name in sorted(env):
+            if name in INJECTION_ENV:
+                problems.append(f"env: {name}={env[name]}")
+    return problems
+
+
+def _audit(file, cache):
+    """Returns (kind, problems) for one file; permissions come from a fresh stat, contents from the cache."""
+    kind = "connection" if is_connection_file(file) else "kernelspec"
+    try:
+        mode = os.stat(file).st_mode
+        if cache is not None:
+            problems = list(cache.get(file, audit_connection if kind == "connection" else audit_kernelspec))
+        else:
+            with open(file, "r") as f:
+                text = f.read()
+            problems = audit_connection(text) if kind == "connection" else audit_kernelspec(text)
+    except (OSError, UnicodeDecodeError):
+        return kind, list()
+    if kind == "connection" and mode & stat.S_IROTH:
+        problems.append(f"mode {stat.S_IMODE(mode):04o}, readable by every user")
+    if kind == "kernelspec" and mode & stat.S_IWOTH:
+        problems.append(f"mode {stat.S_IMODE(mode):04o}, writable by every user")
+    return kind, problems
+
+
+def audit_kernel_files(files, cache=None, max_workers=4):
+    """
+    Audits kernel connection files and kernelspecs on a pool of `max_workers` threads.
+    Unchanged files are served from `cache` (a ConfigCache) without being read.
+    Returns a list of (kind, problem, path) where kind is "connection" or "kernelspec".
+    """
+    files = [f for f in files if is_connection_file(f) or is_kernelspec(f)]
+    if not files:
+        return list()
+    results = list()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for file, (kind, problems) in zip(files, pool.map(lambda f: _audit(f, cache), files)):
+            results += [(kind, problem, file) for problem in problems]
+    return results
@@ -0,0 +1,34 @@
+class PrefixMatcher:
+    def __init__(self, families):
+        """
+        Compiles the prefixes of every rule family into one character trie.
+        `families` maps a family name to an iterable of prefixes such as "c.ServerApp.ip".
+        """
+        self.families = {family: tuple(prefixes) for family, prefixes in families.items()}
+        self._root = dict()
+        for family, prefixes in self.families.items():
+            for prefix in prefixes:
+                node = self._root
+                for char in prefix:
+                    node = node.setdefault(char, dict())
+                node.setdefault(None, set()).add(family)
+
+    def match(self, line):
+        """Returns the set of families with a prefix that `line` starts with."""
+        matched = set()
+        node = self._root
+        for char in line:
+            node = node.get(char)
+            if node is None:
+                break
+            if None in node:
+                matched |= node[None]
+        return matched
+
+    def classify(self, lines):
+        """Classifies every line in a single pass, returning a dict of family to the matching lines."""
+        classified = {family: list() for family in self.families}
+        for line in lines:
+            for family in self.match(line):
+                classified[family].append(line)
+        return classified
@@ -0,0 +1,55 @@
+import cProfile
+import io
+import pstats
+
+PROFILE_LINES = 25
+
+
+def profile_call(func, lines=PROFILE_LINES):
+    """Runs `func` under cProfile and returns (its result, the top `lines` functions by cumulative time as text)."""
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func)
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(lines)
+    return result, out.getvalue()
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for v in labels.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + "}"
+
+
+def prometheus_text(metrics, finished=None):
+    """
+    Formats the `metrics` of a Rules scan in the Prometheus text exposition format (version 0.0.4).
+    Every value is a gauge describing the most recent scan.
+    """
+    families = dict()
+
+    def add(name, help, value, **labels):
+        family = families.setdefault(name, (help, list()))
+        family[1].append(f"{name}{_labels(labels)} {float(value)!r}")
+
+    for collector, values in sorted(metrics.get("collectors", dict()).items()):
+        add("jupysec_collector_seconds", "Wall time of each collector in the last scan.", values.get("seconds", 0), collector=collector)
+        add("jupysec_collector_error", "1 if the collector raised or timed out in the last scan.", int(bool(values.get("error"))), collector=collector)
+        for counter, value in sorted(values.items()):
+            if counter not in ("seconds", "error") and isinstance(value, (int, float)):
+                add("jupysec_collector_items", "Items each collector visited or produced, e.g. files, dirs or rows_matched.", value, collector=collector, counter=counter)
+    for check, values in sorted(metrics.get("checks", dict()).items()):
+        add("jupysec_check_seconds", "Wall time of each check in the last scan.", values.get("seconds", 0), check=check)
+        add("jupysec_check_findings", "Findings from each check in the last scan.", values.get("findings", 0), check=check)
+    subprocess = metrics.get("subprocess", dict())
+    add("jupysec_subprocess_calls", "Jupyter CLI processes started by the last scan.", subprocess.get("calls", 0))
+    add("jupysec_subprocess_seconds", "Wall time spent in Jupyter CLI processes by the last scan.", subprocess.get("seconds", 0))
+    if "collect_seconds" in metrics:
+        add("jupysec_collect_seconds", "Wall time of all collection in the last scan.", metrics["collect_seconds"])
+    if finished is not None:
+        add("jupysec_last_scan_timestamp_seconds", "Unix time the last scan finished.", finished)
+
+    lines = list()
+    for name, (help, samples) in families.items():
+        lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge"] + samples
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,56 @@
+import sys
+
+from jupysec.finding import RULES, Rule
+
+ENTRY_POINT_GROUP = "jupysec.rules"
+
+_entry_points = None
+
+
+def entry_points():
+    """
+    Returns {rule id: entry point} for the `jupysec.rules` group. Only package metadata is read;
+    no plugin module is imported until its rule is loaded.
+    """
+    global _entry_points
+    if _entry_points is None:
+        if sys.version_info >= (3, 8):
+            from importlib import metadata
+        else:
+            try:
+                import importlib_metadata as metadata
+            except ImportError:
+                _entry_points = dict()
+                return _entry_points
+        eps = metadata.entry_points()
+        if hasattr(eps, "select"):
+            eps = eps.select(group=ENTRY_POINT_GROUP)
+        else:
+            eps = eps.get(ENTRY_POINT_GROUP, list())
+        _entry_points = {ep.name: ep for ep in eps}
+    return _entry_points
+
+
+def plugin_rule_ids():
+    return sorted(entry_points())
+
+
+def load_rules(ids=None):
+    """
+    Imports the plugins for `ids`, or for every installed plugin, and returns {id: error} for any that failed.
+    An entry point is named after its rule id and refers to a Rule, a list of Rules, or a callable returning either;
+    rules made with `register_rule` are registered on import.
+    """
+    errors = dict()
+    for name, ep in entry_points().items():
+        if (ids is not None and name not in ids) or name in RULES:
+            continue
+        try:
+            loaded = ep.load()
+            if callable(loaded) and not isinstance(loaded, Rule):
+                loaded = loaded()
+            for rule in [loaded] if isinstance(loaded, Rule) else list(loaded):
+                RULES.setdefault(rule.id, rule)
+        except Exception as e:
+            errors[name] = repr(e)
+    return errors
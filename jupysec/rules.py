@@ -1,31 +1,522 @@
+import ipaddress
 import subprocess
-from pathlib import Path
-import itertools
 import os
 import sqlite3
-from jupysec.finding import Finding
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from jupysec.finding import Finding, RULES, register_rule
+from jupysec import discovery
+from jupysec.servers import as_server, inventory, probe as probe_servers
+from jupysec.sockets import listening_sockets
+from jupysec.walk import FileIndex
+from jupysec.matcher import PrefixMatcher
+from jupysec.cache import ConfigCache, default_cache_path
+from jupysec.config import load_scopes, traits_from_lines
+from jupysec.kernels import audit_kernel_files
+from jupysec.metrics import profile_call
+from jupysec.plugins import load_rules, plugin_rule_ids
+from jupysec.history import HistoryScanner
+from jupysec.history import STATE_NAME as HISTORY_STATE_NAME
+
+
+CODEEXEC_PREFIXES = (
+    "c.InteractiveShellApp.code_to_run",
+    "c.InteractiveShellApp.exec_PYTHONSTARTUP",
+    "c.InteractiveShellApp.exec_files",
+    "c.InteractiveShellApp.exec_lines",
+    "c.InteractiveShellApp.extensions",
+    "c.InteractiveShellApp.extra_extensions",
+    "c.InteractiveShellApp.file_to_run",
+    "c.InteractiveShellApp.ignore_cwd",
+    "c.InteractiveShellApp.module_to_run",
+    "c.BaseIPythonApplication.extra_config_file",
+    "c.BaseIPythonApplication.profile",
+    "c.TerminalIPythonApp.code_to_run",
+    "c.TerminalIPythonApp.exec_PYTHONSTARTUP",
+    "c.TerminalIPythonApp.exec_files",
+    "c.TerminalIPythonApp.exec_lines",
+    "c.TerminalIPythonApp.extensions",
+    "c.TerminalIPythonApp.extra_config_file",
+    "c.TerminalIPythonApp.extra_extensions",
+    "c.TerminalIPythonApp.file_to_run",
+    "c.TerminalIPythonApp.force_interact",
+    "c.TerminalIPythonApp.ignore_cwd",
+    "c.TerminalIPythonApp.ipython_dir",
+    "c.TerminalIPythonApp.module_to_run",
+    "c.TerminalIPythonApp.profile",
+    "c.JupyterApp.config_file",
+    "c.JupyterApp.config_file_name",
+    "c.ServerApp.browser",
+    "c.ServerApp.config_file",
+    "c.ServerApp.config_file_name",
+    "c.ServerApp.jpserver_extensions",
+    "c.Session.packer",
+    "c.ContentsManager.post_save_hook",
+    "c.ContentsManager.pre_save_hook",
+    "c.FileContentsManager.delete_to_trash",
+    "c.FileContentsManager.post_save_hook",
+    "c.FileContentsManager.pre_save_hook",
+)
+
+HISTORYMOD_PREFIXES = (
+    "c.InteractiveShell.history_length",
+    "c.InteractiveShell.history_load_length",
+    "c.TerminalInteractiveShell.history_length",
+    "c.TerminalInteractiveShell.history_load_length",
+    "c.HistoryAccessor.connection_options",
+    "c.HistoryAccessor.enabled",
+    "c.HistoryAccessor.hist_file",
+    "c.HistoryManager.connection_options",
+    "c.HistoryManager.db_cache_size",
+    "c.HistoryManager.db_log_output",
+    "c.HistoryManager.enabled",
+    "c.HistoryManager.hist_file",
+    "c.InteractiveShell.history_load_length",
+)
+
+SECURITY_PREFIXES = (
+    "c.JupyterApp.answer_yes",
+    "c.ServerApp.allow_origin",
+    "c.ServerApp.allow_origin_pat",
+    "c.ServerApp.allow_remote_access",
+    "c.ServerApp.allow_root",
+    "c.ServerApp.answer_yes",
+    "c.ServerApp.authenticate_prometheus",
+    "c.ServerApp.autoreload",
+    "c.ServerApp.cookie_secret",
+    "c.ServerApp.cookie_secret_file",
+    "c.ServerApp.custom_display_url",
+    "c.ServerApp.default_url",
+    "c.ServerApp.disable_check_xsrf",
+    "c.ServerApp.extra_static_paths",
+    "c.ServerApp.extra_template_paths",
+    "c.ServerApp.file_to_run",
+    "c.ServerApp.identity_provider_class",
+    "c.ServerApp.ip",
+    "c.ServerApp.local_hostnames",
+    "c.ServerApp.login_handler_class",
+    "c.ServerApp.max_body_size",
+    "c.ServerApp.max_buffer_size",
+    "c.ServerApp.trust_xheaders",
+    "c.ServerApp.use_redirect_file",
+    "c.KernelManager.connection_file",
+    "c.KernelManager.control_port",
+    "c.KernelManager.hb_port",
+    "c.KernelManager.iopub_port",
+    "c.KernelManager.ip",
+    "c.KernelManager.shell_port",
+    "c.KernelManager.stdin_port",
+    "c.Session.check_pid",
+    "c.GatewayClient.validate_cert",
+)
+
+PYCONFIG_MATCHER = PrefixMatcher(
+    {
+        "codeexec": CODEEXEC_PREFIXES,
+        "historymod": HISTORYMOD_PREFIXES,
+        "securitysettings": SECURITY_PREFIXES,
+    }
+)
+
+
+CONFIG_FILES = (
+    "jupyter_server_config.py",
+    "jupyter_lab_config.py",
+    "jupyter_notebook_config.py",
+    "ipython_config.py",
+    "jupyter_server_config.json",
+    "jupyter_lab_config.json",
+    "jupyter_notebook_config.json",
+    "ipython_config.json",
+)
+
+# values equal to the default, or otherwise known to be safe, are not findings
+SAFE_VALUES = {
+    "c.ServerApp.allow_remote_access": (False,),
+    "c.ServerApp.allow_root": (False,),
+    "c.ServerApp.answer_yes": (False,),
+    "c.ServerApp.authenticate_prometheus": (True,),
+    "c.ServerApp.autoreload": (False,),
+    "c.ServerApp.disable_check_xsrf": (False,),
+    "c.ServerApp.trust_xheaders": (False,),
+    "c.ServerApp.allow_origin": ("",),
+    "c.ServerApp.allow_origin_pat": ("",),
+    "c.ServerApp.ip": ("localhost", "127.0.0.1", "::1"),
+    "c.ServerApp.local_hostnames": (["localhost"],),
+    "c.JupyterApp.answer_yes": (False,),
+    "c.KernelManager.ip": ("", "127.0.0.1", "localhost"),
+    "c.KernelManager.control_port": (0,),
+    "c.KernelManager.hb_port": (0,),
+    "c.KernelManager.iopub_port": (0,),
+    "c.KernelManager.shell_port": (0,),
+    "c.KernelManager.stdin_port": (0,),
+    "c.Session.check_pid": (True,),
+    "c.GatewayClient.validate_cert": (True,),
+    "c.HistoryAccessor.enabled": (True,),
+    "c.HistoryManager.enabled": (True,),
+    "c.HistoryManager.db_log_output": (False,),
+    "c.InteractiveShellApp.exec_PYTHONSTARTUP": (True,),
+    "c.TerminalIPythonApp.exec_PYTHONSTARTUP": (True,),
+    "c.FileContentsManager.delete_to_trash": (True,),
+}
+
+COLLECTORS = ("locations", "paths", "servers", "sockets", "index", "uncommented", "kernels", "history")
+
+# the collectors whose results each collector, or the "probes" pseudo-input, reads
+COLLECTOR_DEPENDENCIES = {
+    "probes": ("servers",),
+    "index": ("locations", "paths"),
+    "uncommented": ("paths", "index"),
+    "kernels": ("paths", "index"),
+    "history": ("locations", "index"),
+}
+
+# the Rules attribute holding each input a rule can declare; "probes" is only collected with `probe`
+INPUTS = {
+    "locations": "locations",
+    "paths": "paths",
+    "servers": "servers",
+    "sockets": "sockets",
+    "index": "index",
+    "uncommented": "config_scopes",
+    "kernels": "kernels",
+    "history": "history",
+    "probes": "probes",
+}
+
+register_rule(
+    "check_ipython_startup",
+    category="Code Execution",
+    details="Files in this startup directory provide code execution when Jupyter is initiated.",
+    remediation="Ensure the contents of these files are not malicious.\
+        https://ipython.org/ipython-doc/1/config/overview.html#startup-files",
+    severity="high",
+    inputs=("locations", "index"),
+)
+register_rule(
+    "check_for_silent_history",
+    category="Malicious Activity",
+    details="Some code may have been executed with `silent=True`, an indicator of malicious activity.",
+    remediation="Treat this as an active security incident until all silently run commands are verified as non-malicious.",
+    severity="critical",
+    inputs=("history",),
+)
+register_rule(
+    "check_for_token",
+    category="Authorization",
+    details="These servers do not require a token and may allow unauthorized access.",
+    remediation="Either enable tokens or ensure you are using password authentication.",
+    severity="medium",
+    inputs=("servers",),
+)
+register_rule(
+    "check_for_https",
+    category="Encryption",
+    details="These servers do not use HTTPS which could lead to MITM vulnerabilities.",
+    remediation="Enable HTTPS: https://jupyterhub.readthedocs.io/en/stable/getting-started/security-basics.html#enabling-ssl-encryption",
+    severity="medium",
+    inputs=("servers",),
+)
+register_rule(
+    "check_for_localhost",
+    category="Access",
+    details="These servers are exposed to a non-localhost domain/ip. They may be accessible to others.",
+    remediation="Test external accessibility and reduce it as much as possible.",
+    severity="medium",
+    inputs=("servers",),
+)
+register_rule(
+    "check_for_exposed_ports",
+    category="Access",
+    details="These Jupyter servers or kernels are listening on a non-loopback address. Kernel ZMQ ports accept code from anyone who can reach them.",
+    remediation="Bind servers and kernels to 127.0.0.1 (c.ServerApp.ip, c.KernelManager.ip) and firewall any port that must stay exposed.",
+    severity="medium",
+    inputs=("sockets",),
+)
+register_rule(
+    "check_kernel_connection_files",
+    category="Authorization",
+    details="These kernel connection files have an empty or weak HMAC key, listen beyond loopback, or are readable by other users.\
+             Anyone who can read the key and reach the ports can run code in the kernel.",
+    remediation="Keep the default random key and ip of 127.0.0.1, and make sure the runtime directory is only readable by its owner.",
+    severity="medium",
+    inputs=("kernels",),
+)
+register_rule(
+    "check_kernelspecs",
+    category="Code Execution",
+    details="These kernelspecs run extra code or load libraries through their argv or env each time the kernel starts.",
+    remediation="Ensure these kernelspec entries are intentional and that kernel.json files are not writable by other users.",
+    severity="high",
+    inputs=("kernels",),
+)
+register_rule(
+    "check_for_open_api",
+    category="Authorization",
+    details="These servers answered an unauthenticated request to their REST API. Anyone who can reach them can run code.",
+    remediation="Enable token or password authentication and restart the server.",
+    severity="high",
+    inputs=("probes",),
+)
+register_rule(
+    "check_pyconfig_historymod",
+    category="Nonstandard Configuration",
+    details="These uncommented fields in configuration files enable modification of history functions.\
+             Threat actors may use these to hide or obfuscate their actions. Unmodified history is an important incident response artifact.",
+    remediation="Ensure these configuration values are intentional. If you don't recognize them, alert your incident response team.",
+    severity="low",
+    inputs=("uncommented",),
+)
+register_rule(
+    "check_pyconfig_codeexec",
+    category="Nonstandard Configuration",
+    details="These uncommented fields in configuration files enable non-obvious code execution.\
+             Threat actors may use them for persistence or to modify your environment without your knowledge.",
+    remediation="Ensure these configuration values are intentional. If you don't recognize them, alert your incident response team.",
+    severity="low",
+    inputs=("uncommented",),
+)
+register_rule(
+    "check_pyconfig_securitysettings",
+    category="Nonstandard Configuration",
+    details="These uncommented fields in configuration files are related to security settings.\
+             Threat actors may use these to circumvent secure defaults.",
+    remediation="Ensure these configuration values are intentional. If you don't recognize them, alert your incident response team.",
+    severity="low",
+    inputs=("uncommented",),
+)
+
+CHECKS = (
+    "check_ipython_startup",
+    "check_for_silent_history",
+    "check_for_token",
+    "check_for_https",
+    "check_for_localhost",
+    "check_for_exposed_ports",
+    "check_for_open_api",
+    "check_kernel_connection_files",
+    "check_kernelspecs",
+    "check_pyconfig_historymod",
+    "check_pyconfig_codeexec",
+    "check_pyconfig_securitysettings",
+)
+
+CHECK_CATEGORIES = {check: RULES[check].category for check in CHECKS}
+
+
+def required_collectors(rules):
+    """Returns the collectors needed to evaluate `rules`, including the collectors those depend on."""
+    needed = set()
+    stack = [i for rule in rules for i in rule.inputs]
+    while stack:
+        name = stack.pop()
+        if name not in needed:
+            needed.add(name)
+            stack += COLLECTOR_DEPENDENCIES.get(name, ())
+    return needed & set(COLLECTORS)
+
+
+def classify_traits(traits, matcher=PYCONFIG_MATCHER):
+    """
+    Matches resolved config traits against the families of `matcher`, the pyconfig rule families by default,
+    dropping literal values listed in SAFE_VALUES. Returns a dict of family to the matching ConfigValues.
+    """
+    classified = matcher.classify(traits)
+    return {
+        family: [
+            traits[trait] for trait in matched
+            if not (traits[trait].literal and traits[trait].value in SAFE_VALUES.get(trait, ()))
+        ]
+        for family, matched in classified.items()
+    }
+
+
+def classify_scopes(scopes, matcher=PYCONFIG_MATCHER):
+    """
+    Classifies each config scope from `load_scopes` on its own and combines the matches,
+    so a trait set in two profiles is a finding in both. A statement in a file included by
+    several scopes is only reported once.
+    """
+    combined = {family: dict() for family in matcher.families}
+    for traits in scopes.values():
+        for family, matched in classify_traits(traits, matcher).items():
+            for value in matched:
+                combined[family].setdefault((value.trait, str(value.path), value.text), value)
+    return {family: list(matched.values()) for family, matched in combined.items()}
+
+
+def _same_address(value, address):
+    """Whether a configured ip value, e.g. "0.0.0.0" or "*", is the listening `address`."""
+    if not isinstance(value, str):
+        return False
+    if value == "*":
+        return address.is_unspecified
+    try:
+        configured = ipaddress.ip_address(value)
+    except ValueError:
+        return False
+    return configured == address or (address.version == 6 and address.ipv4_mapped == configured)
 
 
 class Rules:
-    def __init__(self, locations = list(), uncommented = dict(), servers = list(), config = dict()):
-        """Makes subprocess calls to Jupyter CLI functions to collect data on paths and file contents"""
-        if not locations:
-            self.locations = self._get_locations()
-        else:
-            self.locations = locations
-        if not uncommented:
-            self.uncommented = self._get_uncommented()
-        else:
-            self.uncommented = uncommented
-        if not servers:
-            self.servers = self._get_servers()
+    def __init__(self, locations = list(), uncommented = dict(), servers = list(), config = dict(),
+                 history = list(), max_workers = 4, timeout = 30, max_depth = 8, cache = None,
+                 history_roots = list(), collectors = None, probe = False, profile = False, checks = None,
+                 history_memory_limit = None, categories = None):
+        """
+        Collects data on paths, config traits, running servers and history databases.
+        Discovery happens in-process; the Jupyter CLI is only called when that isn't possible.
+        Independent collectors run concurrently on a pool of `max_workers` threads and any
+        collector that takes longer than `timeout` seconds is abandoned and treated as empty.
+        All path-based collectors and checks share one filesystem walk, limited to `max_depth`.
+        Set `cache` to a file path, or True for the Jupyter runtime directory, to only reparse
+        configuration files that changed since the last scan.
+        `history_roots` adds directories, such as every user's IPython dir on a shared host, whose
+        history databases are swept on a process pool alongside the local one. With `history_memory_limit`
+        bytes, the local databases are swept the same way and each worker's address space is capped.
+        `collectors` limits collection to the named subset of COLLECTORS.
+        `checks` limits the scan to the named built-in and plugin rules, and collection to the inputs they
+        declare; plugins for other rules are never imported. `categories` further limits the checks to rules
+        in those categories, once the plugins that may be in them are loaded.
+        `uncommented` may be given as a {config statement: path} dict instead of reading config files.
+        With `probe`, every running server is sent an unauthenticated request to check whether its API is open.
+        Timings and counters for every collector and check are kept in `metrics`; with `profile`, each
+        check also runs under cProfile and its top functions are kept in `profiles`.
+        """
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+        self.cache = default_cache_path() if cache is True else cache
+        self.history_roots = list(history_roots)
+        self.history_memory_limit = history_memory_limit
+        self.timeout = timeout
+        self.collector_errors = dict()
+        plugins = [p for p in plugin_rule_ids() if checks is None or p in checks]
+        for plugin, error in load_rules(plugins).items():
+            self.collector_errors[f"plugin:{plugin}"] = error
+        self.checks = [
+            c for c in CHECKS + tuple(p for p in plugins if p in RULES)
+            if (checks is None or c in checks) and (categories is None or RULES[c].category in categories)
+        ]
+        self.collectors = set(COLLECTORS if collectors is None else collectors)
+        if checks is not None or categories is not None:
+            self.collectors &= required_collectors(RULES[c] for c in self.checks)
+        self.probe = probe
+        self.profile = profile
+        self.profiles = dict()
+        self.metrics = {"collectors": dict(), "checks": dict(), "subprocess": {"calls": 0, "seconds": 0.0}}
+        self._metrics_lock = threading.Lock()
+        started = time.perf_counter()
+
+        stage = dict()
+        if not locations and self._enabled("locations"):
+            stage["locations"] = self._get_locations
+        if not uncommented and self._enabled("paths"):
+            stage["paths"] = self._get_paths
+        if not servers and self._enabled("servers"):
+            stage["servers"] = self._get_servers
+        if self._enabled("sockets"):
+            stage["sockets"] = self._get_sockets
+        collected = self._collect(stage)
+        self.locations = collected.get("locations", locations)
+        self.paths = collected.get("paths", list())
+        self.servers = collected.get("servers", servers)
+        self.sockets = collected.get("sockets", list())
+        if self.servers:
+            self.servers = [as_server(s) for s in self.servers]
+        stage = {"index": self._get_index} if self._enabled("index") else dict()
+        if probe and self.servers:
+            stage["probes"] = self._get_probes
+        collected = self._collect(stage)
+        self.index = collected.get("index", False)
+        self.probes = collected.get("probes", list())
+
+        # these collectors need the ipython directory, jupyter paths and file index from the earlier stages
+        stage = dict()
+        self._config_cache = ConfigCache(self.cache) if self.cache else None
+        if not uncommented and self._enabled("uncommented"):
+            stage["uncommented"] = self._get_traits
+        if self._enabled("kernels"):
+            stage["kernels"] = self._get_kernels
+        if not history and (self.locations or self.history_roots) and self._enabled("history"):
+            stage["history"] = self._get_history
+        collected = self._collect(stage)
+        if self._config_cache:
+            self._config_cache.save()
+        self.kernels = collected.get("kernels", list())
+        if uncommented:
+            self.config_scopes = traits_from_lines(uncommented)
         else:
-            self.servers = servers
+            self.config_scopes = collected.get("uncommented", uncommented)
+        # statement -> path, as the line-based parser used to report
+        self.uncommented = {
+            v.text: v.path for traits in self.config_scopes.values() for v in traits.values()
+        } if self.config_scopes else self.config_scopes
+        self.history = collected.get("history", history)
+        self._pyconfig_matches = None
+
+        self.metrics["collect_seconds"] = time.perf_counter() - started
+
         if config:
             self.running_config = self._parse_config(config)
         else:
             self.running_config = dict()
 
+    def _enabled(self, collector):
+        return collector in self.collectors
+
+    def _collect(self, collectors):
+        """
+        Runs a dict of independent collectors concurrently and returns their results by name.
+        A collector that raises or misses the timeout returns False and is noted in `collector_errors`.
+        """
+        results = dict()
+        if not collectors:
+            return results
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        started = time.monotonic()
+        futures = {name: pool.submit(self._timed, name, collector) for name, collector in collectors.items()}
+        for name, future in futures.items():
+            remaining = None
+            if self.timeout is not None:
+                remaining = max(0, started + self.timeout - time.monotonic())
+            try:
+                results[name] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                self.collector_errors[name] = f"timed out after {self.timeout}s"
+                results[name] = False
+            except Exception as e:
+                self.collector_errors[name] = repr(e)
+                results[name] = False
+            self._count(name, error=self.collector_errors.get(name), **self._counters(name, results[name]))
+        pool.shutdown(wait=False)
+        return results
+
+    def _timed(self, name, collector):
+        start = time.perf_counter()
+        try:
+            return collector()
+        finally:
+            self._count(name, seconds=time.perf_counter() - start)
+
+    def _count(self, collector, **counters):
+        """Merges counters into the metrics of `collector`; safe to call from collector threads."""
+        with self._metrics_lock:
+            self.metrics["collectors"].setdefault(collector, dict()).update(counters)
+
+    def _counters(self, name, value):
+        """Derives the counters reported for a collector from what it returned."""
+        if not value:
+            return {"items": 0}
+        if name == "index":
+            return {"files": sum(len(files) for files in value.files.values()), "dirs": len(value.dirs)}
+        if name == "history":
+            return {"databases": len(value), "rows_matched": sum(len(rows) for rows, db in value)}
+        if isinstance(value, (list, dict, tuple)):
+            return {"items": len(value)}
+        return {"items": 1}
+
     def _parse_config(self, config):
         running_config = dict()
         running_config['authorizer'] = config['authorizer'].__class__.__name__
@@ -51,6 +542,9 @@ class Rules:
 
     def _get_locations(self):
         """Gets the path to the ipython directory"""
+        locations = discovery.get_ipython_dir()
+        if locations:
+            return locations
         locations = self._run_command(["ipython", "locate"])
         if locations.returncode == 0:
             locations = locations.stdout.decode().rstrip()
@@ -58,49 +552,53 @@ class Rules:
             locations = False
         return locations
 
-    def _get_uncommented(self):
+    def _get_traits(self):
         """
-        Finds uncommented lines of code in python configuration files.
-        Returns a dict with the key is the uncommented line of code and the value is the file path.
+        Parses the Python and JSON config files, following `load_subconfig` includes.
+        Returns {scope: {trait: ConfigValue}} with the last value set for each trait in each scope.
         """
+        # the index also walks the ipython directory, so profiles are parsed even without Jupyter paths
+        if not self.index:
+            return False
+        files = [f for f in self.index.iter_files() if f.name.endswith(CONFIG_FILES)]
+        self._count("uncommented", files=len(files))
+        return load_scopes(files, self._config_cache)
+
+    def _get_kernels(self):
+        """Audits the kernel connection files in the runtime directory and the kernelspecs in the data paths."""
+        if not self.index:
+            return False
+        return audit_kernel_files(self.index.iter_files(), self._config_cache, self.max_workers)
+
+    def _get_index(self):
+        """Walks the ipython directory and jupyter paths once, returning a FileIndex shared by the checks"""
+        roots = list(self.paths or list())
+        if self.locations:
+            roots.append(self.locations)
+        return FileIndex(roots, max_depth=self.max_depth)
+
+    def _get_paths(self):
+        """Gets the Jupyter config, data and runtime paths"""
+        paths = discovery.get_jupyter_paths()
+        if paths is not None:
+            return paths
         paths = self._run_command(["jupyter", "--paths"])
         if paths.returncode == 0:
             paths = paths.stdout.decode().splitlines()
             paths = [x.lstrip() for x in paths]
-            paths.append(self.locations)
-            paths = set(
+            paths = list(
                 filter(lambda x: x not in ["config:", "data:", "runtime:"], paths)
             )
-            files = [list(Path(p).rglob("*")) for p in paths]
-            files = list(itertools.chain(*files))
-            target_py_files = (
-                "jupyter_server_config.py",
-                "jupyter_lab_config.py",
-                "jupyter_notebook_config.py",
-                "ipython_config.py",
-            )
-            py_files = list(filter(lambda x: x.name.endswith(target_py_files), files))
-            py_uncommented = list()
-            for file in py_files:
-                with open(file, "r") as f:
-                    lines = f.read().splitlines()
-                lines = filter(lambda x: len(x) > 0, lines)
-                py_uncommented.append(
-                    (
-                        (list(filter(lambda x: x.lstrip()[0] not in ["#"], lines))),
-                        file,
-                    )
-                )
-            uncommented = dict()
-            for lines, file in py_uncommented:
-                for l in lines:
-                    uncommented[l] = file
         else:
-            uncommented = False
-        return uncommented
+            paths = False
+        return paths
 
     def _get_servers(self):
-        """Returns a list of running server descriptors."""
+        """Returns a list of running servers, from the runtime directory or else the Jupyter CLI."""
+        servers = inventory()
+        if servers is not None:
+            return servers if len(servers) > 0 else False
+
         servers = self._run_command(["jupyter", "server", "list"])
         if servers.returncode == 0:
             servers = servers.stderr.decode().splitlines()[1:]
@@ -117,286 +615,285 @@ class Rules:
         else:
             return servers
 
+    def _get_sockets(self):
+        """Returns the listening sockets of Jupyter servers and kernels, or False where /proc/net is unavailable."""
+        sockets = listening_sockets()
+        return sockets if sockets is not None else False
+
+    def _get_probes(self):
+        """Probes every running server concurrently, bounded by a fraction of the collector timeout."""
+        return probe_servers(self.servers, timeout=1.0 if self.timeout is None else min(1.0, self.timeout))
+
+    def _get_history(self):
+        """
+        Returns a list of (silently executed rows, path) for every history database in the ipython directory.
+        A database that can't be read is skipped and noted in `collector_errors` as "history:<path>".
+        """
+        state = os.path.join(os.path.dirname(self.cache), HISTORY_STATE_NAME) if self.cache else None
+        scanner = HistoryScanner(state)
+        if self.history_roots or self.history_memory_limit:
+            roots = self.history_roots + ([self.locations] if self.locations else list())
+            history = list(scanner.sweep(
+                roots, max_workers=self.max_workers, memory_limit=self.history_memory_limit, max_depth=self.max_depth
+            ))
+            for db, error in scanner.errors.items():
+                self.collector_errors[f"history:{db}"] = error
+        elif self.index:
+            history = list()
+            for f in self.index.iter_files([self.locations]):
+                if f.name != "history.sqlite":
+                    continue
+                try:
+                    history.append((scanner.scan(f), f))
+                except (sqlite3.Error, MemoryError) as e:
+                    self.collector_errors[f"history:{f}"] = repr(e)
+        else:
+            history = list()
+        scanner.save()
+        return history
+
+    def _classify_pyconfig(self):
+        """Matches every resolved trait against all pyconfig rule families in a single pass"""
+        if self._pyconfig_matches is None:
+            self._pyconfig_matches = classify_scopes(self.config_scopes or dict())
+        return self._pyconfig_matches
+
     def _run_command(self, command):
+        start = time.perf_counter()
         try:
-            val = subprocess.run(command, capture_output=True)
-        except FileNotFoundError:
+            val = subprocess.run(command, capture_output=True, timeout=self.timeout)
+        except (FileNotFoundError, subprocess.TimeoutExpired):
             val = subprocess.CompletedProcess(args=command, returncode=1)
+        with self._metrics_lock:
+            self.metrics["subprocess"]["calls"] += 1
+            self.metrics["subprocess"]["seconds"] += time.perf_counter() - start
         return val
 
+    def enabled_checks(self):
+        """Returns the names of the checks whose declared inputs were all collected, in the order they run."""
+        return [
+            check for check in self.checks
+            if all(getattr(self, INPUTS.get(i, i), None) for i in RULES[check].inputs)
+        ]
+
+    def evaluated_rules(self, checks=None, categories=None):
+        """
+        Returns the ids of the rules that `run_checks(checks, categories)` evaluates completely: every
+        collector they need was enabled and neither failed nor timed out. A finding of any other rule
+        that isn't reported may still be there, e.g. in a baseline.
+        """
+        failed = {name.split(":")[0] for name in self.collector_errors}
+        usable = (self.collectors | ({"probes"} if self.probe else set())) - failed
+        return {
+            check for check in self.checks
+            if (checks is None or check in checks)
+            and (categories is None or RULES[check].category in categories)
+            and required_collectors([RULES[check]]) | (set(RULES[check].inputs) & {"probes"}) <= usable
+        }
+
+    def run_check(self, check):
+        """
+        Runs one check and returns its findings. Rules from plugins run their own `check`, and rules
+        that only declare config trait prefixes are matched against the resolved traits.
+        """
+        rule = RULES[check]
+        if rule.check is not None:
+            return list(rule.check(self))
+        if rule.matcher is not None:
+            matched = classify_scopes(self.config_scopes or dict(), rule.matcher)[rule.id]
+            return [Finding(rule=rule, source_text=v.text, source_doc=v.path) for v in matched]
+        return getattr(self, check)()
+
+    def run_checks(self, checks=None, categories=None):
+        """
+        Runs the enabled checks, yielding (check name, finding) as each one finishes.
+        Checks not in `checks`, or whose category is not in `categories`, are skipped without being run.
+        """
+        for check in self.enabled_checks():
+            if checks is not None and check not in checks:
+                continue
+            if categories is not None and RULES[check].category not in categories:
+                continue
+            start = time.perf_counter()
+            if self.profile:
+                findings, self.profiles[check] = profile_call(lambda: self.run_check(check))
+            else:
+                findings = self.run_check(check)
+            self.metrics["checks"][check] = {"seconds": time.perf_counter() - start, "findings": len(findings)}
+            for finding in findings:
+                yield check, finding
+
+    def iter_findings(self, checks=None, categories=None):
+        """
+        Lazily yields findings as the checks produce them. Remaining checks never run if the
+        caller stops early, e.g. `next(Rules().iter_findings(categories={"Malicious Activity"}), None)`.
+        """
+        for check, finding in self.run_checks(checks, categories):
+            yield finding
+
     def get_findings(self):
-        findings = list()
-        if self.locations:
-            findings.append(self.check_ipython_startup())
-            findings.append(self.check_for_silent_history())
-        if self.servers:
-            findings.append(self.check_for_token())
-            findings.append(self.check_for_https())
-            findings.append(self.check_for_localhost())
-        if self.uncommented:
-            findings.append(self.check_pyconfig_historymod())
-            findings.append(self.check_pyconfig_codeexec())
-            findings.append(self.check_pyconfig_securitysettings())
-        findings = list(itertools.chain(*findings))
-        return findings
+        return list(self.iter_findings())
 
     def check_ipython_startup(self):
-        category = "Code Execution"
-        details = "Files in this startup directory provide code execution when Jupyter is initiated."
-        remediation = "Ensure the contents of these files are not malicious.\
-        https://ipython.org/ipython-doc/1/config/overview.html#startup-files"
-        files = list(Path(self.locations).rglob("*"))
-        startup_files = [
-            (os.listdir(f), f) for f in files if "startup" in f.name and f.is_dir()
-        ]
-        res = dict()
-        for py_files, dir in startup_files:
-            py_files = list(filter(lambda x: x != "README", py_files))
-            for pf in py_files:
-                res[pf] = dir
-
+        rule = RULES["check_ipython_startup"]
+        dirs = self.index.iter_dirs([self.locations]) if self.index else list()
+        # one finding per file in each startup directory, so 00.py in two profiles is two findings
         return [
             Finding(
-                category=category,
-                source_text=file,
-                source_doc=path,
-                source_details=details,
-                remediation=remediation,
+                rule=rule,
+                source_text=name,
+                source_doc=d,
             )
-            for file, path in res.items()
+            for d, names in dirs if "startup" in d.name
+            for name in names if name != "README"
         ]
 
     def check_for_token(self):
-        category = "Authorization"
-        details = (
-            "These servers do not require a token and may allow unauthorized access."
-        )
-        remediation = (
-            "Either enable tokens or ensure you are using password authentication."
-        )
-        servers = list(filter(lambda x: "token" not in x, self.servers))
+        rule = RULES["check_for_token"]
+        servers = list(filter(lambda x: not x.token and not x.password, self.servers))
         return [
             Finding(
-                category=category,
-                source_text=f,
+                rule=rule,
+                source_text=str(f),
                 source_doc="jupyter server list",
-                source_details=details,
-                remediation=remediation,
             )
             for f in servers
         ]
 
     def check_for_https(self):
-        category = "Encryption"
-        details = (
-            "These servers do not use HTTPS which could lead to MITM vulnerabilities."
-        )
-        remediation = "Enable HTTPS: https://jupyterhub.readthedocs.io/en/stable/getting-started/security-basics.html#enabling-ssl-encryption"
-        servers = list(filter(lambda x: "https" not in x, self.servers))
+        rule = RULES["check_for_https"]
+        servers = list(filter(lambda x: not x.secure, self.servers))
         return [
             Finding(
-                category=category,
-                source_text=f,
+                rule=rule,
+                source_text=str(f),
                 source_doc="jupyter server list",
-                source_details=details,
-                remediation=remediation,
             )
             for f in servers
         ]
 
     def check_for_localhost(self):
-        category = "Access"
-        details = "These servers are exposed to a non-localhost domain/ip. They may be accessible to others."
-        remediation = "Test external accessibility and reduce it as much as possible."
-        servers = list(filter(lambda x: "localhost" not in x, self.servers))
+        rule = RULES["check_for_localhost"]
+        servers = list(filter(lambda x: not x.loopback, self.servers))
         return [
             Finding(
-                category=category,
-                source_text=f,
+                rule=rule,
+                source_text=str(f),
                 source_doc="jupyter server list",
-                source_details=details,
-                remediation=remediation,
             )
             for f in servers
         ]
 
-    def check_for_silent_history(self):
-        category = "Malicious Activity"
-        details = "Some code may have been executed with `silent=True`, an indicator of malicious activity."
-        remediation = "Treat this as an active security incident until all silently run commands are verified as non-malicious."
-
-        def _db_contains_silent(db):
-            con = sqlite3.connect(db)
-            cur = con.cursor()
-            res = cur.execute(
-                "SELECT * FROM history WHERE source LIKE '%execute_interactive%code%silent%=%True%'"
+    def _kernel_trait(self, listener):
+        """
+        Returns the c.KernelManager ip or port ConfigValue that explains an exposed kernel socket, or None.
+        The ip trait only explains it when it is set to the address the kernel listens on.
+        """
+        for traits in (self.config_scopes or dict()).values():
+            ip = traits.get("c.KernelManager.ip")
+            if ip is not None and _same_address(ip.value, listener.address):
+                return ip
+            for trait, value in traits.items():
+                if trait.startswith("c.KernelManager.") and trait.endswith("_port") and str(value.value) == str(listener.port):
+                    return value
+        return None
+
+    def check_for_exposed_ports(self):
+        rule = RULES["check_for_exposed_ports"]
+        findings = list()
+        for listener in self.sockets:
+            if listener.loopback:
+                continue
+            trait = self._kernel_trait(listener) if listener.role == "kernel" else None
+            findings.append(
+                Finding(
+                    rule=rule,
+                    source_text=f"{listener} (set by {trait.text})" if trait else str(listener),
+                    source_doc=trait.path if trait else "/proc/net/tcp",
+                )
             )
-            return res.fetchall()
+        return findings
 
-        files = list(Path(self.locations).rglob("*"))
-        dbs = [(_db_contains_silent(f), f) for f in files if f.name == "history.sqlite"]
-        dbs = list(filter(lambda x: len(x[0]) > 0, dbs))
+    def check_for_open_api(self):
+        rule = RULES["check_for_open_api"]
         return [
             Finding(
-                category=category,
-                source_text=f[0][0][2], #indexing into the db fields to extract the command text
-                source_doc=f[1],
-                source_details=details,
-                remediation=remediation,
+                rule=rule,
+                source_text=str(p["server"]),
+                source_doc=f"GET /api/status -> {p['status']}",
             )
-            for f in dbs
+            for p in self.probes
+            if p["open"]
         ]
 
-    def check_pyconfig_codeexec(self):
-        category = "Nonstandard Configuration"
-        details = "These uncommented fields in configuration files enable non-obvious code execution.\
-             Threat actors may use them for persistence or to modify your environment without your knowledge."
-        remediation = "Ensure these configuration values are intentional. If you don't recognize them, alert your incident response team."
-        findings = [
-            (line, path)
-            for line, path in self.uncommented.items()
-            if line.startswith(
-                (
-                    "c.InteractiveShellApp.code_to_run",
-                    "c.InteractiveShellApp.exec_PYTHONSTARTUP",
-                    "c.InteractiveShellApp.exec_files",
-                    "c.InteractiveShellApp.exec_lines",
-                    "c.InteractiveShellApp.extensions",
-                    "c.InteractiveShellApp.extra_extensions",
-                    "c.InteractiveShellApp.file_to_run",
-                    "c.InteractiveShellApp.ignore_cwd",
-                    "c.InteractiveShellApp.module_to_run",
-                    "c.BaseIPythonApplication.extra_config_file",
-                    "c.BaseIPythonApplication.profile",
-                    "c.TerminalIPythonApp.code_to_run",
-                    "c.TerminalIPythonApp.exec_PYTHONSTARTUP",
-                    "c.TerminalIPythonApp.exec_files",
-                    "c.TerminalIPythonApp.exec_lines",
-                    "c.TerminalIPythonApp.extensions",
-                    "c.TerminalIPythonApp.extra_config_file",
-                    "c.TerminalIPythonApp.extra_extensions",
-                    "c.TerminalIPythonApp.file_to_run",
-                    "c.TerminalIPythonApp.force_interact",
-                    "c.TerminalIPythonApp.ignore_cwd",
-                    "c.TerminalIPythonApp.ipython_dir",
-                    "c.TerminalIPythonApp.module_to_run",
-                    "c.TerminalIPythonApp.profile",
-                    "c.JupyterApp.config_file",
-                    "c.JupyterApp.config_file_name",
-                    "c.ServerApp.browser",
-                    "c.ServerApp.config_file",
-                    "c.ServerApp.config_file_name",
-                    "c.ServerApp.jpserver_extensions",
-                    "c.Session.packer",
-                    "c.ContentsManager.post_save_hook",
-                    "c.ContentsManager.pre_save_hook",
-                    "c.FileContentsManager.delete_to_trash",
-                    "c.FileContentsManager.post_save_hook",
-                    "c.FileContentsManager.pre_save_hook",
-                )
+    def check_kernel_connection_files(self):
+        rule = RULES["check_kernel_connection_files"]
+        return [
+            Finding(
+                rule=rule,
+                source_text=problem,
+                source_doc=path,
             )
+            for kind, problem, path in self.kernels
+            if kind == "connection"
         ]
+
+    def check_kernelspecs(self):
+        rule = RULES["check_kernelspecs"]
         return [
             Finding(
-                category=category,
-                source_text=line,
+                rule=rule,
+                source_text=problem,
                 source_doc=path,
-                source_details=details,
-                remediation=remediation,
             )
-            for line, path in findings
+            for kind, problem, path in self.kernels
+            if kind == "kernelspec"
         ]
 
-    def check_pyconfig_historymod(self):
-        category = "Nonstandard Configuration"
-        details = "These uncommented fields in configuration files enable modification of history functions.\
-             Threat actors may use these to hide or obfuscate their actions. Unmodified history is an important incident response artifact."
-        remediation = "Ensure these configuration values are intentional. If you don't recognize them, alert your incident response team."
-        findings = [
-            (line, path)
-            for line, path in self.uncommented.items()
-            if line.startswith(
-                (
-                    "c.InteractiveShell.history_length",
-                    "c.InteractiveShell.history_load_length",
-                    "c.TerminalInteractiveShell.history_length",
-                    "c.TerminalInteractiveShell.history_load_length",
-                    "c.HistoryAccessor.connection_options",
-                    "c.HistoryAccessor.enabled",
-                    "c.HistoryAccessor.hist_file",
-                    "c.HistoryManager.connection_options",
-                    "c.HistoryManager.db_cache_size",
-                    "c.HistoryManager.db_log_output",
-                    "c.HistoryManager.enabled",
-                    "c.HistoryManager.hist_file",
-                    "c.InteractiveShell.history_load_length",
-                )
+    def check_for_silent_history(self):
+        rule = RULES["check_for_silent_history"]
+        return [
+            Finding(
+                rule=rule,
+                source_text=row[2], #indexing into the db fields to extract the command text
+                source_doc=db,
             )
+            for rows, db in self.history or list()
+            for row in rows
         ]
+
+    def check_pyconfig_codeexec(self):
+        rule = RULES["check_pyconfig_codeexec"]
+        findings = [(v.text, v.path) for v in self._classify_pyconfig()["codeexec"]]
         return [
             Finding(
-                category=category,
+                rule=rule,
                 source_text=line,
                 source_doc=path,
-                source_details=details,
-                remediation=remediation,
             )
             for line, path in findings
         ]
 
-    def check_pyconfig_securitysettings(self):
-        category = "Nonstandard Configuration"
-        details = "These uncommented fields in configuration files are related to security settings.\
-             Threat actors may use these to circumvent secure defaults."
-        remediation = "Ensure these configuration values are intentional. If you don't recognize them, alert your incident response team."
-        findings = [
-            (line, path)
-            for line, path in self.uncommented.items()
-            if line.startswith(
-                (
-                    "c.JupyterApp.answer_yes",
-                    "c.ServerApp.allow_origin",
-                    "c.ServerApp.allow_origin_pat",
-                    "c.ServerApp.allow_remote_access",
-                    "c.ServerApp.allow_root",
-                    "c.ServerApp.answer_yes",
-                    "c.ServerApp.authenticate_prometheus",
-                    "c.ServerApp.autoreload",
-                    "c.ServerApp.cookie_secret",
-                    "c.ServerApp.cookie_secret_file",
-                    "c.ServerApp.custom_display_url",
-                    "c.ServerApp.default_url",
-                    "c.ServerApp.disable_check_xsrf",
-                    "c.ServerApp.extra_static_paths",
-                    "c.ServerApp.extra_template_paths",
-                    "c.ServerApp.file_to_run",
-                    "c.ServerApp.identity_provider_class",
-                    "c.ServerApp.ip",
-                    "c.ServerApp.local_hostnames",
-                    "c.ServerApp.login_handler_class",
-                    "c.ServerApp.max_body_size",
-                    "c.ServerApp.max_buffer_size",
-                    "c.ServerApp.trust_xheaders",
-                    "c.ServerApp.use_redirect_file",
-                    "c.KernelManager.connection_file",
-                    "c.KernelManager.control_port",
-                    "c.KernelManager.hb_port",
-                    "c.KernelManager.iopub_port",
-                    "c.KernelManager.ip",
-                    "c.KernelManager.shell_port",
-                    "c.KernelManager.stdin_port",
-                    "c.Session.check_pid",
-                    "c.GatewayClient.validate_cert",
-                )
+    def check_pyconfig_historymod(self):
+        rule = RULES["check_pyconfig_historymod"]
+        findings = [(v.text, v.path) for v in self._classify_pyconfig()["historymod"]]
+        return [
+            Finding(
+                rule=rule,
+                source_text=line,
+                source_doc=path,
             )
+            for line, path in findings
         ]
+
+    def check_pyconfig_securitysettings(self):
+        rule = RULES["check_pyconfig_securitysettings"]
+        findings = [(v.text, v.path) for v in self._classify_pyconfig()["securitysettings"]]
         return [
             Finding(
-                category=category,
+                rule=rule,
                 source_text=line,
                 source_doc=path,
-                source_details=details,
-                remediation=remediation,
             )
             for line, path in findings
         ]
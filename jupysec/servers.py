@@ -0,0 +1,131 @@
+import asyncio
+import ssl
+from urllib.parse import parse_qs, urlparse
+
+from jupysec import discovery
+
+LOOPBACK_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+
+class Server:
+    __slots__ = ("url", "hostname", "port", "secure", "token", "password", "base_url", "root_dir", "pid")
+
+    def __init__(self, url, token=False, password=False, root_dir="", pid=None):
+        """A running Jupyter server, from its runtime file or a `jupyter server list` line."""
+        parsed = urlparse(url)
+        self.url = url
+        self.hostname = parsed.hostname or ""
+        self.secure = parsed.scheme == "https"
+        self.port = parsed.port or (443 if self.secure else 80)
+        self.base_url = parsed.path or "/"
+        self.token = bool(token)
+        self.password = bool(password)
+        self.root_dir = root_dir
+        self.pid = pid
+
+    @classmethod
+    def from_info(cls, info):
+        """Builds a server from the contents of a `jpserver-*.json` or `nbserver-*.json` runtime file."""
+        return cls(
+            info["url"],
+            token=info.get("token"),
+            password=info.get("password"),
+            root_dir=info.get("root_dir", info.get("notebook_dir", "")),
+            pid=info.get("pid"),
+        )
+
+    @classmethod
+    def parse(cls, line):
+        """Builds a server from a line of `jupyter server list` output."""
+        line = line.strip()
+        if line.startswith("["):
+            line = line.split("] ", 1)[-1]
+        url, _, root_dir = line.partition(" :: ")
+        url = url.strip()
+        token = parse_qs(urlparse(url).query).get("token", [""])[0]
+        return cls(url.split("?", 1)[0], token=token, root_dir=root_dir.strip())
+
+    @property
+    def loopback(self):
+        return self.hostname in LOOPBACK_HOSTS
+
+    def as_dict(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    def __str__(self):
+        token = "?token=..." if self.token else ""
+        return f"{self.url}{token} :: {self.root_dir}"
+
+    def __repr__(self):
+        return f"Server({self.url!r})"
+
+
+def as_server(server):
+    """Accepts a Server or a `jupyter server list` line."""
+    return server if isinstance(server, Server) else Server.parse(server)
+
+
+def inventory(runtime_dir=None, check_pid=True):
+    """
+    Lists running servers from the runtime directory without starting the Jupyter CLI.
+    Returns None when the runtime directory cannot be resolved.
+    """
+    if runtime_dir is None:
+        runtime_dir = discovery.get_runtime_dir()
+    if runtime_dir is None:
+        return None
+    return [Server.from_info(info) for info in discovery.read_server_files(runtime_dir, check_pid)]
+
+
+async def _probe_one(server, timeout, semaphore):
+    result = {"server": server, "reachable": False, "open": False, "auth_required": None, "status": None, "error": None}
+    host = server.hostname
+    if host in ("", "0.0.0.0"):
+        host = "127.0.0.1"
+    elif host == "::":
+        host = "::1"
+    context = None
+    if server.secure:
+        # we want to know whether the port answers, not whether its certificate is trusted
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    path = server.base_url.rstrip("/") + "/api/status"
+    async with semaphore:
+        writer = None
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, server.port, ssl=context), timeout
+            )
+            result["reachable"] = True
+            request = f"GET {path} HTTP/1.0\r\nHost: {server.hostname}:{server.port}\r\n\r\n"
+            writer.write(request.encode())
+            await asyncio.wait_for(writer.drain(), timeout)
+            status_line = await asyncio.wait_for(reader.readline(), timeout)
+            status = int(status_line.split()[1])
+            result["status"] = status
+            result["auth_required"] = status in (401, 403)
+            # a redirect to the login page, a 404 or a server error doesn't expose the API
+            result["open"] = 200 <= status < 300
+        except (OSError, asyncio.TimeoutError, ValueError, IndexError) as e:
+            result["error"] = repr(e)
+        finally:
+            if writer is not None:
+                writer.close()
+    return result
+
+
+async def probe_async(servers, timeout=1.0, concurrency=256):
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(*(_probe_one(s, timeout, semaphore) for s in servers))
+
+
+def probe(servers, timeout=1.0, concurrency=256):
+    """
+    Connects to every server concurrently, each bounded by `timeout` seconds, and requests
+    `/api/status` without credentials. Returns one dict per server with `reachable`, `open` (True only
+    for a 2xx response), `auth_required` (True for a 401/403 response) and the HTTP `status`.
+    """
+    if not servers:
+        return list()
+    return asyncio.run(probe_async([as_server(s) for s in servers], timeout, concurrency))
@@ -0,0 +1,160 @@
+import ipaddress
+import os
+import re
+
+PROC = "/proc"
+TCP_LISTEN = "0A"
+SERVER_COMMANDS = ("jupyter-lab", "jupyter-notebook", "jupyter-server", "jupyterhub-singleuser")
+SERVER_SUBCOMMANDS = ("lab", "notebook", "server")
+SERVER_MODULES = ("jupyterlab", "notebook", "nbclassic", "jupyter_server", "jupyterhub.singleuser")
+KERNEL_MODULES = ("ipykernel_launcher", "ipykernel")
+PYTHON = re.compile(r"^(python|pypy)[0-9.]*w?(\.exe)?$")
+# interpreter options that take the next argument as their value
+PYTHON_OPTIONS_WITH_VALUE = ("-W", "-X", "-Q")
+
+
+class Listener:
+    __slots__ = ("pid", "role", "address", "port", "inode")
+
+    def __init__(self, pid, role, address, port, inode):
+        """A listening TCP socket held open by a Jupyter server or kernel process."""
+        self.pid = pid
+        self.role = role
+        self.address = address
+        self.port = port
+        self.inode = inode
+
+    @property
+    def loopback(self):
+        address = self.address
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        return address.is_loopback
+
+    def __str__(self):
+        host = f"[{self.address}]" if self.address.version == 6 else str(self.address)
+        return f"{self.role} pid {self.pid} listening on {host}:{self.port}"
+
+    def __repr__(self):
+        return f"Listener({self.pid}, {self.role!r}, {str(self.address)!r}, {self.port})"
+
+
+def _decode_address(value):
+    """Decodes a /proc/net/tcp address; each 32-bit word is in host (little-endian) byte order."""
+    host, port = value.split(":")
+    raw = bytes.fromhex(host)
+    raw = b"".join(raw[i:i + 4][::-1] for i in range(0, len(raw), 4))
+    return ipaddress.ip_address(raw), int(port, 16)
+
+
+def read_listening(proc=PROC):
+    """
+    Parses /proc/net/tcp and /proc/net/tcp6 once each and returns {inode: (address, port)}
+    for every socket in the LISTEN state. Other states are skipped before their addresses are decoded.
+    """
+    listening = dict()
+    for table in ("tcp", "tcp6"):
+        try:
+            with open(os.path.join(proc, "net", table), "r") as f:
+                next(f, None)
+                for line in f:
+                    fields = line.split()
+                    if len(fields) < 10 or fields[3] != TCP_LISTEN:
+                        continue
+                    listening[fields[9]] = _decode_address(fields[1])
+        except OSError:
+            continue
+    return listening
+
+
+def _program(argv):
+    """
+    Returns (program, arguments) for a command line: argv[0], or for a Python interpreter the module
+    after -m or the script it runs, e.g. a console script started through its shebang.
+    """
+    if not argv or not argv[0]:
+        return None, list()
+    name = os.path.basename(argv[0])
+    if not PYTHON.match(name):
+        return name, argv[1:]
+    i = 1
+    while i < len(argv):
+        arg = argv[i]
+        if arg == "-m":
+            return (argv[i + 1], argv[i + 2:]) if i + 1 < len(argv) else (None, list())
+        if arg.startswith("-m"):
+            return arg[2:], argv[i + 1:]
+        if arg == "-c" or arg == "-":
+            return None, list()
+        if not arg.startswith("-"):
+            return os.path.basename(arg), argv[i + 1:]
+        i += 2 if arg in PYTHON_OPTIONS_WITH_VALUE else 1
+    return None, list()
+
+
+def _role(argv):
+    """Returns "server", "kernel" or None for a process command line, judged only by the program it runs."""
+    program, args = _program(argv)
+    if not program:
+        return None
+    if program in KERNEL_MODULES or program.startswith("ipykernel_launcher"):
+        return "kernel"
+    if program in SERVER_COMMANDS or program in SERVER_MODULES:
+        return "server"
+    if program in ("jupyter", "jupyter_core") and args and args[0] in SERVER_SUBCOMMANDS:
+        return "server"
+    return None
+
+
+def jupyter_processes(proc=PROC):
+    """Yields (pid, role) for Jupyter server and kernel processes, reading only each process's cmdline."""
+    try:
+        entries = os.scandir(proc)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            if not entry.name.isdigit():
+                continue
+            try:
+                with open(os.path.join(entry.path, "cmdline"), "rb") as f:
+                    argv = f.read().decode(errors="replace").split("\0")
+            except OSError:
+                continue
+            role = _role(argv)
+            if role:
+                yield int(entry.name), role
+
+
+def _socket_inodes(proc, pid):
+    fd_dir = os.path.join(proc, str(pid), "fd")
+    try:
+        fds = os.listdir(fd_dir)
+    except OSError:
+        return
+    for fd in fds:
+        try:
+            target = os.readlink(os.path.join(fd_dir, fd))
+        except OSError:
+            continue
+        if target.startswith("socket:["):
+            yield target[8:-1]
+
+
+def listening_sockets(proc=PROC):
+    """
+    Maps listening sockets back to the Jupyter processes holding them through /proc/<pid>/fd.
+    Returns None when /proc/net isn't available, e.g. on macOS or Windows.
+    """
+    if not os.path.isdir(os.path.join(proc, "net")):
+        return None
+    listening = read_listening(proc)
+    if not listening:
+        return list()
+    listeners = list()
+    for pid, role in jupyter_processes(proc):
+        for inode in _socket_inodes(proc, pid):
+            if inode in listening:
+                address, port = listening[inode]
+                listeners.append(Listener(pid, role, address, port, inode))
+    return listeners
@@ -0,0 +1,71 @@
+import os
+from pathlib import Path
+
+SKIP_DIRS = (
+    "labextensions",
+    "nbextensions",
+    "node_modules",
+    "__pycache__",
+    ".git",
+    ".ipynb_checkpoints",
+)
+
+
+class FileIndex:
+    def __init__(self, roots, max_depth=8, skip_dirs=SKIP_DIRS):
+        """
+        Walks every root once with os.scandir, pruning `skip_dirs` and anything deeper than `max_depth`.
+        The resulting index of files and directory listings is shared by all path-based checks.
+        """
+        self.max_depth = max_depth
+        self.skip_dirs = set(skip_dirs)
+        self.roots = list(dict.fromkeys(str(r) for r in roots if r))
+        self.files = dict()
+        self.dirs = dict()
+        for root in self.roots:
+            self.files[root] = list()
+            self._walk(root)
+
+    def _walk(self, root):
+        files = self.files[root]
+        stack = [(root, 0)]
+        while stack:
+            path, depth = stack.pop()
+            try:
+                entries = os.scandir(path)
+            except OSError:
+                continue
+            names = list()
+            with entries:
+                for entry in entries:
+                    names.append(entry.name)
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        continue
+                    if not is_dir:
+                        files.append(entry.path)
+                    elif (
+                        entry.name not in self.skip_dirs
+                        and depth < self.max_depth
+                        and not entry.is_symlink()
+                    ):
+                        stack.append((entry.path, depth + 1))
+            self.dirs[path] = names
+
+    def _under(self, path, roots):
+        return any(path == r or path.startswith(r.rstrip(os.sep) + os.sep) for r in roots)
+
+    def iter_files(self, roots=None):
+        """Yields the path of every indexed file, optionally limited to some of the roots."""
+        roots = self.roots if roots is None else [str(r) for r in roots if r]
+        for root in roots:
+            for file in self.files.get(root, list()):
+                yield Path(file)
+
+    def iter_dirs(self, roots=None):
+        """Yields (directory path, entry names) for every indexed directory, optionally limited to some of the roots."""
+        roots = self.roots if roots is None else [str(r) for r in roots if r]
+        for path, names in self.dirs.items():
+            if self._under(path, roots):
+                yield Path(path), names
@@ -0,0 +1,318 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+from jupysec.finding import Finding, RULES
+from jupysec.history import HistoryTail
+from jupysec.config import config_scope, load_scopes, read_config
+from jupysec.rules import CONFIG_FILES, classify_scopes
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+# how deep a directory created under a watched one is searched for config files and startup directories,
+# e.g. a new profile_x/startup
+DISCOVER_DEPTH = 2
+IN_WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyBackend:
+    def __init__(self, dirs, settle=0.05):
+        """Waits on Linux inotify for changes to the entries of `dirs`. Raises OSError where inotify isn't available."""
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self.settle = settle
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = dict()
+        self.add(dirs)
+
+    def add(self, dirs):
+        """Starts watching more directories."""
+        for d in dirs:
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(d), IN_WATCH_MASK)
+            if wd >= 0:
+                self.watches[wd] = d
+
+    def _drain(self):
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if wd in self.watches:
+                    changed.add(os.path.join(self.watches[wd], os.fsdecode(name)))
+
+    def wait(self, timeout=None):
+        """Blocks until something changes or `timeout` passes, returning the set of changed paths."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        # let bursts of writes from one save settle into a single batch
+        time.sleep(self.settle)
+        return self._drain()
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingBackend:
+    def __init__(self, dirs, interval=0.5):
+        """Polls the entries of `dirs` for size and mtime changes. Only the watched directories are listed, never whole trees."""
+        self.dirs = list(dirs)
+        self.interval = interval
+        self.snapshot = self._snapshot(self.dirs)
+
+    def add(self, dirs):
+        """Starts polling more directories; their current entries aren't reported as changes."""
+        dirs = [d for d in dirs if d not in self.dirs]
+        self.dirs.extend(dirs)
+        self.snapshot.update(self._snapshot(dirs))
+
+    def _snapshot(self, dirs):
+        snapshot = dict()
+        for d in dirs:
+            try:
+                with os.scandir(d) as entries:
+                    for entry in entries:
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        snapshot[entry.path] = (st.st_size, st.st_mtime_ns)
+            except OSError:
+                continue
+        return snapshot
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval)
+            snapshot = self._snapshot(self.dirs)
+            changed = {p for p in snapshot.keys() | self.snapshot.keys() if snapshot.get(p) != self.snapshot.get(p)}
+            self.snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+def make_backend(dirs, interval=0.5):
+    """Prefers inotify and falls back to polling."""
+    try:
+        return InotifyBackend(dirs)
+    except (OSError, AttributeError):
+        return PollingBackend(dirs, interval)
+
+
+def scope_files(scope):
+    """Returns the existing files of a config scope, e.g. ".../jupyter_server_config" -> its .py and .json."""
+    return [scope + ext for ext in (".py", ".json") if os.path.isfile(scope + ext)]
+
+
+def scope_findings(scope):
+    """
+    Evaluates one config scope against the pyconfig rule families. Its .py and .json files are merged
+    as in a full scan, so a value the JSON overrides isn't reported.
+    """
+    findings = set()
+    for family, matched in classify_scopes(load_scopes(scope_files(scope))).items():
+        rule = RULES["check_pyconfig_" + family]
+        findings.update(Finding(rule=rule, source_text=v.text, source_doc=Path(v.path)) for v in matched)
+    return findings
+
+
+def config_includes(path):
+    """Returns the files that `path` pulls in with `load_subconfig`, following includes of includes."""
+    files, pending = set(), [os.path.abspath(path)]
+    while pending:
+        current = pending.pop()
+        try:
+            parsed = read_config(current)
+        except (OSError, UnicodeDecodeError):
+            continue
+        for fname, include_dir in parsed["includes"]:
+            include = os.path.abspath(os.path.join(include_dir or os.path.dirname(current), fname))
+            if include not in files:
+                files.add(include)
+                pending.append(include)
+    files.discard(os.path.abspath(path))
+    return files
+
+
+def startup_findings(path):
+    """Evaluates one ipython startup directory."""
+    try:
+        names = os.listdir(path)
+    except OSError:
+        return set()
+    rule = RULES["check_ipython_startup"]
+    return {Finding(rule=rule, source_text=name, source_doc=Path(path)) for name in names if name != "README"}
+
+
+class Watcher:
+    def __init__(self, rules, interval=0.5, history=False):
+        """
+        Watches the config and startup directories found by `rules` and re-evaluates only the
+        file or startup directory that changed. The directories holding profiles are watched too,
+        so a new profile or startup directory is picked up, and so are files included with `load_subconfig`.
+        With `history`, the history databases found by `rules` are tailed for silent executions too.
+        """
+        self.rules = rules
+        self.interval = interval
+        self.tail = None
+        if history and rules.index:
+            dbs = [f for f in rules.index.iter_files([rules.locations]) if f.name == "history.sqlite"]
+            self.tail = HistoryTail(dbs, interval=interval)
+        self.backend = None
+        self.startup_dirs, self.config_dirs, self.parent_dirs, self.include_dirs = set(), set(), set(), set()
+        # included file -> the config scopes that include it
+        self.includes = dict()
+        self.state = dict()
+        for p in rules.paths or list():
+            if os.path.isdir(p):
+                self._add_config_dir(str(p))
+        if rules.index:
+            for d, names in rules.index.iter_dirs([rules.locations]):
+                if "startup" in d.name:
+                    self._add_startup_dir(str(d))
+            for f in rules.index.iter_files():
+                if f.name.endswith(CONFIG_FILES):
+                    self._add_config_dir(str(f.parent))
+
+    def watched(self):
+        """Returns every directory the watcher needs events for."""
+        return self.startup_dirs | self.config_dirs | self.parent_dirs | self.include_dirs
+
+    def _watch(self, dirs, d):
+        if d not in dirs:
+            dirs.add(d)
+            if self.backend:
+                self.backend.add([d])
+
+    def _profile(self, d):
+        # new profiles appear next to existing ones
+        if os.path.basename(d).startswith("profile_"):
+            self._watch(self.parent_dirs, os.path.dirname(d))
+
+    def _update(self, key, current):
+        previous = self.state.get(key, set())
+        self.state[key] = current
+        return [("new", f) for f in current - previous] + [("resolved", f) for f in previous - current]
+
+    def _add_startup_dir(self, d):
+        if d in self.startup_dirs:
+            return list()
+        self._watch(self.startup_dirs, d)
+        self._watch(self.parent_dirs, os.path.dirname(d))
+        self._profile(os.path.dirname(d))
+        return self._update(d, startup_findings(d))
+
+    def _add_config_dir(self, d):
+        if d in self.config_dirs:
+            return list()
+        self._watch(self.config_dirs, d)
+        self._profile(d)
+        try:
+            names = os.listdir(d)
+        except OSError:
+            return list()
+        scopes = sorted({config_scope(os.path.join(d, name)) for name in names if name.endswith(CONFIG_FILES)})
+        return [event for scope in scopes for event in self._config_scope(scope)]
+
+    def _config_scope(self, scope):
+        """Re-evaluates every file of one config scope, since a later file can override an earlier one."""
+        for including in self.includes.values():
+            including.discard(scope)
+        for path in scope_files(scope):
+            for include in config_includes(path):
+                self.includes.setdefault(include, set()).add(scope)
+                self._watch(self.include_dirs, os.path.dirname(include))
+        return self._update(scope, scope_findings(scope))
+
+    def _discover(self, d, depth=DISCOVER_DEPTH):
+        """Registers the config and startup directories in a directory that appeared under a watched one."""
+        if "startup" in os.path.basename(d):
+            return self._add_startup_dir(d)
+        if os.path.basename(d).startswith("profile_"):
+            # watched before it is listed, so files created meanwhile aren't missed
+            self._watch(self.parent_dirs, d)
+            self._profile(d)
+        try:
+            with os.scandir(d) as entries:
+                entries = list(entries)
+        except OSError:
+            return list()
+        events = list()
+        if any(e.name.endswith(CONFIG_FILES) for e in entries):
+            events += self._add_config_dir(d)
+        if depth > 1:
+            for e in entries:
+                if e.is_dir(follow_symlinks=False) and e.path not in self.watched():
+                    events += self._discover(e.path, depth - 1)
+        return events
+
+    def findings(self):
+        """Returns every finding currently known to the watcher."""
+        return set().union(*self.state.values())
+
+    def evaluate(self, path):
+        """Re-evaluates whatever `path` belongs to, yielding ("new" | "resolved", finding) for each difference."""
+        parent = os.path.dirname(path)
+        name = os.path.basename(path)
+        events = list()
+        if path in self.startup_dirs or parent in self.startup_dirs:
+            key = path if path in self.startup_dirs else parent
+            events += self._update(key, startup_findings(key))
+        elif name.endswith(CONFIG_FILES) and parent in self.config_dirs:
+            events += self._config_scope(config_scope(path))
+        elif name.endswith(CONFIG_FILES) and parent in self.parent_dirs:
+            events += self._add_config_dir(parent)
+        elif parent in self.parent_dirs | self.config_dirs and path not in self.watched() and os.path.isdir(path):
+            events += self._discover(path)
+        for scope in sorted(self.includes.get(path, ())):
+            events += self._config_scope(scope)
+        yield from events
+
+    def run(self, backend=None, timeout=None):
+        """Yields ("new" | "resolved", finding) as watched files change; stops after `timeout` seconds without changes."""
+        backend = backend or make_backend(self.watched(), self.interval)
+        backend.add(self.watched())
+        self.backend = backend
+        idle = 0
+        try:
+            while timeout is None or idle < timeout:
+                wait = self.interval if self.tail else timeout
+                changed = backend.wait(wait)
+                events = [event for path in sorted(changed) for event in self.evaluate(path)]
+                if self.tail:
+                    events += [("new", finding) for finding in self.tail.findings()]
+                yield from events
+                idle = 0 if events else idle + (wait or 0)
+                if not self.tail and not changed and timeout is not None:
+                    return
+        finally:
+            self.backend = None
+            backend.close()
+            if self.tail:
+                self.tail.close()
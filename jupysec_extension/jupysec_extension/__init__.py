@@ -1,23 +1,38 @@
-import json
-from pathlib import Path
+import math
+import os
 
 from .handlers import setup_handlers
 from ._version import __version__
 
-HERE = Path(__file__).parent.resolve()
-
-with (HERE / "labextension" / "package.json").open() as fid:
-    data = json.load(fid)
-
 
 def _jupyter_labextension_paths():
-    return [{"src": "labextension", "dest": data["name"]}]
+    # labextension/ is built from src/ when the package is built; it isn't kept in the repository
+    return [{"src": "labextension", "dest": "jupysec_extension"}]
 
 
 def _jupyter_server_extension_points():
     return [{"module": "jupysec_extension"}]
 
 
+DEFAULT_SCAN_INTERVAL = 3600
+
+
+def _scan_interval(log):
+    """
+    Returns the seconds between background scans from JUPYSEC_SCAN_INTERVAL, or 0 to only scan on request.
+    A malformed value is logged and replaced by the default rather than stopping the extension from loading.
+    """
+    value = os.getenv("JUPYSEC_SCAN_INTERVAL", str(DEFAULT_SCAN_INTERVAL))
+    try:
+        interval = float(value)
+    except ValueError:
+        interval = math.nan
+    if not math.isfinite(interval):
+        log.warning(f"Ignoring JUPYSEC_SCAN_INTERVAL={value!r}, scanning every {DEFAULT_SCAN_INTERVAL} seconds")
+        return DEFAULT_SCAN_INTERVAL
+    return interval if interval > 0 else 0
+
+
 def _load_jupyter_server_extension(server_app):
     """Registers the API handler to receive HTTP requests from the frontend extension.
     Parameters
@@ -26,7 +41,7 @@ def _load_jupyter_server_extension(server_app):
         JupyterLab application instance
     """
     url_path = "jupysec_extension"
-    setup_handlers(server_app.web_app, url_path)
+    setup_handlers(server_app.web_app, url_path, _scan_interval(server_app.log))
     server_app.log.info(
         f"Registered jupysec extension at URL path /{url_path}"
     )
@@ -1,9 +1,9 @@
 import os
 import json
-import subprocess
-from pathlib import Path
-import itertools
 import time
+import uuid
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from jinja2 import Environment, FileSystemLoader
 
 from jupyter_server.base.handlers import APIHandler
@@ -11,28 +11,34 @@ from jupyter_server.utils import url_path_join
 from jupyter_server.base.handlers import JupyterHandler
 
 import tornado
+import tornado.ioloop
 from tornado.web import StaticFileHandler
 
+from jupysec.baseline import Baseline, default_baseline_path
 from jupysec.rules import Rules
-import pickle
+from jupysec.metrics import prometheus_text
+import sqlite3
 
+DEFAULT_PAGE = 100
+MAX_PAGE = 1000
 
-class FileHandler():
-    def __init__(self):
-        self.in_dir = os.getenv(
+
+templates = Environment(
+    loader=FileSystemLoader(
+        os.getenv(
             "JLAB_SERVER_EXAMPLE_STATIC_DIR",
             os.path.join(os.path.dirname(__file__), "templates"),
         )
-        self.out_dir = os.getenv(
-            "JLAB_SERVER_EXAMPLE_STATIC_DIR",
-            os.path.join(os.path.dirname(__file__), "public"),
-        )
+    ),
+    autoescape=True,
+    auto_reload=False,
+)
+
+
+def render_template(template, content):
+    """Renders from the module's one Jinja environment, which compiles and caches each template once."""
+    return templates.get_template(template).render(content)
 
-    def write_to_template(self, content, template, out):
-        env = Environment(loader=FileSystemLoader(self.in_dir))
-        results_template = env.get_template(template)
-        with open(f"{self.out_dir}/{out}", "w") as f:
-            f.write(results_template.render(content))
 
 def is_jsonable(x):
     try:
@@ -42,41 +48,330 @@ def is_jsonable(x):
         return False
 
 
+def open_baseline():
+    """Returns the Baseline in the Jupyter runtime directory, or None if there is nowhere to keep it."""
+    path = default_baseline_path()
+    if path is None:
+        return None
+    try:
+        return Baseline(path)
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def run_scan(baseline=None):
+    """
+    Runs the rules. Called on a worker thread, never on the event loop.
+    Each finding is marked "new" or "unchanged" against `baseline`. Until a baseline is accepted,
+    like the CLI without --update-baseline, every finding is new.
+    """
+    r = Rules(config=config, cache=True)
+    findings = [finding.as_dict() for finding in r.get_findings()]
+    # a collector that failed or timed out doesn't make its rules' baseline findings resolved
+    evaluated = sorted(r.evaluated_rules())
+    resolved = list()
+    saved = None
+    if baseline is not None:
+        added, removed, unchanged = baseline.diff(findings, rules=evaluated)
+        for finding in added:
+            finding["baseline"] = "new"
+        for finding in unchanged:
+            finding["baseline"] = "unchanged"
+        resolved = [dict(record, baseline="resolved") for record in removed]
+        saved = baseline.saved()
+    '''
+    # dumping the config to a file for debugging
+    keys = list()
+    for k,v in config.items():
+        if is_jsonable(v):
+            keys.append(k)
+    with open("config.json", "w") as f:
+        json.dump({key: value for (key, value) in config.items() if key in keys}, f)
+    '''
+    return {
+        "findings": findings,
+        "resolved": resolved,
+        "baseline_saved": saved,
+        "evaluated": evaluated,
+        "config": {k: v if is_jsonable(v) else str(v) for k, v in r.running_config.items()},
+        "metrics": r.metrics,
+        "finished": time.time(),
+    }
+
+
+def _etag(result):
+    """Hashes the finding ids and when the baseline was saved, so accepting a baseline also changes the ETag."""
+    ids = sorted(f["uuid"] for f in result["findings"])
+    ids.append(str(result.get("baseline_saved")))
+    return hashlib.sha1("\n".join(ids).encode()).hexdigest()
+
+
+class ScanJobs():
+    def __init__(self, max_jobs=20):
+        """
+        Runs scans on a single worker thread so the server's event loop stays responsive.
+        Requests made while a scan is running join that scan instead of starting another.
+        The newest completed result is kept in memory to be served without rescanning.
+        Only touched from the event loop thread.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jupysec-scan")
+        self.max_jobs = max_jobs
+        self.jobs = dict()
+        self.running = None
+        self.newest = None
+        self.periodic = None
+        self.baseline = open_baseline()
+
+    def start(self):
+        """Starts a scan, or returns the id of the one already running."""
+        if self.running is not None and not self.jobs[self.running]["future"].done():
+            return self.running
+        job_id = uuid.uuid4().hex
+        self.jobs[job_id] = {"started": time.time(), "future": self.executor.submit(run_scan, self.baseline)}
+        self.running = job_id
+        while len(self.jobs) > self.max_jobs:
+            del self.jobs[next(iter(self.jobs))]
+        return job_id
+
+    def status(self, job_id):
+        """Returns a JSON-serializable status for `job_id`, or None if it is unknown."""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        status = {"job": job_id, "started": job["started"]}
+        future = job["future"]
+        if not future.done():
+            status["status"] = "running"
+        elif future.exception() is not None:
+            status["status"] = "error"
+            status["error"] = repr(future.exception())
+        else:
+            status["status"] = "complete"
+            status["findings"] = len(future.result()["findings"])
+        return status
+
+    def latest(self):
+        """Returns the newest completed result with its job id and ETag, or None before the first scan finishes."""
+        for job_id in reversed(list(self.jobs)):
+            future = self.jobs[job_id]["future"]
+            if not future.done() or future.exception() is not None:
+                continue
+            if self.newest is None or self.newest["job"] != job_id:
+                self.newest = dict(future.result(), job=job_id)
+                self.newest["etag"] = _etag(self.newest)
+            break
+        return self.newest
+
+    def accept(self):
+        """
+        Saves the newest findings as the baseline, so they are no longer reported as new.
+        Returns the updated result, or None before the first scan finishes.
+        """
+        latest = self.latest()
+        if latest is None or self.baseline is None:
+            return None
+        self.baseline.save(latest["findings"], rules=latest["evaluated"])
+        for finding in latest["findings"]:
+            finding["baseline"] = "unchanged"
+        latest["resolved"] = list()
+        latest["baseline_saved"] = self.baseline.saved()
+        latest["etag"] = _etag(latest)
+        return latest
+
+    def schedule(self, interval):
+        """Scans now and then every `interval` seconds on the server's IOLoop."""
+        self.start()
+        self.periodic = tornado.ioloop.PeriodicCallback(self.start, interval * 1000)
+        self.periodic.start()
+
+
 class RouteHandler(APIHandler):
+    def initialize(self, jobs):
+        self.jobs = jobs
+
     # The following decorator should be present on all verb methods (head, get, post,
     # patch, put, delete, options) to ensure only authorized user can request the
     # Jupyter server
     @tornado.web.authenticated
     def get(self):
-        for filename in Path("jupysec_extension/public/").glob("*.html"):
-            filename.unlink()
-        r = Rules(config=config)
-        findings = r.get_findings()
-        f = FileHandler()
-        for finding in findings:
-            f.write_to_template({"finding": finding, "time": str(time.time())}, "finding.html", f"{finding.uuid}.html")
-        f.write_to_template({"config": r.running_config.items(), "findings": findings, "time": str(time.time())}, "index.html", "score.html")
-        '''
-        # dumping the config to a file for debugging
-        keys = list()
-        for k,v in config.items():
-            if is_jsonable(v):
-                keys.append(k)
-        with open("config.json", "w") as f:
-            json.dump({key: value for (key, value) in config.items() if key in keys}, f)
-        '''
-        self.finish(json.dumps({"data": "complete"}))
-
-
-def setup_handlers(web_app, url_path):
+        """Serves the newest scan result immediately, honouring If-None-Match; starts a scan if there is none yet."""
+        latest = self.jobs.latest()
+        if latest is None:
+            return self.post()
+        age = int(time.time() - latest["finished"])
+        self.set_header("Etag", f'"{latest["etag"]}"')
+        self.set_header("Age", str(age))
+        self.set_header("Cache-Control", "no-cache")
+        if self.check_etag_header():
+            self.set_status(304)
+            return self.finish()
+        self.finish(json.dumps({
+            "data": "complete",
+            "status": "complete",
+            "job": latest["job"],
+            "age": age,
+            "etag": latest["etag"],
+            "findings": len(latest["findings"]),
+        }))
+
+    @tornado.web.authenticated
+    def post(self):
+        """Starts a fresh scan, or joins the one already running."""
+        job_id = self.jobs.start()
+        self.set_status(202)
+        self.finish(json.dumps({"data": "started", "job": job_id}))
+
+
+class StatusHandler(APIHandler):
+    def initialize(self, jobs):
+        self.jobs = jobs
+
+    @tornado.web.authenticated
+    def get(self, job_id):
+        status = self.jobs.status(job_id)
+        if status is None:
+            raise tornado.web.HTTPError(404, f"Unknown scan job {job_id}")
+        self.finish(json.dumps(status))
+
+
+class FindingsHandler(APIHandler):
+    def initialize(self, jobs):
+        self.jobs = jobs
+
+    @tornado.web.authenticated
+    def get(self):
+        """
+        Returns a page of the newest findings as JSON.
+        Query arguments: `category` (repeatable) and `new=1` (only findings not in the baseline) filter,
+        `offset` and `limit` paginate.
+        """
+        latest = self.jobs.latest()
+        if latest is None:
+            self.set_status(202)
+            return self.finish(json.dumps({"data": "started", "job": self.jobs.start()}))
+        self.set_header("Etag", f'"{latest["etag"]}"')
+        self.set_header("Cache-Control", "no-cache")
+        if self.check_etag_header():
+            self.set_status(304)
+            return self.finish()
+        categories = self.get_arguments("category")
+        try:
+            offset = max(0, int(self.get_argument("offset", "0")))
+            limit = min(MAX_PAGE, max(1, int(self.get_argument("limit", str(DEFAULT_PAGE)))))
+        except ValueError:
+            raise tornado.web.HTTPError(400, "offset and limit must be integers")
+        findings = latest["findings"]
+        if categories:
+            findings = [f for f in findings if f["category"] in categories]
+        if self.get_argument("new", "") in ("1", "true"):
+            findings = [f for f in findings if f.get("baseline") == "new"]
+        self.finish(json.dumps({
+            "job": latest["job"],
+            "etag": latest["etag"],
+            "age": int(time.time() - latest["finished"]),
+            "config": latest["config"],
+            "categories": sorted(set(f["category"] for f in latest["findings"])),
+            "total": len(findings),
+            "new": sum(f.get("baseline") == "new" for f in latest["findings"]),
+            "resolved": len(latest["resolved"]),
+            "baseline_saved": latest["baseline_saved"],
+            "offset": offset,
+            "limit": limit,
+            "findings": findings[offset:offset + limit],
+        }))
+
+
+class BaselineHandler(APIHandler):
+    def initialize(self, jobs):
+        self.jobs = jobs
+
+    @tornado.web.authenticated
+    def get(self):
+        """Returns when the baseline was saved and the newest scan's diff against it."""
+        latest = self.jobs.latest()
+        if latest is None:
+            raise tornado.web.HTTPError(404, "No scan has completed yet")
+        self.finish(json.dumps({
+            "saved": latest["baseline_saved"],
+            "new": [f for f in latest["findings"] if f.get("baseline") == "new"],
+            "resolved": latest["resolved"],
+        }))
+
+    @tornado.web.authenticated
+    def post(self):
+        """Accepts the newest scan as the baseline."""
+        if self.jobs.baseline is None:
+            raise tornado.web.HTTPError(503, "The baseline can't be stored in the Jupyter runtime directory")
+        latest = self.jobs.accept()
+        if latest is None:
+            raise tornado.web.HTTPError(404, "No scan has completed yet")
+        self.finish(json.dumps({"saved": latest["baseline_saved"], "etag": latest["etag"]}))
+
+
+class MetricsHandler(JupyterHandler):
+    def initialize(self, jobs):
+        self.jobs = jobs
+
+    def get(self):
+        """
+        Serves the newest scan's timings and counters in the Prometheus text format.
+        Like the server's own /metrics, this needs authentication unless authenticate_prometheus is False.
+        """
+        if self.settings.get("authenticate_prometheus", True) and not self.current_user:
+            raise tornado.web.HTTPError(403)
+        latest = self.jobs.latest()
+        self.set_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        if latest is None:
+            self.jobs.start()
+            return self.finish("")
+        self.finish(prometheus_text(latest["metrics"], finished=latest["finished"]))
+
+
+class ReportHandler(JupyterHandler):
+    def initialize(self, jobs):
+        self.jobs = jobs
+
+    @tornado.web.authenticated
+    def get(self, name):
+        """Renders the scorecard, or one finding's page, from memory."""
+        latest = self.jobs.latest()
+        if latest is None:
+            raise tornado.web.HTTPError(404, "No scan has completed yet")
+        content = {"time": str(latest["finished"])}
+        if name == "score":
+            content.update(config=latest["config"].items(), findings=latest["findings"])
+            return self.finish(render_template("index.html", content))
+        for finding in latest["findings"]:
+            if finding["uuid"] == name:
+                content.update(finding=finding)
+                return self.finish(render_template("finding.html", content))
+        raise tornado.web.HTTPError(404, f"Unknown finding {name}")
+
+
+def setup_handlers(web_app, url_path, scan_interval=0):
     host_pattern = ".*$"
     base_url = web_app.settings["base_url"]
     global config
     config = web_app.settings
 
     # Prepend the base_url so that it works in a JupyterHub setting
+    jobs = ScanJobs()
+    if scan_interval > 0:
+        jobs.schedule(scan_interval)
     route_pattern = url_path_join(base_url, url_path, "scorecard_update")
-    handlers = [(route_pattern, RouteHandler)]
+    status_pattern = url_path_join(base_url, url_path, "scorecard_status", "([0-9a-f]+)")
+    findings_pattern = url_path_join(base_url, url_path, "findings")
+    metrics_pattern = url_path_join(base_url, url_path, "metrics")
+    baseline_pattern = url_path_join(base_url, url_path, "baseline")
+    report_pattern = url_path_join(base_url, url_path, "public", "(score|[0-9a-f-]+)\\.html")
+    handlers = [
+        (route_pattern, RouteHandler, {"jobs": jobs}),
+        (status_pattern, StatusHandler, {"jobs": jobs}),
+        (findings_pattern, FindingsHandler, {"jobs": jobs}),
+        (metrics_pattern, MetricsHandler, {"jobs": jobs}),
+        (baseline_pattern, BaselineHandler, {"jobs": jobs}),
+        (report_pattern, ReportHandler, {"jobs": jobs}),
+    ]
     web_app.add_handlers(host_pattern, handlers)
 
     # Prepend the base_url so that it works in a JupyterHub setting
@@ -1,143 +0,0 @@
-"use strict";
-(self["webpackChunkjupysec_extension"] = self["webpackChunkjupysec_extension"] || []).push([["lib_index_js"],{
-
-/***/ "./lib/handler.js":
-/*!************************!*\
-  !*** ./lib/handler.js ***!
-  \************************/
-/***/ ((__unused_webpack_module, __webpack_exports__, __webpack_require__) => {
-
-__webpack_require__.r(__webpack_exports__);
-/* harmony export */ __webpack_require__.d(__webpack_exports__, {
-/* harmony export */   "requestAPI": () => (/* binding */ requestAPI)
-/* harmony export */ });
-/* harmony import */ var _jupyterlab_coreutils__WEBPACK_IMPORTED_MODULE_0__ = __webpack_require__(/*! @jupyterlab/coreutils */ "webpack/sharing/consume/default/@jupyterlab/coreutils");
-/* harmony import */ var _jupyterlab_coreutils__WEBPACK_IMPORTED_MODULE_0___default = /*#__PURE__*/__webpack_require__.n(_jupyterlab_coreutils__WEBPACK_IMPORTED_MODULE_0__);
-/* harmony import */ var _jupyterlab_services__WEBPACK_IMPORTED_MODULE_1__ = __webpack_require__(/*! @jupyterlab/services */ "webpack/sharing/consume/default/@jupyterlab/services");
-/* harmony import */ var _jupyterlab_services__WEBPACK_IMPORTED_MODULE_1___default = /*#__PURE__*/__webpack_require__.n(_jupyterlab_services__WEBPACK_IMPORTED_MODULE_1__);
-
-
-/**
- * Call the API extension
- *
- * @param endPoint API REST end point for the extension
- * @param init Initial values for the request
- * @returns The response body interpreted as JSON
- */
-async function requestAPI(endPoint = '', init = {}) {
-    // Make request to Jupyter API
-    const settings = _jupyterlab_services__WEBPACK_IMPORTED_MODULE_1__.ServerConnection.makeSettings();
-    const requestUrl = _jupyterlab_coreutils__WEBPACK_IMPORTED_MODULE_0__.URLExt.join(settings.baseUrl, 'jupysec_extension', // API Namespace
-    endPoint);
-    let response;
-    try {
-        response = await _jupyterlab_services__WEBPACK_IMPORTED_MODULE_1__.ServerConnection.makeRequest(requestUrl, init, settings);
-    }
-    catch (error) {
-        throw new _jupyterlab_services__WEBPACK_IMPORTED_MODULE_1__.ServerConnection.NetworkError(error);
-    }
-    let data = await response.text();
-    if (data.length > 0) {
-        try {
-            data = JSON.parse(data);
-        }
-        catch (error) {
-            console.log('Not a JSON response body.', response);
-        }
-    }
-    if (!response.ok) {
-        throw new _jupyterlab_services__WEBPACK_IMPORTED_MODULE_1__.ServerConnection.ResponseError(response, data.message || data);
-    }
-    return data;
-}
-
-
-/***/ }),
-
-/***/ "./lib/index.js":
-/*!**********************!*\
-  !*** ./lib/index.js ***!
-  \**********************/
-/***/ ((__unused_webpack_module, __webpack_exports__, __webpack_require__) => {
-
-__webpack_require__.r(__webpack_exports__);
-/* harmony export */ __webpack_require__.d(__webpack_exports__, {
-/* harmony export */   "default": () => (__WEBPACK_DEFAULT_EXPORT__)
-/* harmony export */ });
-/* harmony import */ var _jupyterlab_apputils__WEBPACK_IMPORTED_MODULE_0__ = __webpack_require__(/*! @jupyterlab/apputils */ "webpack/sharing/consume/default/@jupyterlab/apputils");
-/* harmony import */ var _jupyterlab_apputils__WEBPACK_IMPORTED_MODULE_0___default = /*#__PURE__*/__webpack_require__.n(_jupyterlab_apputils__WEBPACK_IMPORTED_MODULE_0__);
-/* harmony import */ var _jupyterlab_coreutils__WEBPACK_IMPORTED_MODULE_1__ = __webpack_require__(/*! @jupyterlab/coreutils */ "webpack/sharing/consume/default/@jupyterlab/coreutils");
-/* harmony import */ var _jupyterlab_coreutils__WEBPACK_IMPORTED_MODULE_1___default = /*#__PURE__*/__webpack_require__.n(_jupyterlab_coreutils__WEBPACK_IMPORTED_MODULE_1__);
-/* harmony import */ var _jupyterlab_launcher__WEBPACK_IMPORTED_MODULE_2__ = __webpack_require__(/*! @jupyterlab/launcher */ "webpack/sharing/consume/default/@jupyterlab/launcher");
-/* harmony import */ var _jupyterlab_launcher__WEBPACK_IMPORTED_MODULE_2___default = /*#__PURE__*/__webpack_require__.n(_jupyterlab_launcher__WEBPACK_IMPORTED_MODULE_2__);
-/* harmony import */ var _handler__WEBPACK_IMPORTED_MODULE_3__ = __webpack_require__(/*! ./handler */ "./lib/handler.js");
-
-
-
-
-/**
- * The command IDs used by the server extension plugin.
- */
-var CommandIDs;
-(function (CommandIDs) {
-    CommandIDs.get = 'server:get-file';
-})(CommandIDs || (CommandIDs = {}));
-/**
- * Initialization data for the jupysec extension.
- */
-const extension = {
-    id: 'jupysec_extension',
-    autoStart: true,
-    optional: [_jupyterlab_launcher__WEBPACK_IMPORTED_MODULE_2__.ILauncher],
-    requires: [_jupyterlab_apputils__WEBPACK_IMPORTED_MODULE_0__.ICommandPalette],
-    activate: async (app, palette, launcher) => {
-        console.log('JupyterLab extension jupysec is activated!');
-        const { commands, shell } = app;
-        const command = CommandIDs.get;
-        const category = 'Security';
-        commands.addCommand(command, {
-            label: 'Security Report',
-            caption: 'Security Report',
-            execute: () => {
-                const widget = new IFrameWidget();
-                widget.update();
-                shell.add(widget, 'main');
-            },
-        });
-        palette.addItem({ command, category: category });
-        if (launcher) {
-            // Add launcher
-            launcher.add({
-                command: command,
-                category: category,
-            });
-        }
-    },
-};
-/* harmony default export */ const __WEBPACK_DEFAULT_EXPORT__ = (extension);
-class IFrameWidget extends _jupyterlab_apputils__WEBPACK_IMPORTED_MODULE_0__.IFrame {
-    constructor() {
-        super();
-        const baseUrl = _jupyterlab_coreutils__WEBPACK_IMPORTED_MODULE_1__.PageConfig.getBaseUrl();
-        this.url = baseUrl + 'jupysec_extension/public/score.html';
-        this.id = 'jupysec_extension';
-        this.title.label = 'Report Card';
-        this.title.closable = true;
-        this.node.style.overflowY = 'auto';
-    }
-    async update() {
-        try {
-            const data = await (0,_handler__WEBPACK_IMPORTED_MODULE_3__.requestAPI)('scorecard_update');
-            console.log(data);
-        }
-        catch (reason) {
-            console.error(`Error on GET /jupysec_extension/scorecard_update.\n${reason}`);
-        }
-    }
-}
-
-
-/***/ })
-
-}]);
-//# sourceMappingURL=lib_index_js.7716ec923b3030b6b8ca.js.map
\ No newline at end of file
@@ -0,0 +1,16 @@
+import pytest
+
+try:
+    # the fixtures and async test support of pytest-jupyter[server], for this directory only
+    from pytest_jupyter.jupyter_server import *  # noqa: F401,F403
+except ImportError:
+    collect_ignore_glob = ["test_*.py"]
+else:
+    @pytest.fixture
+    def jp_server_config():
+        return {"ServerApp": {"jpserver_extensions": {"jupysec_extension": True}}}
+
+
+@pytest.fixture(autouse=True)
+def no_background_scans(monkeypatch):
+    monkeypatch.setenv("JUPYSEC_SCAN_INTERVAL", "0")
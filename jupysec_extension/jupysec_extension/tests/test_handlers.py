@@ -0,0 +1,100 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from jupysec.finding import Finding, register_rule
+from jupysec_extension import handlers
+
+RULE = register_rule("test_extension_rule", category="Access")
+
+
+class FakeRules:
+    findings = [Finding(rule=RULE, source_doc="doc", source_text=str(i)) for i in range(3)]
+
+    def __init__(self, **kwargs):
+        self.running_config = {"ip": "localhost"}
+        self.metrics = {"collectors": dict(), "checks": dict()}
+
+    def evaluated_rules(self):
+        return {RULE.id}
+
+    def get_findings(self):
+        return list(self.findings)
+
+
+@pytest.fixture
+def fake_rules(monkeypatch):
+    monkeypatch.setattr(handlers, "Rules", FakeRules)
+
+
+async def _get(jp_fetch, *parts, **kwargs):
+    response = await jp_fetch("jupysec_extension", *parts, raise_error=False, **kwargs)
+    return response.code, response.headers, json.loads(response.body) if response.body else None
+
+
+async def _scan(jp_fetch):
+    code, headers, body = await _get(jp_fetch, "scorecard_update")
+    assert code == 202
+    for _ in range(100):
+        code, headers, status = await _get(jp_fetch, "scorecard_status", body["job"])
+        if status["status"] != "running":
+            return status
+        await asyncio.sleep(0.05)
+    raise AssertionError("scan didn't finish")
+
+
+async def test_findings_pages_and_etag(jp_fetch, fake_rules):
+    assert (await _scan(jp_fetch))["findings"] == 3
+
+    code, headers, page = await _get(jp_fetch, "findings", params={"limit": "2"})
+    assert code == 200 and page["total"] == 3 and len(page["findings"]) == 2
+    code, headers, rest = await _get(jp_fetch, "findings", params={"offset": "2", "limit": "2"})
+    assert [f["source_text"] for f in page["findings"] + rest["findings"]] == ["0", "1", "2"]
+    assert (await _get(jp_fetch, "findings", params={"limit": "x"}))[0] == 400
+
+    etag = headers["Etag"]
+    assert (await _get(jp_fetch, "findings", headers={"If-None-Match": etag}))[0] == 304
+    code, headers, status = await _get(jp_fetch, "scorecard_update", headers={"If-None-Match": etag})
+    assert code == 304
+    code, headers, status = await _get(jp_fetch, "scorecard_update")
+    assert code == 200 and status["etag"] == etag.strip('"')
+
+
+async def test_accept_baseline(jp_fetch, fake_rules):
+    await _scan(jp_fetch)
+    code, headers, page = await _get(jp_fetch, "findings", params={"new": "1"})
+    assert page["total"] == page["new"] == 3 and page["baseline_saved"] is None
+    etag = headers["Etag"].strip('"')
+
+    code, headers, accepted = await _get(jp_fetch, "baseline", method="POST", body=b"")
+    assert code == 200 and accepted["etag"] != etag
+    code, headers, page = await _get(jp_fetch, "findings", params={"new": "1"})
+    assert page["total"] == page["new"] == 0 and page["baseline_saved"] is not None
+
+
+def test_scan_jobs_join_the_running_scan(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(handlers, "run_scan", lambda baseline: release.wait(5) and {"findings": list()})
+    monkeypatch.setattr(handlers, "open_baseline", lambda: None)
+    jobs = handlers.ScanJobs(max_jobs=2)
+    first = jobs.start()
+    assert jobs.start() == first
+    assert jobs.status(first)["status"] == "running" and jobs.latest() is None
+    release.set()
+    jobs.jobs[first]["future"].result()
+    assert jobs.status(first) == {"job": first, "started": jobs.jobs[first]["started"], "status": "complete", "findings": 0}
+    assert jobs.start() != first
+    jobs.start(), jobs.start()
+    assert len(jobs.jobs) <= 2 and jobs.status("unknown") is None
+
+
+def test_scan_interval(monkeypatch):
+    import logging
+    from jupysec_extension import DEFAULT_SCAN_INTERVAL, _scan_interval
+
+    log = logging.getLogger("test_scan_interval")
+    for value, expected in (("60", 60), ("0", 0), ("-5", 0), ("1h", DEFAULT_SCAN_INTERVAL), ("nan", DEFAULT_SCAN_INTERVAL), ("inf", DEFAULT_SCAN_INTERVAL)):
+        monkeypatch.setenv("JUPYSEC_SCAN_INTERVAL", value)
+        assert _scan_interval(log) == expected
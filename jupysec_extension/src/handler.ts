@@ -7,7 +7,7 @@ import { ServerConnection } from '@jupyterlab/services';
  *
  * @param endPoint API REST end point for the extension
  * @param init Initial values for the request
- * @returns The response body interpreted as JSON
+ * @returns The response body interpreted as JSON, or null for 304 Not Modified
  */
 export async function requestAPI<T>(
   endPoint = '',
@@ -28,6 +28,10 @@ export async function requestAPI<T>(
     throw new ServerConnection.NetworkError(error);
   }
 
+  if (response.status === 304) {
+    return null as any;
+  }
+
   let data: any = await response.text();
 
   if (data.length > 0) {
@@ -3,12 +3,12 @@ import {
   JupyterFrontEndPlugin,
 } from '@jupyterlab/application';
 
-import { ICommandPalette, IFrame } from '@jupyterlab/apputils';
-
-import { PageConfig } from '@jupyterlab/coreutils';
+import { ICommandPalette } from '@jupyterlab/apputils';
 
 import { ILauncher } from '@jupyterlab/launcher';
 
+import { Widget } from '@lumino/widgets';
+
 import { requestAPI } from './handler';
 
 /**
@@ -41,8 +41,8 @@ const extension: JupyterFrontEndPlugin<void> = {
       label: 'Security Report',
       caption: 'Security Report',
       execute: () => {
-        const widget = new IFrameWidget();
-        widget.update();
+        const widget = new ScorecardWidget();
+        widget.refresh();
         shell.add(widget, 'main');
       },
     });
@@ -61,23 +61,277 @@ const extension: JupyterFrontEndPlugin<void> = {
 
 export default extension;
 
-class IFrameWidget extends IFrame {
+/**
+ * How often to poll a running scan, in milliseconds.
+ */
+const POLL_INTERVAL = 1000;
+
+/**
+ * How often to check for a newer background scan, in milliseconds.
+ */
+const REVALIDATE_INTERVAL = 30000;
+
+/**
+ * How many findings to request per page.
+ */
+const PAGE_SIZE = 100;
+
+/**
+ * A scan job as reported by scorecard_update and scorecard_status.
+ */
+interface IScanJob {
+  job: string;
+  status?: 'running' | 'complete' | 'error';
+  error?: string;
+  findings?: number;
+  etag?: string;
+  age?: number;
+}
+
+/**
+ * A finding as returned by the findings endpoint.
+ */
+interface IFinding {
+  uuid: string;
+  rule: string;
+  category: string;
+  source_doc: string;
+  source_text: string;
+  source_details: string;
+  remediation: string;
+  baseline?: 'new' | 'unchanged';
+}
+
+/**
+ * A page of findings as returned by the findings endpoint.
+ */
+interface IFindingsPage {
+  job: string;
+  etag: string;
+  age: number;
+  config: { [key: string]: any };
+  categories: string[];
+  total: number;
+  new: number;
+  resolved: number;
+  baseline_saved: number | null;
+  offset: number;
+  limit: number;
+  findings: IFinding[];
+}
+
+/**
+ * Renders the scorecard client-side from the findings JSON API.
+ */
+class ScorecardWidget extends Widget {
+  private etag: string | null = null;
+  private timer: number | null = null;
+  private category = '';
+  private newOnly = false;
+  private loaded = 0;
+  private configNode: HTMLElement;
+  private filterNode: HTMLSelectElement;
+  private newOnlyNode: HTMLInputElement;
+  private acceptNode: HTMLButtonElement;
+  private tableNode: HTMLTableSectionElement;
+  private moreNode: HTMLButtonElement;
+  private footerNode: HTMLElement;
+
   constructor() {
     super();
-    const baseUrl = PageConfig.getBaseUrl();
-    this.url = baseUrl + 'jupysec_extension/public/score.html';
     this.id = 'jupysec_extension';
     this.title.label = 'Report Card';
     this.title.closable = true;
+    this.addClass('jp-jupysec-scorecard');
+
+    const configTitle = document.createElement('h1');
+    configTitle.textContent = 'Running Configuration';
+    this.configNode = document.createElement('div');
+
+    const findingsTitle = document.createElement('h1');
+    findingsTitle.textContent = 'Findings';
+    this.filterNode = document.createElement('select');
+    this.filterNode.onchange = () => {
+      this.category = this.filterNode.value;
+      void this.load(true);
+    };
+
+    this.newOnlyNode = document.createElement('input');
+    this.newOnlyNode.type = 'checkbox';
+    this.newOnlyNode.onchange = () => {
+      this.newOnly = this.newOnlyNode.checked;
+      void this.load(true);
+    };
+    const newOnlyLabel = document.createElement('label');
+    newOnlyLabel.append(this.newOnlyNode, 'New since baseline only');
+
+    this.acceptNode = document.createElement('button');
+    this.acceptNode.textContent = 'Accept as baseline';
+    this.acceptNode.onclick = () => void this.accept();
+
+    const table = document.createElement('table');
+    table.className = 'styled-table';
+    const header = table.createTHead().insertRow();
+    for (const name of ['Category', 'Source', 'Document', 'Details']) {
+      const th = document.createElement('th');
+      th.textContent = name;
+      header.appendChild(th);
+    }
+    this.tableNode = table.createTBody();
+
+    this.moreNode = document.createElement('button');
+    this.moreNode.textContent = 'Load more';
+    this.moreNode.onclick = () => void this.load(false);
+    this.footerNode = document.createElement('p');
+
+    this.node.append(
+      configTitle,
+      this.configNode,
+      findingsTitle,
+      this.filterNode,
+      newOnlyLabel,
+      this.acceptNode,
+      table,
+      this.moreNode,
+      this.footerNode
+    );
     this.node.style.overflowY = 'auto';
   }
 
-  async update() {
+  /**
+   * Wait for a scan if none has completed yet, render the first page and start revalidating.
+   */
+  async refresh(): Promise<void> {
     try {
-      const data = await requestAPI<any>('scorecard_update');
-      console.log(data);
+      let status = await requestAPI<IScanJob>('scorecard_update');
+      const job = status.job;
+      while (status.status !== 'complete' && status.status !== 'error') {
+        this.footerNode.textContent = 'Scanning...';
+        await new Promise(resolve => setTimeout(resolve, POLL_INTERVAL));
+        status = await requestAPI<IScanJob>(`scorecard_status/${job}`);
+      }
+      if (status.status === 'error') {
+        this.footerNode.textContent = `Scan failed: ${status.error}`;
+        return;
+      }
+      await this.load(true);
     } catch (reason) {
       console.error(`Error on GET /jupysec_extension/scorecard_update.\n${reason}`);
     }
+    this.watch();
+  }
+
+  /**
+   * Fetch a page of findings. `reset` starts again from the first page.
+   */
+  private async load(reset: boolean): Promise<void> {
+    const offset = reset ? 0 : this.loaded;
+    const params = new URLSearchParams({
+      offset: String(offset),
+      limit: String(PAGE_SIZE),
+    });
+    if (this.category) {
+      params.append('category', this.category);
+    }
+    if (this.newOnly) {
+      params.append('new', '1');
+    }
+    try {
+      const page = await requestAPI<IFindingsPage>(`findings?${params}`);
+      if (reset) {
+        this.tableNode.textContent = '';
+        this.loaded = 0;
+        this.renderConfig(page.config);
+        this.renderFilter(page.categories);
+      }
+      this.etag = `"${page.etag}"`;
+      for (const finding of page.findings) {
+        this.renderFinding(finding);
+      }
+      this.loaded += page.findings.length;
+      this.moreNode.hidden = this.loaded >= page.total;
+      this.footerNode.textContent =
+        `${page.total} findings, ${page.new} new and ${page.resolved} resolved since the baseline, ` +
+        `scanned ${page.age}s ago`;
+    } catch (reason) {
+      console.error(`Error on GET /jupysec_extension/findings.\n${reason}`);
+    }
+  }
+
+  /**
+   * Accept the newest findings as the baseline, so only findings after this point are new.
+   */
+  private async accept(): Promise<void> {
+    try {
+      await requestAPI('baseline', { method: 'POST' });
+      await this.load(true);
+    } catch (reason) {
+      console.error(`Error on POST /jupysec_extension/baseline.\n${reason}`);
+    }
+  }
+
+  /**
+   * Periodically revalidate with a conditional GET and re-render only when the findings changed.
+   */
+  private watch(): void {
+    if (this.timer !== null) {
+      return;
+    }
+    this.timer = window.setInterval(async () => {
+      try {
+        const init = this.etag ? { headers: { 'If-None-Match': this.etag } } : {};
+        const status = await requestAPI<IScanJob | null>('scorecard_update', init);
+        if (status && status.status === 'complete' && `"${status.etag}"` !== this.etag) {
+          await this.load(true);
+        }
+      } catch (reason) {
+        console.error(`Error revalidating /jupysec_extension/scorecard_update.\n${reason}`);
+      }
+    }, REVALIDATE_INTERVAL);
+  }
+
+  private renderConfig(config: { [key: string]: any }): void {
+    this.configNode.textContent = '';
+    for (const [key, value] of Object.entries(config)) {
+      const p = document.createElement('p');
+      p.textContent = `${key} : ${value}`;
+      this.configNode.appendChild(p);
+    }
+  }
+
+  private renderFilter(categories: string[]): void {
+    this.filterNode.textContent = '';
+    for (const category of ['', ...categories]) {
+      const option = document.createElement('option');
+      option.value = category;
+      option.textContent = category || 'All categories';
+      option.selected = category === this.category;
+      this.filterNode.appendChild(option);
+    }
   }
-}
\ No newline at end of file
+
+  private renderFinding(finding: IFinding): void {
+    const row = this.tableNode.insertRow();
+    row.dataset.val = finding.category;
+    if (finding.baseline === 'new') {
+      row.classList.add('jp-jupysec-new');
+    }
+    row.title = finding.remediation;
+    for (const text of [
+      finding.category,
+      finding.source_text,
+      finding.source_doc,
+      finding.source_details,
+    ]) {
+      row.insertCell().textContent = text;
+    }
+  }
+
+  dispose(): void {
+    if (this.timer !== null) {
+      window.clearInterval(this.timer);
+      this.timer = null;
+    }
+    super.dispose();
+  }
+}
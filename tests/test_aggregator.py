@@ -0,0 +1,93 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from jupysec.agent import SendError, batches, send, send_results
+from jupysec.aggregator import AggregatorServer, Store
+from jupysec.finding import Finding, register_rule
+
+RULE = register_rule("test_aggregator_rule", category="Access", severity="high")
+
+
+def _results(n, root=None):
+    return [("test_aggregator_rule", Finding(rule=RULE, source_doc="doc", source_text=str(i)), root) for i in range(n)]
+
+
+@pytest.fixture
+def aggregator(tmp_path):
+    server = AggregatorServer(("127.0.0.1", 0), Store(str(tmp_path / "fleet.sqlite")), token="secret", quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_batches():
+    sent = list(batches(_results(5), "web-1", "scan", 1.0, size=2))
+    assert [len(b["findings"]) for b in sent] == [2, 2, 1]
+    assert sent[-1]["complete"] and sent[-1]["total"] == 5
+    assert list(batches([], "web-1", "scan", 1.0))[0]["total"] == 0
+
+
+def test_agent_to_aggregator(aggregator):
+    server, url = aggregator
+    before = time.time()
+    summary = send_results(_results(7), f"{url}/ingest", host="web-1", token="secret", batch_size=3)
+    assert summary["batches"] == 3 and summary["findings"] == 7
+    send_results(_results(2, root="/mnt/b"), f"{url}/ingest", host="web-2", token="secret")
+
+    store = server.store
+    assert len(store.findings(host="web-1")) == 7
+    assert len(store.findings(category="Access", since=before)) == 9
+    assert store.findings(until=before) == list()
+    assert {h["host"]: (h["findings"], h["complete"]) for h in store.hosts()} == {"web-1": (7, True), "web-2": (2, True)}
+    assert store.findings(host="web-2")[0]["root"] == "/mnt/b"
+
+    with pytest.raises(SendError, match="401"):
+        send_results(_results(1), f"{url}/ingest", host="web-3", token="wrong")
+
+
+def test_retry_and_idempotent_ingest(aggregator):
+    server, url = aggregator
+    ingest, calls = server.store.ingest, list()
+
+    def flaky(batch):
+        calls.append(batch["seq"])
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return ingest(batch)
+
+    server.store.ingest = flaky
+    batch = next(batches(_results(3), "web-1", "scan", 1.0))
+    assert send(f"{url}/ingest", batch, token="secret", backoff=0.01) == {"added": 3}
+    assert send(f"{url}/ingest", batch, token="secret") == {"added": 0}
+    assert calls == [0, 0, 0]
+
+
+def test_concurrent_ingest(aggregator):
+    server, url = aggregator
+    threads = [
+        threading.Thread(target=send_results, args=(_results(50),), kwargs=dict(url=f"{url}/ingest", host=f"h{i}", token="secret", batch_size=10))
+        for i in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(server.store.findings(limit=1000)) == 400
+
+
+def test_hosts_latest_scan(tmp_path):
+    store = Store(str(tmp_path / "fleet.sqlite"))
+    for host in ("web-1", "web-2"):
+        for scanned in range(50):
+            batch = next(batches(_results(scanned % 3), host, f"{host}-{scanned}", float(scanned)))
+            store.ingest(batch)
+    assert [(h["host"], h["scan"], h["findings"]) for h in store.hosts()] == [("web-1", "web-1-49", 1), ("web-2", "web-2-49", 1)]
+    plan = " ".join(row[-1] for row in store._db().execute(
+        "EXPLAIN QUERY PLAN SELECT host, MAX(scanned) FROM scans GROUP BY host"
+    ))
+    assert "scans_host_scanned" in plan
@@ -0,0 +1,55 @@
+from jupysec.baseline import Baseline, BaselineDiff
+from jupysec.finding import Finding, register_rule
+
+RULE = register_rule("test_baseline_rule", category="Access", severity="high")
+
+
+def _findings(*texts):
+    return [Finding(rule=RULE, source_doc="doc", source_text=text) for text in texts]
+
+
+def test_baseline_diff(tmp_path):
+    baseline = Baseline(str(tmp_path / "baseline.sqlite"))
+    assert baseline.saved() is None
+    a, b, c = _findings("a", "b", "c")
+    baseline.save([a, b], now=1.0)
+    baseline.save([a.as_dict(), b.as_dict()], scope="/mnt/other", now=1.0)
+    added, removed, unchanged = baseline.diff([b, c])
+    assert added == [c] and unchanged == [b]
+    assert [r["uuid"] for r in removed] == [str(a.uuid)]
+
+    baseline.save([b, c], now=2.0)
+    stored = Baseline(baseline.path).load()
+    assert stored[str(b.uuid)]["first_seen"] == 1.0 and stored[str(c.uuid)]["first_seen"] == 2.0
+    assert baseline.scopes() == ["/mnt/other", "local"]
+    assert len(baseline.load("/mnt/other")) == 2
+
+
+def test_baseline_diff_streaming(tmp_path):
+    baseline = Baseline(str(tmp_path / "baseline.sqlite"))
+    a, b, c = _findings("a", "b", "c")
+    baseline.save([a, b])
+    diff = BaselineDiff(baseline)
+    assert [diff.add(f) for f in (b, c)] == ["unchanged", "new"]
+    resolved = diff.resolved()
+    assert resolved == [("local", a)] and resolved[0][1].rule is RULE
+    assert diff.state(a) == "resolved"
+    diff.save()
+    assert set(baseline.load()) == {str(b.uuid), str(c.uuid)}
+
+
+def test_baseline_partial_scan(tmp_path):
+    other = register_rule("test_baseline_other_rule", category="Access")
+    baseline = Baseline(str(tmp_path / "baseline.sqlite"))
+    a, b = _findings("a", "b")
+    kept = Finding(rule=other, source_doc="doc", source_text="kept")
+    baseline.save([a, b, kept])
+    baseline.save([a], scope="/mnt/down")
+
+    # only RULE was evaluated, and /mnt/down wasn't scanned at all
+    diff = BaselineDiff(baseline, ("local", "/mnt/down"), evaluated={"local": {RULE.id}})
+    assert diff.add(b) == "unchanged"
+    assert diff.resolved() == [("local", a)]
+    diff.save()
+    assert set(baseline.load()) == {str(b.uuid), str(kept.uuid)}
+    assert set(baseline.load("/mnt/down")) == {str(a.uuid)}
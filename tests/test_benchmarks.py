@@ -0,0 +1,15 @@
+import io
+from benchmarks.run import compare, run_once, summarize
+from benchmarks.synthetic import build_environment
+
+
+def test_benchmark_smoke(tmp_path):
+    home = str(tmp_path / "home")
+    environment = build_environment(home, "small", history_rows=2000, silent_rate=0.01, config_lines=200, data_depth=2, servers=3, kernels=3)
+    runs = [run_once(home, trace_memory=True, max_workers=2, timeout=None) for _ in range(2)]
+    assert set(runs[0]["collectors"]) >= {"locations", "paths", "servers", "index", "uncommented", "kernels", "history"}
+    assert runs[0]["checks"]["check_for_silent_history"]["findings"] == environment["silent_rows"] > 0
+    assert runs[0]["peak_traced_bytes"] > 0
+
+    results = {"summary": summarize(runs)}
+    assert compare(results, results, threshold=1.25, out=io.StringIO()) == []
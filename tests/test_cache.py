@@ -0,0 +1,43 @@
+import os
+import time
+from jupysec.cache import ConfigCache
+
+
+def test_config_cache(tmp_path):
+    config = tmp_path / "jupyter_server_config.py"
+    config.write_text("c.ServerApp.ip = '*'\n")
+    calls = list()
+
+    def parse(text):
+        calls.append(text)
+        return text.splitlines()
+
+    cache = ConfigCache(str(tmp_path / "cache.json"))
+    assert cache.get(config, parse) == ["c.ServerApp.ip = '*'"]
+    cache.save()
+
+    cache = ConfigCache(str(tmp_path / "cache.json"))
+    assert cache.get(config, parse) == ["c.ServerApp.ip = '*'"]
+    assert len(calls) == 1
+
+    config.write_text("c.ServerApp.ip = 'localhost'\n")
+    os.utime(config, ns=(0, 0))
+    assert cache.get(config, parse) == ["c.ServerApp.ip = 'localhost'"]
+    assert len(calls) == 2
+
+
+def test_config_cache_restored_mtime(tmp_path):
+    config = tmp_path / "jupyter_server_config.py"
+    config.write_text("c.ServerApp.ip = 'localhost'\n")
+    cache = ConfigCache(str(tmp_path / "cache.json"))
+    assert cache.get(config, str) == "c.ServerApp.ip = 'localhost'\n"
+    cache.save()
+
+    # same size, mtime put back; only the ctime (and the contents) give it away
+    st = os.stat(config)
+    time.sleep(0.05)
+    config.write_text("c.ServerApp.ip = '*'        \n")
+    os.utime(config, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert os.stat(config).st_size == st.st_size
+    cache = ConfigCache(str(tmp_path / "cache.json"))
+    assert cache.get(config, str) == "c.ServerApp.ip = '*'        \n"
@@ -0,0 +1,69 @@
+import io
+import json
+from jupysec.cli import parse_args, to_sarif, write_jsonl
+from jupysec.finding import Finding
+
+
+def _results():
+    f = Finding(category="Authorization", source_text="http://localhost:8888/ :: /home/test", source_doc="jupyter server list")
+    return [("check_for_token", f, None)]
+
+
+def test_write_jsonl():
+    out = io.StringIO()
+    write_jsonl(_results(), out)
+    record = json.loads(out.getvalue())
+    assert record["check"] == "check_for_token"
+    assert record["category"] == "Authorization"
+
+
+def test_to_sarif():
+    sarif = to_sarif(_results())
+    assert sarif["runs"][0]["tool"]["driver"]["rules"][0]["id"] == "check_for_token"
+    assert sarif["runs"][0]["results"][0]["level"] == "warning"
+
+
+def test_parse_args():
+    args = parse_args(["--checks", "for_token,check_for_https", "--collectors", "servers"])
+    assert args.checks == ["check_for_token", "check_for_https"]
+    assert args.collectors == ["servers"]
+
+
+def test_baseline_new_only(tmp_path):
+    from jupysec.baseline import Baseline, BaselineDiff
+    from jupysec.cli import apply_baseline
+
+    baseline = Baseline(str(tmp_path / "baseline.sqlite"))
+    old = Finding(category="Authorization", source_text="old", source_doc="jupyter server list")
+    baseline.save([old] + [f for _, f, _ in _results()])
+    new = Finding(category="Authorization", source_text="new", source_doc="jupyter server list")
+    results = _results() + [("check_for_token", new, None)]
+
+    out = io.StringIO()
+    diff = BaselineDiff(baseline)
+    write_jsonl(apply_baseline(results, diff), out, diff=diff)
+    states = [json.loads(line)["baseline"] for line in out.getvalue().splitlines()]
+    assert states == ["unchanged", "new", "resolved"]
+
+    diff = BaselineDiff(baseline)
+    sarif = to_sarif(apply_baseline(results, diff, new_only=True), diff=diff)
+    assert [r["baselineState"] for r in sarif["runs"][0]["results"]] == ["new"]
+    assert parse_args(["--new-only"]).baseline == ""
+
+
+def test_update_baseline_with_checks(tmp_path):
+    from jupysec.baseline import Baseline
+    from jupysec.cli import main
+    from jupysec.finding import RULES
+
+    path = str(tmp_path / "baseline.sqlite")
+    startup = Finding(rule=RULES["check_ipython_startup"], source_text="00-evil.py", source_doc="/home/test/.ipython")
+    token = Finding(rule=RULES["check_for_token"], source_text="gone", source_doc="jupyter server list")
+    Baseline(path).save([startup, token])
+    out = str(tmp_path / "out.jsonl")
+    assert main(["--checks", "check_for_token", "--baseline", path, "--output", out]) == 0
+    with open(out) as f:
+        assert [(r["rule"], r["baseline"]) for r in map(json.loads, f) if r["source_text"] in ("gone", "00-evil.py")] == [("check_for_token", "resolved")]
+
+    main(["--checks", "check_for_token", "--update-baseline", "--baseline", path, "--output", out])
+    assert set(Baseline(path).load()) == {str(startup.uuid)}
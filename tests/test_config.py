@@ -0,0 +1,97 @@
+import json
+from jupysec.config import load_traits, parse_py
+from jupysec.rules import Rules, classify_traits
+
+CONFIG = """
+cfg = get_config()
+
+# c.ServerApp.ip = '0.0.0.0'
+cfg.ServerApp.allow_remote_access = False
+app = cfg.ServerApp
+app.ip = (
+    '0.0.0.0'
+)
+c.InteractiveShellApp.exec_lines = ['import os']
+c.InteractiveShellApp.exec_lines.append('import sys')
+load_subconfig('extra_config.py')
+"""
+
+
+def test_parse_py():
+    parsed = parse_py(CONFIG)
+    assert [(r[0], r[2], r[4]) for r in parsed["records"]] == [
+        ("c.ServerApp.allow_remote_access", False, 5),
+        ("c.ServerApp.ip", "0.0.0.0", 7),
+        ("c.InteractiveShellApp.exec_lines", ["import os"], 10),
+        ("c.InteractiveShellApp.exec_lines", "import sys", 11),
+    ]
+    assert parsed["records"][1][5] == "app.ip = ( '0.0.0.0' )"
+    assert parsed["includes"] == [["extra_config.py", None]]
+    assert [r[0] for r in parse_py("c.ServerApp.ip = '*'\n   \nnot python (\n")["records"]] == ["c.ServerApp.ip"]
+
+
+def test_load_traits(tmp_path):
+    (tmp_path / "jupyter_server_config.py").write_text(CONFIG)
+    (tmp_path / "extra_config.py").write_text("c.ServerApp.allow_remote_access = True\n")
+    (tmp_path / "jupyter_server_config.json").write_text(json.dumps({"ServerApp": {"allow_root": False}}))
+    traits = load_traits([tmp_path / "jupyter_server_config.py", tmp_path / "jupyter_server_config.json"])
+    assert traits["c.InteractiveShellApp.exec_lines"].value == ["import os", "import sys"]
+    assert traits["c.ServerApp.allow_remote_access"].path == str(tmp_path / "extra_config.py")
+    classified = classify_traits(traits)
+    assert sorted(v.trait for v in classified["securitysettings"]) == ["c.ServerApp.allow_remote_access", "c.ServerApp.ip"]
+
+
+def test_safe_values_are_not_findings():
+    r = Rules(uncommented = {"c.ServerApp.allow_remote_access = False": "/home/test", "c.ServerApp.ip = 'localhost'": "/home/test"},
+    servers = list(), locations = list())
+    assert r.check_pyconfig_securitysettings() == []
+
+
+def _profiles(home):
+    for profile, line in (("profile_default", "import os"), ("profile_evil", "import evil")):
+        (home / ".ipython" / profile).mkdir(parents=True)
+        (home / ".ipython" / profile / "ipython_config.py").write_text(f"c.InteractiveShellApp.exec_lines = [{line!r}]\n")
+
+
+def test_profiles_are_separate_scopes(tmp_path):
+    from jupysec.fleet import RootRules
+
+    _profiles(tmp_path)
+    findings = RootRules(str(tmp_path), timeout=None).check_pyconfig_codeexec()
+    assert sorted(f.source_text for f in findings) == [
+        "c.InteractiveShellApp.exec_lines = ['import evil']",
+        "c.InteractiveShellApp.exec_lines = ['import os']",
+    ]
+
+
+def test_cache_survives_repeated_scans(tmp_path):
+    from jupysec.cache import ConfigCache
+    from jupysec.fleet import RootRules
+
+    home = tmp_path / "home"
+    _profiles(home)
+    cache = str(tmp_path / "cache.json")
+    for _ in range(3):
+        r = RootRules(str(home), cache=cache, timeout=None)
+        assert len(ConfigCache(r.cache).entries) == 2
+
+
+def test_read_config_memo(tmp_path, monkeypatch):
+    import os
+    import time
+    from jupysec import config
+
+    path = tmp_path / "jupyter_server_config.py"
+    path.write_text("c.ServerApp.ip = 'localhost'\n")
+    assert config.read_config(path)["records"][0][2] == "localhost"
+    st = os.stat(path)
+    time.sleep(0.05)
+    path.write_text("c.ServerApp.ip = '*'        \n")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert config.read_config(path)["records"][0][2] == "*"
+
+    monkeypatch.setattr(config, "MEMO_SIZE", 2)
+    for i in range(3):
+        (tmp_path / f"{i}_config.py").write_text(f"c.A.b = {i}\n")
+        config.read_config(tmp_path / f"{i}_config.py")
+    assert list(config._memo) == [str(tmp_path / "1_config.py"), str(tmp_path / "2_config.py")]
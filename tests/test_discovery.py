@@ -0,0 +1,19 @@
+import json
+import os
+from jupysec import discovery
+
+
+def test_get_ipython_dir(monkeypatch):
+    monkeypatch.setenv("IPYTHONDIR", "/tmp/test_ipython")
+    assert discovery.get_ipython_dir() == "/tmp/test_ipython"
+
+
+def test_read_server_files(tmp_path):
+    with open(tmp_path / "jpserver-1.json", "w") as f:
+        json.dump({"url": "http://localhost:8888/", "token": "abc", "root_dir": "/home/test", "pid": os.getpid()}, f)
+    with open(tmp_path / "nbserver-2.json", "w") as f:
+        json.dump({"url": "http://0.0.0.0:8889/", "token": "", "notebook_dir": "/home/test", "pid": os.getpid()}, f)
+    with open(tmp_path / "kernel-3.json", "w") as f:
+        json.dump({"ip": "127.0.0.1"}, f)
+    servers = list(discovery.read_server_files(tmp_path))
+    assert [s["url"] for s in servers] == ["http://localhost:8888/", "http://0.0.0.0:8889/"]
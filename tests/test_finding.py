@@ -0,0 +1,51 @@
+import pickle
+from jupysec.finding import Finding, dedupe, diff_findings, register_rule
+
+RULE = register_rule("test_rule", category="Access", details="details", remediation="remediation")
+
+
+def test_finding_shares_rule_metadata():
+    f = Finding(rule=RULE, source_doc="/home/test/jupyter_server_config.py", source_text="c.ServerApp.ip = '*'")
+    assert f.category == "Access"
+    assert f.remediation == "remediation"
+    assert not hasattr(f, "__dict__")
+    g = pickle.loads(pickle.dumps(f))
+    assert g.rule is RULE
+    assert g == f
+
+
+def test_finding_deterministic_id():
+    a = Finding(rule=RULE, source_doc="doc", source_text="text")
+    b = Finding(rule=RULE, source_doc="doc", source_text="text")
+    c = Finding(rule=RULE, source_doc="doc", source_text="other")
+    assert a.uuid == b.uuid != c.uuid
+    assert Finding(category="Access", source_text="text").uuid == Finding(category="Access", source_text="text").uuid
+    assert dedupe([a, b, c]) == [a, c]
+
+
+def test_diff_findings():
+    a = Finding(rule=RULE, source_text="a")
+    b = Finding(rule=RULE, source_text="b")
+    c = Finding(rule=RULE, source_text="c")
+    added, removed, unchanged = diff_findings([a, b], [b, c])
+    assert (added, removed, unchanged) == ([c], [a], [b])
+
+
+def test_adhoc_rules_pickle_across_processes():
+    import subprocess
+    import sys
+    from jupysec.finding import Rule
+
+    adhoc = Finding(category="Access", source_text="text", source_details="details", remediation="fix it")
+    unregistered = Finding(rule=Rule("local_rule", "Access", severity="high", prefixes=("c.ServerApp.ip",)), source_text="text")
+    script = (
+        "import pickle, sys\n"
+        "from jupysec.finding import RULES\n"
+        "adhoc, unregistered = pickle.loads(sys.stdin.buffer.read())\n"
+        "assert RULES[adhoc.rule.id] is adhoc.rule and adhoc.remediation == 'fix it'\n"
+        "assert 'local_rule' not in RULES and unregistered.rule.severity == 'high'\n"
+        "assert unregistered.rule.matcher.match('c.ServerApp.ip') == {'local_rule'}\n"
+        "print(adhoc.uuid, unregistered.uuid)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", script], input=pickle.dumps([adhoc, unregistered]), capture_output=True, check=True)
+    assert out.stdout.decode().split() == [str(adhoc.uuid), str(unregistered.uuid)]
@@ -0,0 +1,69 @@
+import json
+from jupysec.fleet import resolve_root, scan_fleet
+
+
+def test_resolve_root(tmp_path):
+    (tmp_path / "etc" / "jupyter").mkdir(parents=True)
+    (tmp_path / "home" / "alice").mkdir(parents=True)
+    (tmp_path / "home" / "bob").mkdir(parents=True)
+    # a home directory can have etc/ and home/ too
+    assert resolve_root(tmp_path) == ([str(tmp_path)], [])
+    (tmp_path / "etc" / "os-release").write_text("ID=debian\n")
+    homes, system_paths = resolve_root(tmp_path)
+    assert homes == [str(tmp_path / "home" / "alice"), str(tmp_path / "home" / "bob")]
+    assert system_paths == [str(tmp_path / "etc" / "jupyter")]
+    assert resolve_root(tmp_path / "home" / "alice") == ([str(tmp_path / "home" / "alice")], [])
+
+
+def test_scan_fleet(tmp_path):
+    alice = tmp_path / "alice"
+    (alice / ".ipython" / "profile_default" / "startup").mkdir(parents=True)
+    (alice / ".ipython" / "profile_default" / "startup" / "00-evil.py").write_text("import os")
+    (alice / ".jupyter").mkdir(parents=True)
+    (alice / ".jupyter" / "jupyter_server_config.py").write_text("c.ServerApp.ip = '0.0.0.0'\n")
+    runtime = alice / ".local" / "share" / "jupyter" / "runtime"
+    runtime.mkdir(parents=True)
+    (runtime / "jpserver-1.json").write_text(json.dumps({"url": "http://0.0.0.0:8888/", "token": "", "root_dir": "/", "pid": 1}))
+    bob = tmp_path / "bob"
+    bob.mkdir()
+    reports = {r["root"]: r for r in scan_fleet([alice, bob], max_workers=2)}
+    categories = sorted(f.category for check, f in reports[str(alice)]["findings"])
+    assert categories == ["Access", "Authorization", "Code Execution", "Encryption", "Nonstandard Configuration"]
+    assert reports[str(bob)]["findings"] == []
+
+
+def test_scan_fleet_cache_per_home(tmp_path):
+    from jupysec.cache import ConfigCache
+    from jupysec.fleet import home_cache_path
+
+    root = tmp_path / "root"
+    (root / "etc").mkdir(parents=True)
+    (root / "etc" / "passwd").write_text("root:x:0:0::/root:/bin/sh\n")
+    for user in ("a", "b"):
+        (root / "home" / user / ".jupyter").mkdir(parents=True)
+        (root / "home" / user / ".jupyter" / "jupyter_server_config.py").write_text("c.ServerApp.ip = '0.0.0.0'\n")
+    cache = str(tmp_path / "cache.json")
+    for _ in range(2):
+        list(scan_fleet([root], max_workers=2, cache=cache))
+        for user in ("a", "b"):
+            entries = ConfigCache(home_cache_path(str(root / "home" / user), cache)).entries
+            assert list(entries) == [str(root / "home" / user / ".jupyter" / "jupyter_server_config.py")]
+
+
+def test_scan_fleet_per_home(tmp_path):
+    root = tmp_path / "root"
+    (root / "etc" / "jupyter").mkdir(parents=True)
+    (root / "etc" / "os-release").write_text("ID=debian\n")
+    (root / "etc" / "jupyter" / "jupyter_server_config.py").write_text("c.ServerApp.ip = '0.0.0.0'\n")
+    for user in ("a", "b", "c"):
+        (root / "home" / user / ".jupyter").mkdir(parents=True)
+    (root / "home" / "a" / ".jupyter" / "jupyter_server_config.py").write_text("c.ServerApp.ip = '*'\n")
+    reports = list(scan_fleet([root], max_workers=2, timeout=None))
+    assert sorted(str(r["home"]) for r in reports) == sorted([str(root / "home" / u) for u in "abc"] + ["None"])
+    findings = [f for r in reports for check, f in r["findings"]]
+    # the system config is reported once, not once per home
+    assert sorted(str(f.source_doc) for f in findings if f.rule.id == "check_pyconfig_securitysettings") == [
+        str(root / "etc" / "jupyter" / "jupyter_server_config.py"),
+        str(root / "home" / "a" / ".jupyter" / "jupyter_server_config.py"),
+    ]
+    assert all("check_pyconfig_securitysettings" in r["evaluated"] for r in reports)
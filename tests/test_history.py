@@ -0,0 +1,101 @@
+import os
+import sqlite3
+from jupysec.history import HistoryScanner
+
+SILENT = "get_ipython().kernel.execute_interactive(code='import os', silent=True)"
+
+
+def _make_db(path, rows):
+    con = sqlite3.connect(path)
+    con.execute("CREATE TABLE IF NOT EXISTS history (session integer, line integer, source text, source_raw text, PRIMARY KEY (session, line))")
+    con.executemany("INSERT INTO history VALUES (?, ?, ?, ?)", [(s, l, src, src) for s, l, src in rows])
+    con.commit()
+    con.close()
+
+
+def test_history_scanner(tmp_path):
+    db = tmp_path / "history.sqlite"
+    _make_db(db, [(1, 1, "print(1)"), (1, 2, SILENT), (2, 1, SILENT)])
+    scanner = HistoryScanner(str(tmp_path / "state.json"), batch_size=1)
+    assert scanner.scan(db) == [(1, 2, SILENT), (2, 1, SILENT)]
+    scanner.save()
+
+    _make_db(db, [(2, 2, "x = 1"), (3, 1, SILENT)])
+    scanner = HistoryScanner(str(tmp_path / "state.json"))
+    assert scanner.scan(db) == [(1, 2, SILENT), (2, 1, SILENT), (3, 1, SILENT)]
+    assert scanner.watermarks[str(db)]["watermark"] == 5
+
+
+def test_history_interleaved_sessions(tmp_path):
+    db = tmp_path / "history.sqlite"
+    _make_db(db, [(1, 1, "print(1)"), (2, 1, "print(2)")])
+    scanner = HistoryScanner(str(tmp_path / "state.json"))
+    assert scanner.scan(db) == []
+    scanner.save()
+
+    # the older kernel is still running and writes after the newer one started
+    _make_db(db, [(1, 2, SILENT), (2, 2, SILENT)])
+    scanner = HistoryScanner(str(tmp_path / "state.json"))
+    assert scanner.scan(db) == [(1, 2, SILENT), (2, 2, SILENT)]
+    assert scanner.scan(db) == [(1, 2, SILENT), (2, 2, SILENT)]
+
+
+def test_history_sweep(tmp_path):
+    for user in ["alice", "bob", "carol"]:
+        profile = tmp_path / user / ".ipython" / "profile_default"
+        profile.mkdir(parents=True)
+        _make_db(profile / "history.sqlite", [(1, 1, "print(1)")] + ([(1, 2, SILENT)] if user != "carol" else []))
+    scanner = HistoryScanner()
+    results = list(scanner.sweep([tmp_path], max_workers=2))
+    assert len(results) == 3
+    assert sorted(len(rows) for rows, db in results) == [0, 1, 1]
+
+
+def test_history_tail(tmp_path):
+    from jupysec.history import HistoryTail
+
+    db = tmp_path / "history.sqlite"
+    _make_db(db, [(1, 1, SILENT)])
+    tail = HistoryTail([db], interval=0.01)
+    assert tail.findings() == []
+    _make_db(db, [(1, 2, "print(1)"), (1, 3, SILENT)])
+    findings = tail.findings()
+    assert [(f.rule.id, f.source_text) for f in findings] == [("check_for_silent_history", SILENT)]
+    assert tail.findings() == []
+
+    _make_db(tmp_path / "history.sqlite", [(2, 1, "print(2)"), (1, 4, SILENT)])
+    assert [f.source_text for f in tail.findings()] == [SILENT]
+
+    # rotated: the replacement is read from its start, whatever its keys
+    _make_db(tmp_path / "rotated.sqlite", [(1, 1, SILENT)])
+    os.replace(tmp_path / "rotated.sqlite", db)
+    assert [f.source_text for f in tail.findings()] == [SILENT]
+    tail.close()
+
+
+def test_corrupt_history_database(tmp_path):
+    from jupysec.fleet import RootRules
+
+    for profile in ("profile_default", "profile_broken"):
+        (tmp_path / ".ipython" / profile).mkdir(parents=True)
+    _make_db(tmp_path / ".ipython" / "profile_default" / "history.sqlite", [(1, 1, SILENT)])
+    broken = tmp_path / ".ipython" / "profile_broken" / "history.sqlite"
+    broken.write_bytes(b"not a database" * 100)
+    r = RootRules(str(tmp_path), timeout=None)
+    assert [len(rows) for rows, db in r.history] == [1]
+    assert list(r.collector_errors) == [f"history:{broken}"]
+
+
+def test_history_memory_limit(tmp_path):
+    from jupysec.cli import parse_args
+    from jupysec.fleet import RootRules
+
+    (tmp_path / ".ipython" / "profile_default").mkdir(parents=True)
+    _make_db(tmp_path / ".ipython" / "profile_default" / "history.sqlite", [(1, 1, SILENT)])
+    (tmp_path / ".ipython" / "profile_default" / "broken").mkdir()
+    broken = tmp_path / ".ipython" / "profile_default" / "broken" / "history.sqlite"
+    broken.write_bytes(b"not a database" * 100)
+    r = RootRules(str(tmp_path), timeout=None, max_workers=2, history_memory_limit=2 << 30)
+    assert [len(rows) for rows, db in r.history] == [1]
+    assert list(r.collector_errors) == [f"history:{broken}"]
+    assert parse_args(["--history-memory-limit", "512M"]).history_memory_limit == 512 << 20
@@ -0,0 +1,46 @@
+import json
+import os
+from pathlib import Path
+from jupysec.cache import ConfigCache
+from jupysec.kernels import audit_kernel_files
+from jupysec.rules import Rules
+
+
+def kernel_files(tmp_path):
+    runtime = tmp_path / "runtime"
+    runtime.mkdir()
+    (runtime / "kernel-1.json").write_text(json.dumps({"key": "", "ip": "0.0.0.0", "transport": "tcp"}))
+    (runtime / "kernel-2.json").write_text(json.dumps({"key": "a" * 36, "ip": "127.0.0.1", "transport": "tcp"}))
+    os.chmod(runtime / "kernel-1.json", 0o644)
+    os.chmod(runtime / "kernel-2.json", 0o600)
+    spec = tmp_path / "kernels" / "python3"
+    spec.mkdir(parents=True)
+    (spec / "kernel.json").write_text(json.dumps({
+        "argv": ["python", "-m", "ipykernel_launcher", "-f", "{connection_file}", "--IPKernelApp.exec_lines=['import evil']"],
+        "env": {"PYTHONSTARTUP": "/tmp/evil.py", "LANG": "C"},
+    }))
+    os.chmod(spec / "kernel.json", 0o644)
+    return [runtime / "kernel-1.json", runtime / "kernel-2.json", spec / "kernel.json", tmp_path / "other.json"]
+
+
+def test_audit_kernel_files(tmp_path):
+    files = kernel_files(tmp_path)
+    results = [(kind, problem, Path(path).name) for kind, problem, path in audit_kernel_files(files)]
+    assert results == [
+        ("connection", "empty HMAC key, messages are not signed", "kernel-1.json"),
+        ("connection", "ip = 0.0.0.0", "kernel-1.json"),
+        ("connection", "mode 0644, readable by every user", "kernel-1.json"),
+        ("kernelspec", "argv: --IPKernelApp.exec_lines=['import evil']", "kernel.json"),
+        ("kernelspec", "env: PYTHONSTARTUP=/tmp/evil.py", "kernel.json"),
+    ]
+
+    cache = ConfigCache(str(tmp_path / "cache.json"))
+    assert audit_kernel_files(files, cache) == audit_kernel_files(files)
+    os.chmod(files[0], 0o600)
+    assert len(audit_kernel_files(files, cache)) == 4
+
+
+def test_check_kernel_files(tmp_path):
+    r = Rules(servers = list(), locations = "/nonexistent", uncommented = {"x = 1": "/home/test"}, collectors = list())
+    r.kernels = audit_kernel_files(kernel_files(tmp_path))
+    assert [f.category for f in r.iter_findings()] == ["Authorization"] * 3 + ["Code Execution"] * 2
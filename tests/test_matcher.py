@@ -0,0 +1,9 @@
+from jupysec.matcher import PrefixMatcher
+
+
+def test_prefix_matcher():
+    m = PrefixMatcher({"a": ("c.ServerApp.ip", "c.ServerApp.allow_origin"), "b": ("c.ServerApp.allow_origin_pat",)})
+    assert m.match("c.ServerApp.ip = '0.0.0.0'") == {"a"}
+    assert m.match("c.ServerApp.allow_origin_pat = '.*'") == {"a", "b"}
+    assert m.match("c.ServerApp.port = 8888") == set()
+    assert m.classify(["c.ServerApp.ip = '*'", "x = 1"]) == {"a": ["c.ServerApp.ip = '*'"], "b": []}
@@ -0,0 +1,25 @@
+import io
+import json
+from jupysec.cli import write_jsonl
+from jupysec.metrics import prometheus_text
+from jupysec.rules import Rules
+
+
+def test_rules_metrics():
+    r = Rules(servers = ["http://0.0.0.0:8888/ :: /home/test"], locations = "/nonexistent",
+    uncommented = {"c.ServerApp.ip = '*'": "/home/test"}, collectors = ["index"], profile = True)
+    findings = list(r.run_checks())
+    assert "seconds" in r.metrics["collectors"]["index"]
+    assert r.metrics["checks"]["check_for_token"]["findings"] == 1
+    assert sum(m["findings"] for m in r.metrics["checks"].values()) == len(findings)
+    assert "check_for_token" in r.profiles["check_for_token"]
+
+    text = prometheus_text(r.metrics, finished=1700000000)
+    assert "# TYPE jupysec_check_seconds gauge" in text
+    assert 'jupysec_check_findings{check="check_for_token"} 1.0' in text
+    assert 'jupysec_collector_items{collector="index",counter="files"} 0.0' in text
+    assert "jupysec_last_scan_timestamp_seconds 1700000000.0" in text
+
+    out = io.StringIO()
+    write_jsonl([("check_for_token", findings[0][1], None)], out, [r.metrics])
+    assert "metrics" in json.loads(out.getvalue().splitlines()[-1])
@@ -0,0 +1,84 @@
+import textwrap
+from jupysec import plugins
+from jupysec.cli import parse_args
+from jupysec.rules import Rules
+
+PLUGIN = '''
+from jupysec.finding import Finding, register_rule
+
+NO_ROOT = register_rule("acme_no_root", category="Access", severity="high", prefixes=("c.ServerApp.allow_root",))
+
+
+def _open_servers(rules):
+    rule = OPEN_SERVERS
+    return [Finding(rule=rule, source_text=str(s), source_doc="acme") for s in rules.servers if not s.token]
+
+
+OPEN_SERVERS = register_rule("acme_open_servers", category="Authorization", inputs=("servers",), check=_open_servers)
+'''
+
+
+def _install_plugin(tmp_path, monkeypatch):
+    (tmp_path / "acme_rules.py").write_text(PLUGIN)
+    dist = tmp_path / "acme_rules-1.0.dist-info"
+    dist.mkdir()
+    (dist / "METADATA").write_text("Metadata-Version: 2.1\nName: acme-rules\nVersion: 1.0\n")
+    (dist / "entry_points.txt").write_text(textwrap.dedent("""
+        [jupysec.rules]
+        acme_no_root = acme_rules:NO_ROOT
+        acme_open_servers = acme_rules:OPEN_SERVERS
+    """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(plugins, "_entry_points", None)
+
+
+def test_plugin_rules(tmp_path, monkeypatch):
+    _install_plugin(tmp_path, monkeypatch)
+    assert plugins.plugin_rule_ids() == ["acme_no_root", "acme_open_servers"]
+    r = Rules(uncommented = {"c.ServerApp.allow_root = True": "/home/test"}, servers = ["http://localhost:8888/ :: /home/test"],
+    locations = "/nonexistent", collectors = list())
+    findings = [(check, f.rule.severity) for check, f in r.run_checks(categories = {"Access", "Authorization"})]
+    assert ("acme_no_root", "high") in findings
+    assert ("acme_open_servers", "medium") in findings
+    assert parse_args(["--checks", "acme_no_root,for_token"]).checks == ["acme_no_root", "check_for_token"]
+
+
+def test_checks_limit_collection(tmp_path, monkeypatch):
+    _install_plugin(tmp_path, monkeypatch)
+
+    class CountingRules(Rules):
+        calls = list()
+        def _get_servers(self):
+            self.calls.append("servers")
+            return False
+        def _get_sockets(self):
+            self.calls.append("sockets")
+            return False
+
+    r = CountingRules(checks = ["acme_no_root", "check_pyconfig_codeexec"], uncommented = {"c.ServerApp.allow_root = True": "/home/test"})
+    assert r.calls == []
+    assert r.collectors == {"locations", "paths", "index", "uncommented"}
+    assert [check for check, f in r.run_checks()] == ["acme_no_root"]
+
+
+def test_probe_checks_collect_servers():
+    from jupysec.finding import RULES
+    from jupysec.rules import required_collectors
+
+    assert required_collectors([RULES["check_for_open_api"]]) == {"servers"}
+    assert Rules(checks = ["check_for_open_api"], probe = True, locations = list()).collectors == {"servers"}
+
+
+def test_categories_do_not_import_plugins(tmp_path, monkeypatch):
+    import pytest
+
+    _install_plugin(tmp_path, monkeypatch)
+    imported = tmp_path / "imported"
+    (tmp_path / "acme_slow.py").write_text(f"open({str(imported)!r}, 'w').close()\nRULES = []\n")
+    with open(tmp_path / "acme_rules-1.0.dist-info" / "entry_points.txt", "a") as f:
+        f.write("acme_slow = acme_slow:RULES\n")
+    assert parse_args(["--categories", "Access, Code Execution"]).categories == ["Access", "Code Execution"]
+    assert not imported.exists()
+    with pytest.raises(SystemExit):
+        parse_args(["--categories", "Nonexistent"])
+    assert imported.exists()
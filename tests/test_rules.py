@@ -1,3 +1,4 @@
+import time
 from jupysec.rules import Rules
 
 def test_check_for_token():
@@ -44,3 +45,33 @@ def test_check_pyconfig_securitysettings():
     r = Rules(uncommented = {"c.ServerApp.allow_remote_access = True": "/home/test"}, 
     servers = list(), locations = list())
     assert len(r.check_pyconfig_securitysettings()) == 1
+
+def test_collector_timeout():
+    class SlowRules(Rules):
+        def _get_servers(self):
+            time.sleep(5)
+            return ["http://localhost:8888/ :: /home/test"]
+    start = time.monotonic()
+    r = SlowRules(locations = "/nonexistent", uncommented = {"c.ServerApp.ip = '*'": "/home/test"}, timeout = 0.1)
+    assert time.monotonic() - start < 1
+    assert r.servers is False
+    assert "servers" in r.collector_errors
+
+def test_check_for_silent_history():
+    r = Rules(history = [([(1, 1, "get_ipython().kernel.execute_interactive(code, silent=True)")], "/home/test/history.sqlite"), (list(), "/home/test/other.sqlite")],
+    servers = list(), locations = "/home/test", uncommented = {"x = 1": "/home/test"})
+    assert len(r.check_for_silent_history()) == 1
+
+def test_iter_findings():
+    class CountingRules(Rules):
+        calls = list()
+        def check_for_https(self):
+            self.calls.append("check_for_https")
+            return super().check_for_https()
+    r = CountingRules(servers = ['http://0.0.0.0:8888/ :: /home/test'], locations = "/nonexistent",
+    uncommented = {"c.ServerApp.ip = '*'": "/home/test"})
+    first = next(r.iter_findings())
+    assert first.category == "Authorization"
+    assert r.calls == []
+    assert [f.category for f in r.iter_findings(categories = {"Access"})] == ["Access"]
+    assert r.calls == []
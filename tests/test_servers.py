@@ -0,0 +1,75 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from jupysec.servers import Server, inventory, probe
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    status = 200
+
+    def do_GET(self):
+        self.send_response(self.status)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def stub_server(status):
+    handler = type("Handler", (StubHandler,), {"status": status})
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def test_parse():
+    s = Server.parse("[JupyterServerListApp] https://0.0.0.0:8889/lab/?token=abc :: /home/test")
+    assert (s.hostname, s.port, s.secure, s.token, s.base_url, s.root_dir) == ("0.0.0.0", 8889, True, True, "/lab/", "/home/test")
+    assert not s.loopback
+    assert "abc" not in str(s)
+    assert not Server.parse("http://localhost:8888/ :: /home/test").token
+
+
+def test_inventory(tmp_path):
+    with open(tmp_path / "jpserver-1.json", "w") as f:
+        json.dump({"url": "http://127.0.0.1:8888/", "token": "", "password": True, "root_dir": "/home/test", "pid": os.getpid()}, f)
+    servers = inventory(tmp_path)
+    assert len(servers) == 1
+    assert servers[0].loopback and servers[0].password and not servers[0].token
+    assert servers[0].pid == os.getpid()
+
+
+def test_probe():
+    stubs = [stub_server(status) for status in (200, 403, 404, 302, 500)]
+    try:
+        servers = [Server(f"http://127.0.0.1:{httpd.server_address[1]}/") for httpd in stubs]
+        start = time.monotonic()
+        results = probe(servers + [Server("http://127.0.0.1:1/")], timeout=0.5)
+        assert time.monotonic() - start < 1
+    finally:
+        for httpd in stubs:
+            httpd.shutdown()
+    assert [(r["reachable"], r["open"], r["auth_required"], r["status"]) for r in results] == [
+        (True, True, False, 200),
+        (True, False, True, 403),
+        (True, False, False, 404),
+        (True, False, False, 302),
+        (True, False, False, 500),
+        (False, False, None, None),
+    ]
+
+
+def test_open_api_check():
+    from jupysec.rules import Rules
+
+    stubs = [stub_server(status) for status in (200, 404, 302, 500)]
+    try:
+        servers = [Server(f"http://127.0.0.1:{httpd.server_address[1]}/") for httpd in stubs]
+        r = Rules(servers=servers, locations=list(), collectors=["servers"], probe=True, timeout=None)
+        findings = r.check_for_open_api()
+    finally:
+        for httpd in stubs:
+            httpd.shutdown()
+    assert [f.source_text for f in findings] == [str(servers[0])]
@@ -0,0 +1,76 @@
+import os
+from jupysec.rules import Rules
+from jupysec.sockets import listening_sockets
+
+TCP = """  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode
+   0: 0100007F:22B8 00000000:0000 0A 00000000:00000000 00:00000000 00000000  1000        0 1001 1 0 100 0 0 10 0
+   1: 00000000:C351 00000000:0000 0A 00000000:00000000 00:00000000 00000000  1000        0 1002 1 0 100 0 0 10 0
+   2: 0100007F:22B8 0100007F:9C40 01 00000000:00000000 00:00000000 00000000  1000        0 1003 1 0 100 0 0 10 0
+   3: 00000000:0016 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 1004 1 0 100 0 0 10 0
+"""
+TCP6 = """  sl  local_address                         remote_address                        st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode
+   0: 00000000000000000000000001000000:22B9 00000000000000000000000000000000:0000 0A 00000000:00000000 00:00000000 00000000  1000        0 1005 1 0 100 0 0 10 0
+"""
+
+
+def fake_proc(tmp_path):
+    (tmp_path / "net").mkdir()
+    (tmp_path / "net" / "tcp").write_text(TCP)
+    (tmp_path / "net" / "tcp6").write_text(TCP6)
+    processes = {
+        100: (b"/usr/bin/python3\0/usr/local/bin/jupyter-lab\0--ip=127.0.0.1\0", ["1001", "1005"]),
+        200: (b"/usr/bin/python3\0-m\0ipykernel_launcher\0-f\0kernel-1.json\0", ["1002"]),
+        300: (b"/usr/sbin/sshd\0-D\0", ["1004"]),
+    }
+    for pid, (cmdline, inodes) in processes.items():
+        (tmp_path / str(pid) / "fd").mkdir(parents=True)
+        (tmp_path / str(pid) / "cmdline").write_bytes(cmdline)
+        for fd, inode in enumerate(inodes):
+            os.symlink(f"socket:[{inode}]", tmp_path / str(pid) / "fd" / str(fd))
+    return tmp_path
+
+
+def test_listening_sockets(tmp_path):
+    listeners = sorted(listening_sockets(fake_proc(tmp_path)), key=lambda x: x.inode)
+    assert [(l.pid, l.role, str(l.address), l.port, l.loopback) for l in listeners] == [
+        (100, "server", "127.0.0.1", 8888, True),
+        (200, "kernel", "0.0.0.0", 50001, False),
+        (100, "server", "::1", 8889, True),
+    ]
+    assert listening_sockets(tmp_path / "missing") is None
+
+
+def test_check_for_exposed_ports(tmp_path):
+    r = Rules(locations = "/nonexistent", servers = ["http://localhost:8888/ :: /home/test"],
+              uncommented = {"c.KernelManager.shell_port = 50001": "/home/test/jupyter_server_config.py"},
+              collectors = list())
+    r.sockets = listening_sockets(fake_proc(tmp_path))
+    assert "check_for_exposed_ports" in r.enabled_checks()
+    findings = r.check_for_exposed_ports()
+    assert len(findings) == 1
+    assert findings[0].source_doc == "/home/test/jupyter_server_config.py"
+    assert findings[0].source_text == "kernel pid 200 listening on 0.0.0.0:50001 (set by c.KernelManager.shell_port = 50001)"
+
+
+def test_exposed_port_not_set_by_safe_ip(tmp_path):
+    sockets = listening_sockets(fake_proc(tmp_path))
+    for ip, source in (("127.0.0.1", "/proc/net/tcp"), ("0.0.0.0", "/home/test/ipython_config.py")):
+        r = Rules(locations = "/nonexistent", servers = ["http://localhost:8888/ :: /home/test"],
+                  uncommented = {f"c.KernelManager.ip = '{ip}'": "/home/test/ipython_config.py"},
+                  collectors = list())
+        r.sockets = sockets
+        assert [f.source_doc for f in r.check_for_exposed_ports()] == [source]
+
+
+def test_role():
+    from jupysec.sockets import _role
+
+    assert _role(["/usr/bin/python3", "-m", "jupyterlab", "--no-browser"]) == "server"
+    assert _role(["python", "-X", "utf8", "-m", "notebook"]) == "server"
+    assert _role(["python3.11", "-mjupyter_server"]) == "server"
+    assert _role(["/opt/conda/bin/jupyter", "lab"]) == "server"
+    assert _role(["/usr/bin/python3", "/usr/local/bin/jupyter-notebook"]) == "server"
+    assert _role(["/usr/bin/python3", "-m", "ipykernel_launcher", "-f", "kernel-1.json"]) == "kernel"
+    assert _role(["/usr/bin/vim", "/home/test/ipykernel"]) is None
+    assert _role(["python", "train.py", "--log", "/tmp/jupyter-lab"]) is None
+    assert _role([""]) is None
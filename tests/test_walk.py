@@ -0,0 +1,28 @@
+from jupysec.walk import FileIndex
+
+
+def test_file_index(tmp_path):
+    (tmp_path / "profile_default" / "startup").mkdir(parents=True)
+    (tmp_path / "profile_default" / "startup" / "00-evil.py").write_text("import os")
+    (tmp_path / "profile_default" / "history.sqlite").write_text("")
+    (tmp_path / "labextensions" / "pkg").mkdir(parents=True)
+    (tmp_path / "labextensions" / "pkg" / "package.json").write_text("{}")
+    (tmp_path / "a" / "b" / "c").mkdir(parents=True)
+    (tmp_path / "a" / "b" / "c" / "deep.py").write_text("")
+    index = FileIndex([tmp_path], max_depth=2)
+    names = sorted(f.name for f in index.iter_files())
+    assert names == ["00-evil.py", "history.sqlite"]
+    startup = [names for d, names in index.iter_dirs([tmp_path]) if d.name == "startup"]
+    assert startup == [["00-evil.py"]]
+
+
+def test_same_file_in_two_profiles(tmp_path):
+    from jupysec.rules import Rules
+
+    for profile in ("profile_default", "profile_evil"):
+        (tmp_path / profile / "startup").mkdir(parents=True)
+        (tmp_path / profile / "startup" / "00.py").write_text("import os")
+        (tmp_path / profile / "startup" / "README").write_text("")
+    r = Rules(locations=str(tmp_path), uncommented={"x = 1": "/home/test"}, servers=["https://localhost:8888/?token=abc"], collectors=["index"])
+    findings = r.check_ipython_startup()
+    assert sorted((f.source_doc.parent.name, f.source_text) for f in findings) == [("profile_default", "00.py"), ("profile_evil", "00.py")]
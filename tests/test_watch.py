@@ -0,0 +1,69 @@
+from jupysec.rules import Rules
+from jupysec.watch import PollingBackend, Watcher, make_backend
+
+
+def _watcher(tmp_path):
+    profile = tmp_path / "profile_default"
+    (profile / "startup").mkdir(parents=True)
+    (profile / "ipython_config.py").write_text("c.InteractiveShell.colors = 'Linux'\n")
+    r = Rules(locations = str(tmp_path), uncommented = {"x = 1": "/home/test"}, servers = ["https://localhost:8888/?token=abc"], collectors = ["index"])
+    return Watcher(r), profile
+
+
+def test_watch_events(tmp_path):
+    watcher, profile = _watcher(tmp_path)
+    assert watcher.findings() == set()
+    backend = make_backend(watcher.startup_dirs | watcher.config_dirs)
+    (profile / "startup" / "00-evil.py").write_text("import os")
+    (profile / "ipython_config.py").write_text("c.InteractiveShellApp.exec_lines = ['import os']\n")
+    events = sorted((event, f.rule.id) for event, f in watcher.run(backend, timeout=1))
+    assert events == [("new", "check_ipython_startup"), ("new", "check_pyconfig_codeexec")]
+
+    (profile / "ipython_config.py").write_text("\n")
+    assert [(e, f.rule.id) for e, f in watcher.evaluate(str(profile / "ipython_config.py"))] == [("resolved", "check_pyconfig_codeexec")]
+
+
+def test_watch_polling(tmp_path):
+    watcher, profile = _watcher(tmp_path)
+    backend = PollingBackend(watcher.startup_dirs | watcher.config_dirs, interval=0.05)
+    (profile / "startup" / "00-evil.py").write_text("import os")
+    events = [(e, f.source_text) for e, f in watcher.run(backend, timeout=0.2)]
+    assert events == [("new", "00-evil.py")]
+
+
+def test_watch_new_profiles(tmp_path):
+    watcher, profile = _watcher(tmp_path)
+    backend = PollingBackend(watcher.watched(), interval=0.05)
+    (tmp_path / "profile_evil" / "startup").mkdir(parents=True)
+    (tmp_path / "profile_evil" / "startup" / "00-evil.py").write_text("import os")
+    events = [(e, f.source_text, f.source_doc.parent.name) for e, f in watcher.run(backend, timeout=0.2)]
+    assert events == [("new", "00-evil.py", "profile_evil")]
+    assert str(tmp_path / "profile_evil" / "startup") in watcher.startup_dirs
+
+
+def test_watch_subconfig(tmp_path):
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    (shared / "extra.py").write_text("\n")
+    watcher, profile = _watcher(tmp_path)
+    (profile / "ipython_config.py").write_text(f"load_subconfig('extra.py', path={str(shared)!r})\n")
+    assert list(watcher.evaluate(str(profile / "ipython_config.py"))) == list()
+    assert str(shared) in watcher.watched()
+
+    backend = make_backend(watcher.watched())
+    (shared / "extra.py").write_text("c.InteractiveShellApp.exec_lines = ['import os']\n")
+    events = [(e, f.rule.id, f.source_doc.name) for e, f in watcher.run(backend, timeout=0.5)]
+    assert events == [("new", "check_pyconfig_codeexec", "extra.py")]
+
+
+def test_watch_json_overrides_py(tmp_path):
+    import json
+
+    watcher, profile = _watcher(tmp_path)
+    (profile / "ipython_config.py").write_text("c.ServerApp.ip = '0.0.0.0'\n")
+    assert [(e, f.rule.id) for e, f in watcher.evaluate(str(profile / "ipython_config.py"))] == [("new", "check_pyconfig_securitysettings")]
+    # the JSON file is loaded last and puts the safe value back, as a full scan sees it
+    (profile / "ipython_config.json").write_text(json.dumps({"ServerApp": {"ip": "localhost"}}))
+    assert [(e, f.rule.id) for e, f in watcher.evaluate(str(profile / "ipython_config.json"))] == [("resolved", "check_pyconfig_securitysettings")]
+    assert watcher.findings() == set()
+    assert Rules(locations=str(tmp_path), collectors=["index", "uncommented"]).check_pyconfig_securitysettings() == []